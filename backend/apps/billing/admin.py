@@ -1,4 +1,5 @@
 from django.contrib import admin
+from backend_api.money import to_paise
 from .models import Bill, BillItem
 
 
@@ -8,7 +9,8 @@ class BillItemInline(admin.TabularInline):
     extra = 1
     readonly_fields = ("price",)
     autocomplete_fields = ("product",)
-    fields = ("product", "quantity", "price")
+    # The price is edited in paise; the rupee column is derived on save
+    fields = ("product", "quantity", "price_paise", "price")
 
 
 @admin.register(Bill)
@@ -39,16 +41,27 @@ class BillAdmin(admin.ModelAdmin):
     ordering = ("-created_at",)
     date_hierarchy = "created_at"
 
+    def save_formset(self, request, form, formset, change):
+        # New items left at 0 paise are sold at the product's current price
+        for item in formset.save(commit=False):
+            if item.pk is None and not item.price_paise:
+                item.price_paise = to_paise(item.product.price)
+            item.save()
+        for item in formset.deleted_objects:
+            item.delete()
+        formset.save_m2m()
+
     fieldsets = (
         ("Bill Details", {
             "fields": (
                 "bill_id",
                 "cashier",
                 "customer",
-                "subtotal",
-                "tax",
-                "discount",
-                "total",
+                # Amounts are edited in paise; the rupee columns are derived on save
+                "subtotal_paise",
+                "tax_paise",
+                "discount_paise",
+                "total_paise",
             )
         }),
         ("Payment Information", {
@@ -70,6 +83,7 @@ class BillItemAdmin(admin.ModelAdmin):
     """Admin panel for individual Bill Items."""
     list_display = ("bill", "product", "quantity", "price")
     list_filter = ("product", "bill__payment_status")
+    readonly_fields = ("price",)
     search_fields = ("bill__bill_id", "product__name")  # ✅ required
     autocomplete_fields = ("bill", "product")
     ordering = ("-bill__created_at",)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class BillingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.billing'
+
+    def ready(self):
+        from . import pricing  # noqa: F401  connects price cache invalidation
+        from . import invoices  # noqa: F401  removes cached PDFs of deleted bills
@@ -0,0 +1,56 @@
+"""
+Bill invoice PDFs.
+
+The invoice version is a digest of everything the invoice shows (bill
+amounts and status, lines, product and customer names) plus the template
+source and print stylesheet, so any change to the bill, its items, the
+template or its CSS yields a new cached file. Bulk UPDATEs that bypass save() are covered too, since nothing
+depends on signals. Rendering and caching are done by `apps.documents`.
+"""
+from functools import partial
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.template.loader import render_to_string
+from apps.documents import printing, storage
+from apps.documents.archive import Document, zip_stream
+from .models import Bill
+
+TEMPLATE = "billing/invoice.html"
+NAMESPACE = "invoices"
+STYLESHEET = "invoice"
+
+
+def invoice_version(bill):
+    """Digest of the invoice's content; `bill` should have items__product prefetched."""
+    customer = bill.customer
+    return storage.version_of([
+        storage.template_digest(TEMPLATE), printing.stylesheet_digest(STYLESHEET),
+        bill.pk, bill.bill_id, bill.created_at.isoformat(), bill.payment_status,
+        bill.subtotal_paise, bill.tax_paise, bill.discount_paise, bill.total_paise,
+        [customer.name, customer.contact_number] if customer else None,
+        [[item.pk, item.product.name, item.quantity, item.price_paise] for item in bill.items.all()],
+    ])
+
+
+def invoice_html(bill):
+    return render_to_string(TEMPLATE, {"bill": bill})
+
+
+def invoice_archive(bills):
+    """ZIP stream of the invoices of the paid bills in `bills`, oldest first."""
+    bills = (
+        bills.filter(payment_status="paid")
+        .select_related("customer")
+        .prefetch_related("items__product")
+        .order_by("created_at", "id")
+        .iterator(chunk_size=500)
+    )
+    return zip_stream(
+        Document(NAMESPACE, bill.pk, invoice_version(bill), f"{bill.bill_id}.pdf", partial(invoice_html, bill), STYLESHEET)
+        for bill in bills
+    )
+
+
+@receiver(post_delete, sender=Bill)
+def _drop_cached_invoices(sender, instance, **kwargs):
+    storage.discard(NAMESPACE, instance.pk)
@@ -0,0 +1,64 @@
+import time
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from apps.billing.serializers import BillingSerializer
+from apps.customers.models import Customer
+from apps.products.models import Product
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure database round trips and latency of bill creation for growing "
+        "basket sizes. All data is created inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lines", type=int, nargs="+", default=[1, 10, 60, 200],
+            help="Basket sizes (number of bill lines) to measure.",
+        )
+        parser.add_argument("--repeat", type=int, default=5, help="Bills created per basket size.")
+
+    def handle(self, *args, **options):
+        sizes = options["lines"]
+        repeat = options["repeat"]
+
+        with transaction.atomic():
+            customer = Customer.objects.create(name="Bench Customer", contact_number="bench-0000000")
+            products = Product.objects.bulk_create([
+                Product(item_id=f"BENCH-{i:05d}", name=f"Bench product {i}", quantity=10**6, price=Decimal("10.00"))
+                for i in range(max(sizes))
+            ])
+
+            self.stdout.write(f"{'lines':>6} {'validate':>9} {'create':>7} {'ms/bill':>9}")
+            for size in sizes:
+                payload = self._payload(customer, products[:size])
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    serializer = BillingSerializer(data=payload, context={})
+                    with CaptureQueriesContext(connection) as validate_ctx:
+                        serializer.is_valid(raise_exception=True)
+                    with CaptureQueriesContext(connection) as create_ctx:
+                        serializer.save()
+                        serializer.data
+                elapsed = (time.perf_counter() - started) * 1000 / repeat
+                self.stdout.write(
+                    f"{size:>6} {len(validate_ctx.captured_queries):>9} "
+                    f"{len(create_ctx.captured_queries):>7} {elapsed:>9.2f}"
+                )
+
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def _payload(customer, products):
+        subtotal = sum(p.price for p in products)
+        return {
+            "customer": customer.pk,
+            "subtotal": subtotal,
+            "tax": 0,
+            "discount": 0,
+            "total": subtotal,
+            "items": [{"product": p.pk, "quantity": 1, "price": p.price} for p in products],
+        }
@@ -0,0 +1,48 @@
+import time
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from apps.billing.pricing import price_book
+from apps.billing.serializers import QuoteSerializer
+from apps.products.models import Product
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure cart quote latency and queries, cold (empty price book) and warm. "
+        "All data is created inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lines", type=int, default=200, help="Number of cart lines.")
+        parser.add_argument("--repeat", type=int, default=50, help="Warm quotes to average over.")
+
+    def handle(self, *args, **options):
+        size = options["lines"]
+        repeat = options["repeat"]
+
+        with transaction.atomic():
+            products = Product.objects.bulk_create([
+                Product(item_id=f"BENCH-{i:05d}", name=f"Bench product {i}", quantity=10**6, price=Decimal("10.00"))
+                for i in range(size)
+            ])
+            payload = {"items": [{"product": p.pk, "quantity": 2} for p in products], "discount": "5.00"}
+
+            price_book.invalidate()
+            self.stdout.write(f"{'run':>5} {'queries':>8} {'ms/quote':>9}")
+            self._measure("cold", payload, 1)
+            self._measure("warm", payload, repeat)
+
+            price_book.invalidate()
+            transaction.set_rollback(True)
+
+    def _measure(self, label, payload, repeat):
+        started = time.perf_counter()
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(repeat):
+                serializer = QuoteSerializer(data=payload)
+                serializer.is_valid(raise_exception=True)
+                serializer.quote().as_dict()
+        elapsed = (time.perf_counter() - started) * 1000 / repeat
+        self.stdout.write(f"{label:>5} {len(ctx.captured_queries) / repeat:>8.1f} {elapsed:>9.2f}")
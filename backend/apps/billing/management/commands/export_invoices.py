@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+from apps.billing.invoices import invoice_archive
+from apps.billing.models import Bill
+from apps.billing.views import filter_bills
+
+
+class Command(BaseCommand):
+    help = (
+        "Write a ZIP of the invoices of the paid bills created in a date range, rendering "
+        "missing PDFs in the worker pool. Same archive as /api/billings/invoices/archive/."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("start_date", help="First day (YYYY-MM-DD) or ISO 8601 datetime.")
+        parser.add_argument("end_date", help="Last day, inclusive (YYYY-MM-DD) or ISO 8601 datetime.")
+        parser.add_argument("-o", "--output", help="Archive path (default invoices_<start>_<end>.zip).")
+
+    def handle(self, *args, **options):
+        start, end = options["start_date"], options["end_date"]
+        try:
+            bills = filter_bills(Bill.objects.all(), {"start_date": start, "end_date": end})
+        except ValidationError as exc:
+            raise CommandError(exc.detail)
+        output = options["output"] or f"invoices_{start[:10]}_{end[:10]}.zip"
+
+        written = 0
+        with open(output, "wb") as archive:
+            for chunk in invoice_archive(bills):
+                archive.write(chunk)
+                written += len(chunk)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {output} ({written} bytes)"))
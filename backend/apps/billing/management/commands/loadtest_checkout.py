@@ -0,0 +1,331 @@
+import random
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from decimal import Decimal
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+from apps.billing.invoices import NAMESPACE as INVOICE_NAMESPACE
+from apps.billing.models import Bill
+from apps.customers.models import Customer
+from apps.documents import storage
+from apps.documents.models import RenderJob
+from apps.documents.pool import render_pool
+from apps.outbox.models import OutboxEvent
+from apps.payment.models import Payment
+from apps.products.models import Product
+from apps.products.stock import set_stock
+from apps.sequences.allocator import allocator
+
+STEPS = ["lookup", "bill", "payment", "link", "pay", "invoice"]
+DEADLOCK_SQLSTATE = "40P01"
+RENDER_POLL_INTERVAL = 0.05
+
+
+class StepFailed(Exception):
+    def __init__(self, step, detail):
+        self.step = step
+        super().__init__(f"{step}: {detail}")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of `values` (already sorted)."""
+    if not values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(values) + 0.5)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def is_deadlock(exc):
+    while exc is not None:
+        if (getattr(exc, "pgcode", None) or getattr(exc, "sqlstate", None)) == DEADLOCK_SQLSTATE:
+            return True
+        exc = exc.__cause__
+    return False
+
+
+class LockSampler(threading.Thread):
+    """Polls pg_stat_activity for backends of this database waiting on a lock."""
+
+    def __init__(self, interval):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples = 0
+        self.waiting = 0  # sum of waiting backends over all samples
+        self.max_waiting = 0
+        self._done = threading.Event()
+
+    def run(self):
+        try:
+            with connection.cursor() as cursor:
+                while not self._done.wait(self.interval):
+                    cursor.execute(
+                        "SELECT count(*) FROM pg_stat_activity "
+                        "WHERE datname = current_database() AND wait_event_type = 'Lock'"
+                    )
+                    waiting = cursor.fetchone()[0]
+                    self.samples += 1
+                    self.waiting += waiting
+                    self.max_waiting = max(self.max_waiting, waiting)
+        finally:
+            connection.close()
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+    @property
+    def lock_wait_seconds(self):
+        return self.waiting * self.interval
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate concurrent cashiers running the full checkout flow (customer "
+        "lookup, bill, payment, link_bill, mark paid, invoice) against the "
+        "configured PostgreSQL database. Reports bills/sec, latency percentiles, "
+        "deadlocks and lock-wait time. Test data uses a LOADTEST- prefix and is "
+        "deleted afterwards unless --keep is given. Cashiers are threads sharing "
+        "one interpreter; run several copies in parallel to push the database harder."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cashiers", type=int, default=8, help="Concurrent cashiers (threads).")
+        parser.add_argument("--checkouts", type=int, default=25, help="Checkouts per cashier.")
+        parser.add_argument("--skus", type=int, default=20, help="Size of the shared product pool.")
+        parser.add_argument("--lines", type=int, default=5, help="Lines per bill, drawn from the pool.")
+        parser.add_argument("--customers", type=int, default=50, help="Customers to pick from.")
+        parser.add_argument("--stripes", type=int, default=0, help="Stock stripes per product (0 = unstriped).")
+        parser.add_argument("--skip-invoice", action="store_true", help="Do not render the invoice PDF.")
+        parser.add_argument("--sample-interval", type=float, default=0.05,
+                            help="Seconds between pg_stat_activity lock samples.")
+        parser.add_argument("--keep", action="store_true", help="Keep the generated data.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("loadtest_checkout needs PostgreSQL (it samples pg_stat_activity).")
+        if options["lines"] > options["skus"]:
+            raise CommandError("--lines cannot exceed --skus.")
+
+        run_id = uuid.uuid4().hex[:8]
+        self.prefix = f"LOADTEST-{run_id}"
+        self.steps = [step for step in STEPS if not (step == "invoice" and options["skip_invoice"])]
+        cashiers, customers, products = self._setup(options)
+        try:
+            # Requests go through the in-process test client, whose host is "testserver"
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+                report = self._run(cashiers, customers, products, options)
+        finally:
+            render_pool.shutdown()
+            if not options["keep"]:
+                self._cleanup(cashiers, customers, products)
+        self._print(report, options)
+
+    def _setup(self, options):
+        User = get_user_model()
+        with transaction.atomic():
+            cashiers = [
+                User.objects.create_user(
+                    email=f"{self.prefix.lower()}-{i}@example.com", password=uuid.uuid4().hex,
+                    role=User.ROLE_CASHIER,
+                )
+                for i in range(options["cashiers"])
+            ]
+            customers = Customer.objects.bulk_create([
+                Customer(name=f"Load customer {i}", contact_number=f"LT{self.prefix[-8:]}{i:05d}")
+                for i in range(options["customers"])
+            ])
+            products = Product.objects.bulk_create([
+                Product(
+                    item_id=f"{self.prefix}-{i:04d}", name=f"Load product {i}",
+                    quantity=10**7, price=Decimal("25.00"),
+                )
+                for i in range(options["skus"])
+            ])
+            if options["stripes"]:
+                for product in products:
+                    set_stock(product, product.quantity, stripe_count=options["stripes"])
+        return cashiers, customers, products
+
+    def _run(self, cashiers, customers, products, options):
+        results = []
+        results_lock = threading.Lock()
+        barrier = threading.Barrier(len(cashiers) + 1)
+
+        def cashier(user):
+            client = APIClient()
+            client.force_authenticate(user)
+            rng = random.Random(user.pk)
+            barrier.wait()
+            try:
+                for _ in range(options["checkouts"]):
+                    outcome = self._checkout(client, rng, customers, products, options)
+                    with results_lock:
+                        results.append(outcome)
+            finally:
+                allocator.close()
+                connections.close_all()
+
+        threads = [threading.Thread(target=cashier, args=(user,)) for user in cashiers]
+        for thread in threads:
+            thread.start()
+
+        deadlocks_before = self._server_deadlocks()
+        sampler = LockSampler(options["sample_interval"])
+        sampler.start()
+        barrier.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        sampler.stop()
+
+        return {
+            "results": results,
+            "elapsed": elapsed,
+            "server_deadlocks": self._server_deadlocks() - deadlocks_before,
+            "sampler": sampler,
+        }
+
+    def _checkout(self, client, rng, customers, products, options):
+        """Run one checkout; returns (per-step ms, total ms, failed step, deadlocked)."""
+        timings = {}
+        started = time.perf_counter()
+
+        def step(name, method, url, data=None, expect=(200,)):
+            step_started = time.perf_counter()
+            if method == "get":
+                response = client.get(url, data)
+            else:
+                response = getattr(client, method)(url, data, format="json")
+            timings[name] = (time.perf_counter() - step_started) * 1000
+            if response.status_code not in expect:
+                raise StepFailed(name, response.status_code)
+            return response
+
+        current = "lookup"
+        try:
+            customer = rng.choice(customers)
+            step("lookup", "get", "/api/customers/search/", {"contact": customer.contact_number})
+
+            current = "bill"
+            items = [
+                {"product": product.pk, "quantity": rng.randint(1, 3), "price": "0"}
+                for product in rng.sample(products, options["lines"])
+            ]
+            bill = step("bill", "post", "/api/billings/", {
+                "customer": customer.pk, "discount": "0", "payment_status": "pending", "items": items,
+            }, expect=(201,)).json()
+
+            current = "payment"
+            transaction_id = f"{self.prefix}-{uuid.uuid4().hex[:12]}"
+            step("payment", "post", "/api/payments/", {
+                "transaction_id": transaction_id, "amount": bill["total"], "status": "pending",
+            }, expect=(201,))
+
+            current = "link"
+            step("link", "patch", f"/api/payments/{transaction_id}/link_bill/", {"bill_id": bill["id"]})
+
+            current = "pay"
+            step("pay", "patch", f"/api/billings/{bill['id']}/mark_paid/", {
+                "transaction_id": transaction_id, "payment_method": "cash",
+            })
+
+            if "invoice" in self.steps:
+                current = "invoice"
+                # 202 means the render outlived ?wait=; the cashier polls the job like a real client
+                response = step("invoice", "get", f"/api/billings/{bill['id']}/invoice/", expect=(200, 202))
+                self._fetch_invoice(client, response, timings)
+        except StepFailed as exc:
+            return timings, None, exc.step, False
+        except Exception as exc:  # a view error surfaces here; count it instead of killing the cashier
+            return timings, None, current, is_deadlock(exc)
+        return timings, (time.perf_counter() - started) * 1000, None, False
+
+    @staticmethod
+    def _fetch_invoice(client, response, timings):
+        """Poll a 202 render job until its PDF downloads; the wait counts towards the invoice step."""
+        started = time.perf_counter()
+        if response.status_code == 202:
+            # A render is interrupted after PDF_RENDER_TIMEOUT, so the job finishes by then
+            deadline = started + settings.PDF_RENDER_TIMEOUT + settings.PDF_RENDER_WAIT
+            job = response.json()
+            while job["status"] == RenderJob.PENDING:
+                if time.perf_counter() > deadline:
+                    raise StepFailed("invoice", "render job did not finish")
+                time.sleep(RENDER_POLL_INTERVAL)
+                job = client.get(job["status_url"]).json()
+            if job["status"] != RenderJob.DONE:
+                raise StepFailed("invoice", job["error"])
+            response = client.get(job["download_url"])
+            if response.status_code != 200:
+                raise StepFailed("invoice", response.status_code)
+        b"".join(response.streaming_content)
+        response.close()
+        timings["invoice"] += (time.perf_counter() - started) * 1000
+
+    @staticmethod
+    def _server_deadlocks():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT deadlocks FROM pg_stat_database WHERE datname = current_database()")
+            return cursor.fetchone()[0]
+
+    def _cleanup(self, cashiers, customers, products):
+        with transaction.atomic():
+            bill_ids = list(Bill.objects.filter(cashier__in=cashiers).values_list("id", flat=True))
+            Payment.objects.filter(transaction_id__startswith=self.prefix).delete()
+            OutboxEvent.objects.filter(topic="bill.created", payload__bill__in=bill_ids).delete()
+            RenderJob.objects.filter(
+                namespace=INVOICE_NAMESPACE, object_id__in=[str(bill_id) for bill_id in bill_ids]
+            ).delete()
+            Bill.objects.filter(id__in=bill_ids).delete()
+            Customer.objects.filter(id__in=[c.pk for c in customers]).delete()
+            Product.objects.filter(id__in=[p.pk for p in products]).delete()
+            get_user_model().objects.filter(id__in=[u.pk for u in cashiers]).delete()
+        # Deleting a bill drops its cached PDFs, but a render may have finished since
+        for bill_id in bill_ids:
+            storage.discard(INVOICE_NAMESPACE, bill_id)
+
+    def _print(self, report, options):
+        results = report["results"]
+        totals = sorted(total for _, total, _, _ in results if total is not None)
+        failures = Counter(step for _, total, step, _ in results if total is None)
+        client_deadlocks = sum(1 for *_, deadlocked in results if deadlocked)
+        per_step = defaultdict(list)
+        for timings, *_ in results:
+            for name, ms in timings.items():
+                per_step[name].append(ms)
+
+        elapsed = report["elapsed"]
+        self.stdout.write(
+            f"{options['cashiers']} cashiers x {options['checkouts']} checkouts, "
+            f"{options['lines']} lines from {options['skus']} SKUs, stripes={options['stripes']}"
+        )
+        self.stdout.write(
+            f"completed {len(totals)}, failed {sum(failures.values())} in {elapsed:.2f} s "
+            f"-> {len(totals) / elapsed:.1f} bills/s"
+        )
+        self.stdout.write(f"\n{'step':<10} {'n':>6} {'p50':>9} {'p95':>9} {'p99':>9}  (ms)")
+        for name, values in [("checkout", totals)] + [(step, sorted(per_step[step])) for step in self.steps]:
+            self.stdout.write(
+                f"{name:<10} {len(values):>6} {percentile(values, 50):>9.1f} "
+                f"{percentile(values, 95):>9.1f} {percentile(values, 99):>9.1f}"
+            )
+
+        sampler = report["sampler"]
+        self.stdout.write(
+            f"\ndeadlocks: {report['server_deadlocks']} detected by the server, "
+            f"{client_deadlocks} surfaced to cashiers"
+        )
+        self.stdout.write(
+            f"lock waits: ~{sampler.lock_wait_seconds:.2f} s across backends "
+            f"({sampler.samples} samples every {sampler.interval * 1000:.0f} ms, "
+            f"at most {sampler.max_waiting} waiting at once)"
+        )
+        if failures:
+            self.stdout.write("failures by step: " + ", ".join(f"{k}={v}" for k, v in sorted(failures.items())))
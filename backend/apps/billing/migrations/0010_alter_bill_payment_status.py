@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-17 07:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0009_bill_payment_date_bill_payment_method_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='bill',
+            name='payment_status',
+            field=models.CharField(choices=[('pending', 'Pending Payment'), ('paid', 'Paid'), ('failed', 'Failed'), ('void', 'Void')], default='pending', max_length=20),
+        ),
+    ]
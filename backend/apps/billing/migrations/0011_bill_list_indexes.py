@@ -0,0 +1,55 @@
+# Generated by Django 5.2.7 on 2026-10-17 07:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes are built CONCURRENTLY so a large bill table stays writable
+    atomic = False
+
+    dependencies = [
+        ('billing', '0010_alter_bill_payment_status'),
+        ('customers', '0003_customer_address_customer_date_of_birth_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='bill',
+            index=models.Index(fields=['-created_at'], name='bill_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='bill',
+            index=models.Index(fields=['bill_id'], name='bill_bill_id_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        AddIndexConcurrently(
+            model_name='bill',
+            index=models.Index(fields=['customer', '-created_at'], name='bill_customer_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='bill',
+            index=models.Index(fields=['cashier', '-created_at'], name='bill_cashier_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='bill',
+            index=models.Index(fields=['payment_status', '-created_at'], name='bill_status_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='bill',
+            index=models.Index(condition=models.Q(('payment_method__isnull', False)), fields=['payment_method', '-created_at'], name='bill_method_created_idx'),
+        ),
+        # The composite indexes above lead with these columns
+        migrations.AlterField(
+            model_name='bill',
+            name='cashier',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='bills', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='bill',
+            name='customer',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to='customers.customer'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-17 07:15
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False  # CONCURRENTLY cannot run inside a transaction
+
+    dependencies = [
+        ('billing', '0011_bill_list_indexes'),
+        ('customers', '0004_customer_customer_created_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='bill',
+            index=models.Index(fields=['-created_at', '-id'], name='bill_created_id_idx'),
+        ),
+        RemoveIndexConcurrently(
+            model_name='bill',
+            name='bill_created_idx',
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-17 07:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0012_bill_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bill',
+            name='customer_name',
+            field=models.CharField(blank=True, default='', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='bill',
+            name='item_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='bill',
+            name='item_names',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
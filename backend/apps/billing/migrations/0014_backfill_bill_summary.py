@@ -0,0 +1,31 @@
+from django.db import migrations
+
+# One set-based UPDATE: line count, first three product names (in line order)
+# and the customer's current name for every existing bill.
+BACKFILL = """
+UPDATE billing_bill AS b SET
+    item_count = (SELECT count(*) FROM billing_billitem i WHERE i.bill_id = b.id),
+    item_names = COALESCE((
+        SELECT jsonb_agg(first.name ORDER BY first.id)
+        FROM (
+            SELECT i.id, p.name
+            FROM billing_billitem i
+            JOIN products_product p ON p.id = i.product_id
+            WHERE i.bill_id = b.id
+            ORDER BY i.id
+            LIMIT 3
+        ) AS first
+    ), '[]'::jsonb),
+    customer_name = COALESCE((SELECT c.name FROM customers_customer c WHERE c.id = b.customer_id), '')
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0013_bill_summary'),
+    ]
+
+    operations = [
+        migrations.RunSQL(BACKFILL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.7 on 2026-10-17 07:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0014_backfill_bill_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bill',
+            name='discount_paise',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='bill',
+            name='subtotal_paise',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='bill',
+            name='tax_paise',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='bill',
+            name='total_paise',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='billitem',
+            name='price_paise',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='bill',
+            name='subtotal',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=30),
+        ),
+        migrations.AlterField(
+            model_name='bill',
+            name='tax',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=30),
+        ),
+        migrations.AlterField(
+            model_name='bill',
+            name='total',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=30),
+        ),
+        migrations.AlterField(
+            model_name='billitem',
+            name='price',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+# Copy the rupee columns into the new paise columns; the rupee columns stay
+# and are written from the paise ones until every reader has moved over.
+BACKFILL = """
+UPDATE billing_bill SET
+    subtotal_paise = ROUND(subtotal * 100),
+    tax_paise = ROUND(tax * 100),
+    discount_paise = ROUND(discount * 100),
+    total_paise = ROUND(total * 100);
+UPDATE billing_billitem SET price_paise = ROUND(price * 100);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0015_paise_amounts'),
+    ]
+
+    operations = [
+        migrations.RunSQL(BACKFILL, reverse_sql=migrations.RunSQL.noop),
+    ]
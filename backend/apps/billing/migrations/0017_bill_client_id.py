@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-17 09:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0016_backfill_paise_amounts'),
+        ('customers', '0004_customer_customer_created_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bill',
+            name='client_id',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='bill',
+            constraint=models.UniqueConstraint(condition=models.Q(('client_id__isnull', False)), fields=('cashier', 'client_id'), name='bill_cashier_client_id_uniq'),
+        ),
+    ]
@@ -1,29 +1,42 @@
-import uuid
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
 from apps.accounts.models import CustomUser
 from apps.customers.models import Customer
 from apps.products.models import Product
-from apps.customers.models import CustomerLoyalty
+from apps.outbox.dispatch import publish
+from apps.sequences.allocator import document_number
+from backend_api.money import from_paise
 
 class Bill(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending Payment'),
         ('paid', 'Paid'),
         ('failed', 'Failed'),
+        ('void', 'Void'),
     ]
 
+    # States from which a bill may be settled or voided
+    OPEN_STATUSES = ('pending', 'failed')
+
     bill_id = models.CharField(max_length=100, unique=True, editable=False)
+    # Both FKs are indexed by the composite (..., created_at) indexes in Meta
     cashier = models.ForeignKey(
-        CustomUser, on_delete=models.SET_NULL, null=True, related_name="bills"
+        CustomUser, on_delete=models.SET_NULL, null=True, related_name="bills", db_index=False
     )
     customer = models.ForeignKey(
-        Customer, on_delete=models.SET_NULL, null=True, blank=True
+        Customer, on_delete=models.SET_NULL, null=True, blank=True, db_index=False
     )
-    subtotal = models.DecimalField(max_digits=30, decimal_places=2)
-    tax = models.DecimalField(max_digits=30, decimal_places=2)
+    # ✅ Amounts in integer paise; these are the source of truth
+    subtotal_paise = models.BigIntegerField(default=0)
+    tax_paise = models.BigIntegerField(default=0)
+    discount_paise = models.BigIntegerField(default=0)
+    total_paise = models.BigIntegerField(default=0)
+    # Legacy rupee columns, written from the paise ones for readers not yet migrated
+    subtotal = models.DecimalField(max_digits=30, decimal_places=2, default=0)
+    tax = models.DecimalField(max_digits=30, decimal_places=2, default=0)
     discount = models.DecimalField(max_digits=30, decimal_places=2, default=0)
-    total = models.DecimalField(max_digits=30, decimal_places=2)
+    total = models.DecimalField(max_digits=30, decimal_places=2, default=0)
     payment_status = models.CharField(
         max_length=20, choices=STATUS_CHOICES, default='pending'
     )
@@ -32,24 +45,77 @@ class Bill(models.Model):
     payment_method = models.CharField(max_length=50, blank=True, null=True)
     created_at = models.DateTimeField(default=timezone.now)
 
+    # ✅ Summary written at creation so list views never touch items or customers
+    item_count = models.PositiveIntegerField(default=0)
+    item_names = models.JSONField(default=list, blank=True)  # first SUMMARY_NAMES product names
+    customer_name = models.CharField(max_length=200, blank=True, default="")
+    # Id the POS gave an offline bill, so re-sending it in a batch does not create it twice
+    client_id = models.CharField(max_length=64, null=True, blank=True, editable=False)
+
+    SUMMARY_NAMES = 3
+    AMOUNT_FIELDS = ("subtotal", "tax", "discount", "total")
+
+    class Meta:
+        indexes = [
+            # Newest-first keyset pagination and created_at range filters
+            models.Index(fields=["-created_at", "-id"], name="bill_created_id_idx"),
+            # bill_id prefix search (LIKE 'BILL-2025%') regardless of the collation
+            models.Index(fields=["bill_id"], opclasses=["varchar_pattern_ops"], name="bill_bill_id_prefix_idx"),
+            models.Index(fields=["customer", "-created_at"], name="bill_customer_created_idx"),
+            models.Index(fields=["cashier", "-created_at"], name="bill_cashier_created_idx"),
+            models.Index(fields=["payment_status", "-created_at"], name="bill_status_created_idx"),
+            # Only settled bills carry a payment method
+            models.Index(
+                fields=["payment_method", "-created_at"],
+                condition=Q(payment_method__isnull=False),
+                name="bill_method_created_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["cashier", "client_id"],
+                condition=Q(client_id__isnull=False),
+                name="bill_cashier_client_id_uniq",
+            ),
+        ]
+
+    @staticmethod
+    def generate_bill_id():
+        return document_number("BILL", "bill")  # BILL-20251031-000042
+
+    @staticmethod
+    def points_for(paise):
+        return paise // 10000  # 1 point per ₹100 spent
+
+    @property
+    def loyalty_points(self):
+        return self.points_for(self.total_paise)
+
+    def sync_legacy_amounts(self):
+        for name in self.AMOUNT_FIELDS:
+            setattr(self, name, from_paise(getattr(self, f"{name}_paise")))
+
+    def fill_summary(self, product_names):
+        """Snapshot the line count, the first product names and the customer's name."""
+        self.item_count = len(product_names)
+        self.item_names = list(product_names[:self.SUMMARY_NAMES])
+        self.customer_name = self.customer.name if self.customer_id else ""
+
+    def outbox_payload(self):
+        return {"bill": self.pk, "customer": self.customer_id, "points": self.loyalty_points}
+
     def save(self, *args, **kwargs):
         is_new = self._state.adding
         if is_new and not self.bill_id:
-            timestamp = timezone.now().strftime("%Y%m%d%H%M%S")
-            unique_part = uuid.uuid4().hex[:6].upper()
-            self.bill_id = f"BILL-{timestamp}-{unique_part}"
+            self.bill_id = self.generate_bill_id()
+        self.sync_legacy_amounts()
 
         # ✅ Save Bill first
         super().save(*args, **kwargs)
 
-        # ✅ Update customer loyalty points after save
-        if is_new and self.customer:
-            loyalty, _ = CustomerLoyalty.objects.get_or_create(customer=self.customer)
-            earned_points = int(self.total // 100)  # 1 point per ₹100 spent
-            loyalty.available_points += earned_points
-            loyalty.lifetime_points += earned_points
-            loyalty.update_tier()
-            loyalty.save()
+        # ✅ Loyalty is credited later by the outbox worker, not in this request
+        if is_new and self.customer_id:
+            publish("bill.created", self.outbox_payload())
 
     def __str__(self):
         return self.bill_id
@@ -59,7 +125,20 @@ class BillItem(models.Model):
     bill = models.ForeignKey(Bill, on_delete=models.CASCADE, related_name="items")
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
     quantity = models.IntegerField()
-    price = models.DecimalField(max_digits=12, decimal_places=2)
+    price_paise = models.BigIntegerField(default=0)
+    # Legacy rupee column, written from price_paise
+    price = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    @property
+    def total_paise(self):
+        return self.quantity * self.price_paise
+
+    def sync_legacy_amounts(self):
+        self.price = from_paise(self.price_paise)
+
+    def save(self, *args, **kwargs):
+        self.sync_legacy_amounts()
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.product.name} × {self.quantity}"
@@ -0,0 +1,188 @@
+"""
+Server-side cart pricing.
+
+`quote_cart` prices a whole cart in one pass from a `PriceBook`: an
+in-process cache of product prices and category tax rates. Entries are
+dropped when this worker saves a Product or Category and expire after
+PRICE_BOOK_TTL seconds, which bounds how stale other workers can be.
+Line discounts come from the compiled promotion rules in
+`apps.promotions.engine`.
+
+All arithmetic is on integers: prices are paise and tax rates basis points
+(hundredths of a percent), so "5.00" is 500.
+"""
+import threading
+import time
+from collections import namedtuple
+from dataclasses import dataclass, field
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.products.models import Category, Product
+from apps.promotions.engine import promotion_index
+from backend_api.money import (
+    BASIS_POINTS_PER_UNIT, div_round, format_basis_points, format_paise, to_basis_points, to_paise,
+)
+
+# price in paise, tax_rate in basis points
+PriceEntry = namedtuple("PriceEntry", "product_id name price tax_rate category_id")
+
+
+class PriceBook:
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._products = {}  # product id -> (PriceEntry without tax rate, loaded at)
+        self._tax_rates = None  # category id -> tax rate in basis points
+        self._tax_rates_loaded_at = 0
+        self._lock = threading.Lock()
+
+    def entries(self, product_ids):
+        """Return {product id: PriceEntry} for the ids that exist, loading misses in one query."""
+        now = time.monotonic()
+        with self._lock:
+            cached = {pid: self._products.get(pid) for pid in product_ids}
+        missing = [pid for pid, hit in cached.items() if hit is None or now - hit[1] > self.ttl]
+        if missing:
+            rows = Product.objects.filter(id__in=missing).values_list("id", "name", "price", "category_id")
+            fresh = {
+                pid: (PriceEntry(pid, name, to_paise(price), None, category_id), now)
+                for pid, name, price, category_id in rows
+            }
+            with self._lock:
+                for pid in missing:
+                    self._products.pop(pid, None)
+                self._products.update(fresh)
+            for pid in missing:
+                cached[pid] = fresh.get(pid)
+        return {
+            pid: hit[0]._replace(tax_rate=self.tax_rate(hit[0].category_id))
+            for pid, hit in cached.items()
+            if hit is not None
+        }
+
+    def tax_rate(self, category_id):
+        now = time.monotonic()
+        rates = self._tax_rates
+        if rates is None or now - self._tax_rates_loaded_at > self.ttl:
+            rates = {
+                pk: to_basis_points(rate)
+                for pk, rate in Category.objects.exclude(tax_rate=None).values_list("id", "tax_rate")
+            }
+            rates[None] = to_basis_points(settings.BILLING_DEFAULT_TAX_RATE)  # uncategorized, and the fallback
+            with self._lock:
+                self._tax_rates, self._tax_rates_loaded_at = rates, now
+        return rates.get(category_id, rates[None])
+
+    def entry_for(self, product):
+        """PriceEntry for an already loaded Product instance (no product query)."""
+        return PriceEntry(
+            product.pk, product.name, to_paise(product.price), self.tax_rate(product.category_id),
+            product.category_id,
+        )
+
+    def invalidate(self, product_id=None):
+        with self._lock:
+            if product_id is None:
+                self._products.clear()
+                self._tax_rates = None
+            else:
+                self._products.pop(product_id, None)
+
+
+price_book = PriceBook(ttl=settings.PRICE_BOOK_TTL)
+
+
+@receiver([post_save, post_delete], sender=Product)
+def _drop_cached_product(sender, instance, **kwargs):
+    price_book.invalidate(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Category)
+def _drop_cached_tax_rates(sender, instance, **kwargs):
+    price_book.invalidate()
+
+
+@dataclass
+class QuoteLine:
+    product_id: int
+    name: str
+    quantity: int
+    unit_price: int
+    tax_rate: int
+    line_total: int
+    discount: int
+    promotion_id: int
+    tax: int
+
+
+@dataclass
+class Quote:
+    lines: list = field(default_factory=list)
+    subtotal: int = 0
+    tax: int = 0
+    promotion_discount: int = 0
+    discount: int = 0
+    total: int = 0
+
+    def as_dict(self):
+        """JSON-ready representation; amounts are decimal strings like the bill API."""
+        return {
+            "items": [
+                {
+                    "product": line.product_id,
+                    "product_name": line.name,
+                    "quantity": line.quantity,
+                    "price": format_paise(line.unit_price),
+                    "tax_rate": format_basis_points(line.tax_rate),
+                    "line_total": format_paise(line.line_total),
+                    "discount": format_paise(line.discount),
+                    "promotion": line.promotion_id,
+                    "tax": format_paise(line.tax),
+                }
+                for line in self.lines
+            ],
+            "subtotal": format_paise(self.subtotal),
+            "tax": format_paise(self.tax),
+            "promotion_discount": format_paise(self.promotion_discount),
+            "discount": format_paise(self.discount),
+            "total": format_paise(self.total),
+        }
+
+
+def quote_cart(lines, entries, discount=0, tier=""):
+    """
+    Price a cart.
+
+    `lines` is a list of (product id, quantity) and `entries` maps product id
+    -> PriceEntry (from `price_book`). The best promotion for `tier` (a
+    loyalty tier, "" for none) is taken off each line before tax; tax is
+    summed unrounded and rounded once. `discount` is a manual discount in
+    paise on top, capped at what is left to pay. `Quote.discount` is the
+    sum of both. Every amount in the result is in paise.
+    """
+    quote = Quote()
+    priced = [(entries[product_id], quantity) for product_id, quantity in lines]
+    promotions = promotion_index.discounts(
+        ((entry.product_id, entry.category_id, entry.price, quantity) for entry, quantity in priced),
+        tier=tier,
+    )
+    subtotal = promotion_discount = 0
+    tax = 0  # paise x basis points, divided out once at the end
+    for (entry, quantity), (line_discount, promotion_id) in zip(priced, promotions):
+        line_total = entry.price * quantity
+        line_tax = (line_total - line_discount) * entry.tax_rate
+        quote.lines.append(QuoteLine(
+            entry.product_id, entry.name, quantity, entry.price, entry.tax_rate,
+            line_total, line_discount, promotion_id, div_round(line_tax, BASIS_POINTS_PER_UNIT),
+        ))
+        subtotal += line_total
+        promotion_discount += line_discount
+        tax += line_tax
+
+    quote.subtotal = subtotal
+    quote.tax = div_round(tax, BASIS_POINTS_PER_UNIT)
+    quote.promotion_discount = promotion_discount
+    payable = subtotal - promotion_discount + quote.tax
+    quote.discount = promotion_discount + min(max(discount, 0), payable)
+    quote.total = subtotal + quote.tax - quote.discount
+    return quote
@@ -0,0 +1,121 @@
+"""
+80 mm till receipts, built straight from Bill and BillItem.
+
+`receipt_lines` lays the receipt out once as fixed-width text (42 columns,
+the usual Font A width on 80 mm paper). `receipt_pdf` draws those lines
+with the PDF core Courier fonts, so nothing is embedded or laid out, and
+`receipt_escpos` wraps them in ESC/POS commands for a thermal printer.
+Neither touches WeasyPrint or the PDF worker pool; a receipt takes a few
+milliseconds in the request thread. pydyf is imported on first use, like
+the other PDF libraries (see profile_imports).
+"""
+import io
+import textwrap
+from django.utils import timezone
+from backend_api.money import format_paise
+
+WIDTH = 42
+HEADER = ("SUPERMARKET", "Thank you for shopping with us!")
+RULE = "-" * WIDTH
+
+# Line styles
+PLAIN, BOLD, CENTER, TITLE = "plain", "bold", "center", "title"
+
+# PDF page: 80 mm roll, Courier 8 pt (4.8 pt per character)
+MM = 72 / 25.4
+PAGE_WIDTH = 80 * MM
+FONT_SIZE = 8
+LEADING = 10
+MARGIN = 4 * MM
+
+# ESC/POS commands
+ESC_INIT = b"\x1b@"
+ESC_ALIGN = {PLAIN: b"\x1ba\x00", BOLD: b"\x1ba\x00", CENTER: b"\x1ba\x01", TITLE: b"\x1ba\x01"}
+ESC_BOLD_ON, ESC_BOLD_OFF = b"\x1bE\x01", b"\x1bE\x00"
+ESC_FEED = b"\x1bd\x04"
+ESC_CUT = b"\x1dVB\x00"  # feed to the cutter, partial cut
+
+
+def _columns(left, right):
+    return f"{left[:WIDTH - len(right) - 1]:<{WIDTH - len(right)}}{right}"
+
+
+def receipt_lines(bill):
+    """Receipt as a list of (text, style); `bill` should have items__product prefetched."""
+    lines = [(HEADER[0], TITLE), *((text, CENTER) for text in HEADER[1:]), (RULE, PLAIN)]
+    lines.append((f"Bill: {bill.bill_id}", PLAIN))
+    lines.append((f"Date: {timezone.localtime(bill.created_at):%d %b %Y %H:%M}", PLAIN))
+    if bill.customer:
+        lines.append((f"Customer: {bill.customer.name}", PLAIN))
+        lines.append((f"Phone: {bill.customer.contact_number}", PLAIN))
+    lines.append((RULE, PLAIN))
+
+    lines.append((f"{'Item':<18} {'Qty':>4} {'Price':>8} {'Amount':>9}", BOLD))
+    for item in bill.items.all():
+        numbers = f"{item.quantity:>4} {format_paise(item.price_paise):>8} {format_paise(item.total_paise):>9}"
+        name = textwrap.wrap(item.product.name, 18) or [""]
+        for part in name[:-1]:
+            lines.append((part, PLAIN))
+        lines.append((f"{name[-1]:<18} {numbers}", PLAIN))
+    lines.append((RULE, PLAIN))
+
+    lines.append((_columns("Subtotal", format_paise(bill.subtotal_paise)), PLAIN))
+    lines.append((_columns("Tax (GST)", format_paise(bill.tax_paise)), PLAIN))
+    if bill.discount_paise:
+        lines.append((_columns("Discount", f"-{format_paise(bill.discount_paise)}"), PLAIN))
+    lines.append((_columns("TOTAL", f"Rs {format_paise(bill.total_paise)}"), BOLD))
+    if bill.payment_method:
+        lines.append((_columns("Paid by", bill.payment_method), PLAIN))
+    lines.append((RULE, PLAIN))
+    return lines
+
+
+def _layout(text, style):
+    return text.center(WIDTH).rstrip() if style in (CENTER, TITLE) else text
+
+
+def receipt_pdf(bill):
+    """Receipt as a one-page PDF sized to its content on an 80 mm roll."""
+    import pydyf
+    lines = receipt_lines(bill)
+    height = 2 * MARGIN + LEADING * len(lines)
+
+    document = pydyf.PDF()
+    fonts = {}
+    for name, base_font in (("F1", "/Courier"), ("F2", "/Courier-Bold")):
+        font = pydyf.Dictionary({
+            "Type": "/Font", "Subtype": "/Type1", "BaseFont": base_font, "Encoding": "/WinAnsiEncoding",
+        })
+        document.add_object(font)
+        fonts[name] = font.reference
+
+    content = pydyf.Stream()
+    content.begin_text()
+    for number, (text, style) in enumerate(lines):
+        content.set_font_size("F2" if style in (BOLD, TITLE) else "F1", FONT_SIZE)
+        content.set_text_matrix(1, 0, 0, 1, MARGIN, height - MARGIN - LEADING * (number + 1) + 2)
+        content.show_text(pydyf.String(_layout(text, style).encode("cp1252", "replace")))
+    content.end_text()
+    document.add_object(content)
+
+    document.add_page(pydyf.Dictionary({
+        "Type": "/Page",
+        "Parent": document.pages.reference,
+        "MediaBox": pydyf.Array([0, 0, round(PAGE_WIDTH, 2), round(height, 2)]),
+        "Resources": pydyf.Dictionary({"Font": pydyf.Dictionary(fonts)}),
+        "Contents": content.reference,
+    }))
+    output = io.BytesIO()
+    document.write(output)
+    return output.getvalue()
+
+
+def receipt_escpos(bill):
+    """Receipt as an ESC/POS byte stream (code page 437) ending in a paper cut."""
+    out = [ESC_INIT]
+    for text, style in receipt_lines(bill):
+        out.append(ESC_ALIGN[style])
+        encoded = text.encode("cp437", "replace") + b"\n"
+        out.append(ESC_BOLD_ON + encoded + ESC_BOLD_OFF if style in (BOLD, TITLE) else encoded)
+    out.append(ESC_FEED + ESC_CUT)
+    return b"".join(out)
@@ -1,85 +1,216 @@
+from django.conf import settings
 from rest_framework import serializers
-from django.db import transaction
 from .models import Bill, BillItem
+from .pricing import price_book, quote_cart
+from .services import create_bills
 from apps.customers.models import Customer
 from apps.products.models import Product
+from apps.products.stock import InsufficientStock
+from apps.promotions.engine import customer_tier
+from backend_api.money import PaiseField
+
+
+class PreloadedCustomerField(serializers.PrimaryKeyRelatedField):
+    """
+    Looks the customer up in `context["customers"]` when the caller has
+    preloaded them (batch ingestion); otherwise queries as usual.
+    """
+
+    def to_internal_value(self, data):
+        customers = self.context.get("customers")
+        if customers is None:
+            return super().to_internal_value(data)
+        try:
+            return customers[int(data)]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+
+class ProductIdField(serializers.PrimaryKeyRelatedField):
+    """
+    Accepts a Product PK without querying it.
+    `BillingSerializer.validate_items` resolves all lines in one query.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, Product):
+            return data
+        try:
+            return int(data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
 
 
 class BillingItemSerializer(serializers.ModelSerializer):
     # Ensure we always receive a valid Product PK on write
-    product = serializers.PrimaryKeyRelatedField(queryset=Product.objects.all())
+    product = ProductIdField(queryset=Product.objects.all())
     product_name = serializers.CharField(source="product.name", read_only=True)
+    price = PaiseField(source="price_paise", required=False)
 
     class Meta:
         model = BillItem
         fields = ["id", "product", "product_name", "quantity", "price"]
         depth = 1
 
-class BillingSerializer(serializers.ModelSerializer):
+class BillAmountsMixin(serializers.Serializer):
+    """Bill amounts, stored as paise and rendered as decimal strings."""
+    subtotal = PaiseField(source="subtotal_paise", read_only=True)
+    tax = PaiseField(source="tax_paise", read_only=True)
+    discount = PaiseField(source="discount_paise", min_value=0, required=False, default=0)
+    total = PaiseField(source="total_paise", read_only=True)
+
+
+class BillListSerializer(BillAmountsMixin, serializers.ModelSerializer):
+    """Bill list rows: only columns of the Bill table, including its summary."""
+
+    class Meta:
+        model = Bill
+        fields = [
+            "id", "bill_id", "customer", "cashier", "customer_name",
+            "item_count", "item_names",
+            "subtotal", "tax", "discount", "total", "payment_status",
+            "transaction_id", "payment_date", "payment_method", "created_at",
+        ]
+        read_only_fields = fields
+
+
+class BillingSerializer(BillAmountsMixin, serializers.ModelSerializer):
     items = BillingItemSerializer(many=True)
-    customer_name = serializers.CharField(source="customer.name", read_only=True)
-    customer = serializers.PrimaryKeyRelatedField(
-        queryset=Customer.objects.all(), required=True
+    customer = PreloadedCustomerField(
+        queryset=Customer.objects.select_related("loyalty"), required=True
     )
 
     class Meta:
         model = Bill
         fields = [
             "id", "bill_id", "customer", "cashier", "customer_name",
+            "item_count", "item_names",
             "subtotal", "tax", "discount", "total","payment_status",
             "transaction_id", "payment_date", "payment_method",
             "items", "created_at"
         ]
-        read_only_fields = ["bill_id", "created_at", "transaction_id", "payment_date", "payment_method"]
+        read_only_fields = [
+            "bill_id", "created_at", "transaction_id", "payment_date", "payment_method",
+            "customer_name", "item_count", "item_names",
+        ]
         depth=1
 
+    def validate_items(self, items):
+        """
+        Resolve every line's product with a single `id__in` query, or from
+        `context["products"]` when the caller has preloaded them.
+        """
+        product_ids = {
+            item["product"] for item in items if not isinstance(item["product"], Product)
+        }
+        products = self.context.get("products")
+        if products is None:
+            products = Product.objects.in_bulk(product_ids)
+
+        missing = sorted(pid for pid in product_ids if pid not in products)
+        if missing:
+            raise serializers.ValidationError(
+                f"Invalid product id(s): {', '.join(map(str, missing))}."
+            )
+
+        for item in items:
+            if not isinstance(item["product"], Product):
+                item["product"] = products[item["product"]]
+        return items
+
+    def validate(self, attrs):
+        """
+        Recompute line prices, promotions and totals with the pricing engine;
+        client totals are ignored and `discount` is read as the manual discount.
+        """
+        items = attrs.get("items", [])
+        quote = quote_cart(
+            [(item["product"].pk, item["quantity"]) for item in items],
+            {item["product"].pk: price_book.entry_for(item["product"]) for item in items},
+            discount=attrs.get("discount_paise", 0),
+            tier=customer_tier(attrs.get("customer")),
+        )
+        for item, line in zip(items, quote.lines):
+            item["price_paise"] = line.unit_price
+        attrs.update(
+            subtotal_paise=quote.subtotal, tax_paise=quote.tax,
+            discount_paise=quote.discount, total_paise=quote.total,
+        )
+        return attrs
 
-    @transaction.atomic  # ✅ ensures rollback if anything fails
     def create(self, validated_data):
         request = self.context.get("request")
-        items_data = validated_data.pop("items", []) # if nothing in db it shows as []
 
         # Attach cashier if available
-        if request and hasattr(request, "user"):
-            validated_data["cashier"] = request.user
+        cashier = request.user if request and hasattr(request, "user") else None
 
         # Create bill with pending status by default (already set in model)
-        bill = Bill.objects.create(**validated_data)
-
-        # Process all bill items
-        for item_data in items_data:
-            # With PrimaryKeyRelatedField above, DRF will pass Product instance here
-            product_value = item_data.get("product")
-            quantity = item_data.get("quantity", 0)
-            price = item_data.get("price", 0)
-
-            # Resolve product instance robustly
-            if isinstance(product_value, Product):
-                product = product_value
-            elif product_value is not None:
-                product = Product.objects.filter(id=product_value).first()
-            else:
-                product = None
-
-            if product is None:
-                raise serializers.ValidationError({"product": "Product is required for each item and must be valid."})
-
-            # ✅ Create the BillItem
-            BillItem.objects.create(
-                bill=bill,
-                product=product,
-                quantity=quantity,
-                price=price,
+        try:
+            return create_bills([validated_data], cashier=cashier)[0]
+        except InsufficientStock as exc:
+            raise serializers.ValidationError({"items": [str(exc)]})
+
+
+class QuoteSerializer(serializers.Serializer):
+    """
+    Cart submitted to POST /api/billings/quote/.
+    Lines are parsed by hand rather than with a nested serializer: per-field
+    DRF validation would dominate the latency of a large cart.
+    """
+    items = serializers.ListField()
+    discount = PaiseField(min_value=0, required=False, default=0)
+    customer = serializers.PrimaryKeyRelatedField(
+        queryset=Customer.objects.select_related("loyalty"), required=False, allow_null=True
+    )
+
+    def validate_items(self, items):
+        lines = []
+        for index, item in enumerate(items):
+            try:
+                product, quantity = int(item["product"]), int(item["quantity"])
+            except (KeyError, TypeError, ValueError):
+                raise serializers.ValidationError(f"Item {index}: product and quantity must be integers.")
+            if quantity < 1:
+                raise serializers.ValidationError(f"Item {index}: quantity must be at least 1.")
+            lines.append((product, quantity))
+
+        entries = price_book.entries({product for product, _ in lines})
+        missing = sorted({product for product, _ in lines} - entries.keys())
+        if missing:
+            raise serializers.ValidationError(
+                f"Invalid product id(s): {', '.join(map(str, missing))}."
             )
+        self.entries = entries
+        return lines
+
+    def quote(self):
+        return quote_cart(
+            self.validated_data["items"],
+            self.entries,
+            discount=self.validated_data["discount"],
+            tier=customer_tier(self.validated_data.get("customer")),
+        )
+
+
+class BulkBillEntrySerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    transaction_id = serializers.CharField(max_length=100, required=False, allow_blank=True, allow_null=True)
+
+
+class BulkBillStatusSerializer(serializers.Serializer):
+    """Body of POST /api/billings/bulk-status/."""
+    ACTIONS = ["mark_paid", "void"]
+
+    action = serializers.ChoiceField(choices=ACTIONS)
+    payment_method = serializers.CharField(max_length=50, required=False, default="card")
+    bills = BulkBillEntrySerializer(many=True, allow_empty=False)
 
-            # ✅ Update stock or quantity safely
-            if hasattr(product, "stock"):
-                current_stock = int(product.stock or 0)
-                product.stock = max(0, current_stock - int(quantity))
-                product.save(update_fields=["stock"])
-            elif hasattr(product, "quantity"):
-                current_qty = int(product.quantity or 0)
-                product.quantity = max(0, current_qty - int(quantity))
-                product.save(update_fields=["quantity"])
-
-        return bill
+    def validate_bills(self, bills):
+        if len(bills) > settings.BILL_BATCH_MAX_SIZE:
+            raise serializers.ValidationError(f"At most {settings.BILL_BATCH_MAX_SIZE} bills per request.")
+        ids = [entry["id"] for entry in bills]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("Each bill may appear only once.")
+        return bills
@@ -0,0 +1,127 @@
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import Case, F, Sum, Value, When
+from django.utils import timezone
+from apps.outbox.dispatch import publish_many
+from apps.products.stock import decrement_stock, increment_stock
+from .models import Bill, BillItem
+
+
+def cache_prefetched_items(bill, items):
+    """Store `items` as if `bill.items` had been prefetched."""
+    queryset = bill.items.all()
+    queryset._result_cache = list(items)
+    queryset._prefetch_done = True
+    bill._prefetched_objects_cache = {"items": queryset}
+
+
+@transaction.atomic
+def create_bills(bills_data, cashier=None):
+    """
+    Persist validated bills with a constant number of statements.
+
+    `bills_data` is a list of `BillingSerializer.validated_data` dicts whose
+    items already hold Product instances. Bills and their items are bulk
+    inserted, stock is decremented once per product across all bills, and
+    one outbox event per bill defers the loyalty accrual.
+    Returns the created bills with their items attached.
+    """
+    bills, lines = [], []
+    for data in bills_data:
+        data = dict(data)
+        items_data = data.pop("items", [])
+        if cashier is not None:
+            data["cashier"] = cashier
+        bill = Bill(bill_id=Bill.generate_bill_id(), **data)
+        bill.fill_summary([item_data["product"].name for item_data in items_data])
+        bill.sync_legacy_amounts()
+        bills.append(bill)
+        lines.append(items_data)
+
+    Bill.objects.bulk_create(bills)
+
+    items = []
+    for bill, items_data in zip(bills, lines):
+        bill_items = [
+            BillItem(
+                bill=bill,
+                product=item_data["product"],
+                quantity=item_data.get("quantity", 0),
+                price_paise=item_data.get("price_paise", 0),
+            )
+            for item_data in items_data
+        ]
+        for item in bill_items:
+            item.sync_legacy_amounts()
+        cache_prefetched_items(bill, bill_items)
+        items.extend(bill_items)
+    BillItem.objects.bulk_create(items)
+
+    # ✅ Decrement stock for all products at once (repeated lines are summed)
+    sold = defaultdict(int)
+    for item in items:
+        sold[item.product_id] += int(item.quantity or 0)
+    decrement_stock(sold)
+
+    # ✅ Loyalty is credited later by the outbox worker, not in this request
+    publish_many("bill.created", [bill.outbox_payload() for bill in bills if bill.customer_id])
+
+    return bills
+
+
+def _lock_open_bills(bill_ids, *fields):
+    """Lock the bills among `bill_ids` that are still open and return them."""
+    return list(
+        Bill.objects.select_for_update()
+        .filter(id__in=bill_ids, payment_status__in=Bill.OPEN_STATUSES)
+        .order_by("id")
+        .only("id", *fields)
+    )
+
+
+@transaction.atomic
+def mark_bills_paid(transaction_ids, payment_method):
+    """
+    Mark many open bills paid with one conditional UPDATE.
+    `transaction_ids` maps bill id -> settlement transaction id (or None).
+    Returns the ids of the bills that changed state.
+    """
+    changed = [bill.id for bill in _lock_open_bills(transaction_ids.keys())]
+    if changed:
+        Bill.objects.filter(id__in=changed).update(
+            payment_status="paid",
+            payment_date=timezone.now(),
+            payment_method=payment_method,
+            transaction_id=Case(
+                *[When(id=bill_id, then=Value(transaction_ids[bill_id]))
+                  for bill_id in changed if transaction_ids[bill_id]],
+                default=F("transaction_id"),
+            ),
+        )
+    return changed
+
+
+@transaction.atomic
+def void_bills(bill_ids):
+    """
+    Void many open bills: one UPDATE for the status, one aggregated stock
+    restore, and a `bill.voided` outbox event per bill to reverse loyalty.
+    Returns the ids of the bills that changed state.
+    """
+    bills = _lock_open_bills(bill_ids, "customer_id", "total_paise")
+    changed = [bill.id for bill in bills]
+    if not changed:
+        return changed
+    Bill.objects.filter(id__in=changed).update(payment_status="void")
+
+    # ✅ Put the sold quantities back, summed per product across all voided bills
+    returned = (
+        BillItem.objects.filter(bill_id__in=changed)
+        .values("product")
+        .annotate(units=Sum("quantity"))
+        .values_list("product", "units")
+    )
+    increment_stock(dict(returned))
+
+    publish_many("bill.voided", [bill.outbox_payload() for bill in bills if bill.customer_id])
+    return changed
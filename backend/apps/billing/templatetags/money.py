@@ -0,0 +1,10 @@
+from django import template
+from backend_api.money import format_paise
+
+register = template.Library()
+
+
+@register.filter
+def rupees(paise):
+    """Render integer paise as a rupee amount: {{ bill.total_paise|rupees }} -> 123.45"""
+    return format_paise(paise)
@@ -1,3 +1,507 @@
-from django.test import TestCase
+import io
+import zipfile
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from apps.billing.invoices import NAMESPACE, invoice_version
+from apps.billing.models import Bill
+from apps.billing.pricing import PriceEntry, price_book, quote_cart
+from apps.documents import storage
+from apps.products.models import Category, Product
+from apps.products.stock import set_stock
 
-# Create your tests here.
+BILLS_URL = "/api/billings/"
+
+
+def bill_payload(customer, products, quantity=1):
+    return {
+        "customer": customer.pk,
+        "discount": "0",
+        "items": [{"product": p.pk, "quantity": quantity, "price": "0"} for p in products],
+    }
+
+
+def stock_of(product):
+    return Product.objects.with_stock().get(pk=product.pk).stock_quantity
+
+
+@pytest.mark.django_db
+def test_create_bill_query_count_does_not_grow_with_lines(cashier_client, customer, products):
+    # Warm up the number allocator and per-process caches so both runs do the same work
+    assert cashier_client.post(BILLS_URL, bill_payload(customer, products[:1]), format="json").status_code == 201
+
+    counts = []
+    for lines in (products[:2], products[:10]):
+        with CaptureQueriesContext(connection) as ctx:
+            response = cashier_client.post(BILLS_URL, bill_payload(customer, lines), format="json")
+        assert response.status_code == 201, response.data
+        counts.append(len(ctx.captured_queries))
+    assert counts[0] == counts[1]
+
+
+@pytest.mark.django_db
+def test_create_bill_takes_stock_and_prices_lines(cashier_client, customer, products):
+    response = cashier_client.post(BILLS_URL, bill_payload(customer, products[:3], quantity=4), format="json")
+    assert response.status_code == 201, response.data
+
+    bill = Bill.objects.get(pk=response.data["id"])
+    assert bill.items.count() == 3
+    assert all(item.price == p.price for item, p in zip(bill.items.order_by("product_id"), products))
+    assert list(Product.objects.filter(pk__in=[p.pk for p in products[:3]]).values_list("quantity", flat=True)) == [96] * 3
+
+
+@pytest.mark.django_db
+def test_create_bill_replays_a_retried_idempotency_key(cashier_client, customer, products):
+    payload = bill_payload(customer, products[:2])
+    first = cashier_client.post(BILLS_URL, payload, format="json", HTTP_IDEMPOTENCY_KEY="checkout-1")
+    retry = cashier_client.post(BILLS_URL, payload, format="json", HTTP_IDEMPOTENCY_KEY="checkout-1")
+
+    assert first.status_code == retry.status_code == 201
+    assert retry["Idempotent-Replayed"] == "true"
+    assert retry.data["id"] == first.data["id"]
+    assert Bill.objects.count() == 1
+    assert Product.objects.get(pk=products[0].pk).quantity == 99
+
+
+@pytest.mark.django_db
+def test_create_bill_rejects_a_reused_key_with_a_different_body(cashier_client, customer, products):
+    cashier_client.post(BILLS_URL, bill_payload(customer, products[:2]), format="json", HTTP_IDEMPOTENCY_KEY="checkout-1")
+    response = cashier_client.post(
+        BILLS_URL, bill_payload(customer, products[:3]), format="json", HTTP_IDEMPOTENCY_KEY="checkout-1"
+    )
+
+    assert response.status_code == 422
+    assert Bill.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_idempotency_keys_are_per_user(cashier_client, manager_client, customer, products):
+    payload = bill_payload(customer, products[:2])
+    mine = cashier_client.post(BILLS_URL, payload, format="json", HTTP_IDEMPOTENCY_KEY="checkout-1")
+    theirs = manager_client.post(BILLS_URL, payload, format="json", HTTP_IDEMPOTENCY_KEY="checkout-1")
+
+    assert theirs.status_code == 201
+    assert "Idempotent-Replayed" not in theirs
+    assert theirs.data["id"] != mine.data["id"]
+    assert Bill.objects.count() == 2
+
+
+QUOTE_URL = f"{BILLS_URL}quote/"
+
+
+def entry(product_id, price, tax_rate=500):
+    return PriceEntry(product_id, f"Product {product_id}", price, tax_rate, None)
+
+
+@pytest.mark.django_db
+def test_quote_rounds_tax_once_for_the_whole_cart():
+    # 5% of 1.10 is 5.5 paise per line: rounding lines first would give 18
+    entries = {pid: entry(pid, 110) for pid in (1, 2, 3)}
+    quote = quote_cart([(1, 1), (2, 1), (3, 1)], entries)
+
+    assert [line.tax for line in quote.lines] == [6, 6, 6]
+    assert (quote.subtotal, quote.tax, quote.total) == (330, 17, 347)
+
+
+@pytest.mark.django_db
+def test_quote_caps_the_manual_discount_at_what_is_left_to_pay():
+    entries = {1: entry(1, 1000)}
+
+    assert quote_cart([(1, 2)], entries, discount=500).total == 1600
+    capped = quote_cart([(1, 2)], entries, discount=10_000)
+    assert (capped.discount, capped.total) == (2100, 0)
+    assert quote_cart([(1, 2)], entries, discount=-500).total == 2100
+
+
+@pytest.mark.django_db
+def test_quote_uses_the_category_tax_rate(cashier_client, products):
+    products[0].category = Category.objects.create(name="Essentials", tax_rate="12.00")
+    products[0].save()
+
+    response = cashier_client.post(
+        QUOTE_URL, {"items": [{"product": products[0].pk, "quantity": 3}, {"product": products[1].pk, "quantity": 1}]},
+        format="json",
+    )
+
+    assert response.status_code == 200, response.data
+    assert [line["tax_rate"] for line in response.data["items"]] == ["12.00", "5.00"]
+    assert (response.data["subtotal"], response.data["tax"], response.data["total"]) == ("40.00", "4.10", "44.10")
+
+
+@pytest.mark.django_db
+def test_quote_rejects_unknown_products(cashier_client):
+    response = cashier_client.post(QUOTE_URL, {"items": [{"product": 999999, "quantity": 1}]}, format="json")
+
+    assert response.status_code == 400
+    assert "999999" in str(response.data)
+
+
+@pytest.mark.django_db
+def test_create_bill_ignores_client_prices_and_totals(cashier_client, customer, products):
+    payload = {
+        "customer": customer.pk,
+        "discount": "1.00",
+        "subtotal": "1.00", "tax": "0.00", "total": "0.01",
+        "items": [{"product": products[0].pk, "quantity": 2, "price": "0.01"}],
+    }
+    quote = cashier_client.post(QUOTE_URL, payload, format="json").data
+
+    response = cashier_client.post(BILLS_URL, payload, format="json")
+
+    assert response.status_code == 201, response.data
+    bill = Bill.objects.get(pk=response.data["id"])
+    assert (bill.subtotal_paise, bill.tax_paise, bill.discount_paise, bill.total_paise) == (2000, 100, 100, 2000)
+    assert bill.items.get().price_paise == 1000
+    assert [response.data[k] for k in ("subtotal", "tax", "discount", "total")] == [
+        quote[k] for k in ("subtotal", "tax", "discount", "total")
+    ]
+
+
+@pytest.mark.django_db
+def test_price_book_caches_entries_until_the_product_is_saved(products):
+    price_book.invalidate()
+    ids = [p.pk for p in products[:3]]
+    with CaptureQueriesContext(connection) as first:
+        assert {e.price for e in price_book.entries(ids).values()} == {1000}
+    with CaptureQueriesContext(connection) as cached:
+        price_book.entries(ids)
+    assert len(first) == 2  # products, tax rates
+    assert len(cached) == 0
+
+    products[0].price = "12.50"
+    products[0].save()
+    assert price_book.entries(ids)[products[0].pk].price == 1250
+
+
+@pytest.mark.django_db
+def test_bulk_void_restores_stock_including_striped_products(cashier_client, manager_client, customer, products):
+    with transaction.atomic():
+        set_stock(products[0], 20, stripe_count=4)
+    first = cashier_client.post(BILLS_URL, bill_payload(customer, products[:2], quantity=3), format="json").data
+    second = cashier_client.post(BILLS_URL, bill_payload(customer, products[:1], quantity=5), format="json").data
+    assert [stock_of(p) for p in products[:2]] == [12, 97]
+
+    response = manager_client.post(
+        "/api/billings/bulk-status/",
+        {"action": "void", "bills": [{"id": first["id"]}, {"id": second["id"]}, {"id": 0}]},
+        format="json",
+    )
+
+    assert response.status_code == 200
+    assert sorted(response.data["changed"]) == sorted([first["id"], second["id"]])
+    assert response.data["not_found"] == [0]
+    assert [stock_of(p) for p in products[:2]] == [20, 100]
+    assert set(Bill.objects.values_list("payment_status", flat=True)) == {"void"}
+
+
+@pytest.mark.django_db
+def test_bulk_void_skips_paid_bills_and_is_managers_only(cashier_client, manager_client, customer, products):
+    bill = cashier_client.post(BILLS_URL, bill_payload(customer, products[:1]), format="json").data
+    body = {"action": "void", "bills": [{"id": bill["id"]}]}
+    assert cashier_client.post("/api/billings/bulk-status/", body, format="json").status_code == 403
+
+    manager_client.post(
+        "/api/billings/bulk-status/",
+        {"action": "mark_paid", "payment_method": "cash", "bills": [{"id": bill["id"], "transaction_id": "t-1"}]},
+        format="json",
+    )
+    response = manager_client.post("/api/billings/bulk-status/", body, format="json")
+
+    assert response.data["skipped"] == [bill["id"]]
+    assert stock_of(products[0]) == 99
+
+
+BATCH_URL = f"{BILLS_URL}batch/"
+
+
+def synced(payload, client_id):
+    return {**payload, "client_id": client_id}
+
+
+@pytest.mark.django_db
+def test_batch_creates_every_bill_and_takes_stock_once_per_product(cashier_client, customer, products):
+    batch = [
+        bill_payload(customer, products[:2], quantity=2),
+        bill_payload(customer, products[:1], quantity=3),
+        bill_payload(customer, products[1:3], quantity=1),
+    ]
+
+    response = cashier_client.post(BATCH_URL, batch, format="json")
+
+    assert response.status_code == 201, response.data
+    assert response.data["created"] == 3
+    assert [r["status"] for r in response.data["results"]] == ["created"] * 3
+    assert [stock_of(p) for p in products[:4]] == [95, 97, 99, 100]
+    assert Bill.objects.filter(cashier__email="normal@example.com").count() == 3
+
+
+@pytest.mark.django_db
+def test_batch_partial_failure_saves_the_other_bills(cashier_client, customer, products):
+    with transaction.atomic():
+        set_stock(products[0], 4, stripe_count=2)
+    batch = [
+        bill_payload(customer, products[1:2], quantity=2),
+        {**bill_payload(customer, products[1:2]), "items": [{"product": 999999, "quantity": 1}]},
+        bill_payload(customer, products[:1], quantity=5),  # more than the striped stock
+        bill_payload(customer, products[1:2], quantity=3),
+    ]
+
+    response = cashier_client.post(BATCH_URL, batch, format="json")
+
+    assert response.status_code == 207, response.data
+    assert [r["status"] for r in response.data["results"]] == ["created", "failed", "failed", "created"]
+    assert (response.data["created"], response.data["failed"]) == (2, 2)
+    assert "items" in response.data["results"][1]["errors"]
+    assert [stock_of(p) for p in products[:2]] == [4, 95]
+    assert Bill.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_batch_retry_with_client_ids_does_not_duplicate_bills(cashier_client, customer, products):
+    batch = [
+        synced(bill_payload(customer, products[:1], quantity=2), "pos-1:1"),
+        synced(bill_payload(customer, products[1:2], quantity=1), "pos-1:2"),
+    ]
+    first = cashier_client.post(BATCH_URL, batch, format="json")
+    # The second sync also carries a bill made after the first one was sent
+    retry = cashier_client.post(
+        BATCH_URL, batch + [synced(bill_payload(customer, products[2:3]), "pos-1:3")], format="json",
+    )
+
+    assert first.status_code == retry.status_code == 201
+    assert [r["id"] for r in retry.data["results"][:2]] == [r["id"] for r in first.data["results"]]
+    assert [r.get("replayed", False) for r in retry.data["results"]] == [True, True, False]
+    assert Bill.objects.count() == 3
+    assert [stock_of(p) for p in products[:3]] == [98, 99, 99]
+
+
+@pytest.mark.django_db
+def test_batch_client_ids_are_per_cashier_and_deduplicated_within_a_batch(
+    cashier_client, manager_client, customer, products,
+):
+    bill = synced(bill_payload(customer, products[:1]), "pos-1:1")
+
+    mine = cashier_client.post(BATCH_URL, [bill, bill], format="json")
+    theirs = manager_client.post(BATCH_URL, [bill], format="json")
+
+    assert mine.status_code == 201
+    assert mine.data["results"][0]["id"] == mine.data["results"][1]["id"]
+    assert mine.data["results"][1]["replayed"] is True
+    assert "replayed" not in theirs.data["results"][0]
+    assert Bill.objects.count() == 2
+    assert stock_of(products[0]) == 98
+
+
+@pytest.mark.django_db
+def test_batch_rejects_a_malformed_client_id(cashier_client, customer, products):
+    response = cashier_client.post(
+        BATCH_URL,
+        [synced(bill_payload(customer, products[:1]), "x" * 65), synced(bill_payload(customer, products[:1]), 7)],
+        format="json",
+    )
+
+    assert response.status_code == 400
+    assert all("client_id" in r["errors"] for r in response.data["results"])
+    assert not Bill.objects.exists()
+
+
+def follow(client, url):
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200, response.data
+        pages.append([row["id"] for row in response.data["results"]])
+        url = response.data["next"]
+    return pages
+
+
+@pytest.mark.django_db
+def test_bill_list_cursor_pages_cover_every_bill_once(cashier_client, customer, products):
+    ids = [
+        cashier_client.post(BILLS_URL, bill_payload(customer, products[:1]), format="json").data["id"]
+        for _ in range(7)
+    ]
+    # Several bills in the same instant: ties on created_at are broken by id
+    tied = Bill.objects.get(pk=ids[0]).created_at
+    Bill.objects.filter(pk__in=ids[:5]).update(created_at=tied)
+
+    pages = follow(cashier_client, f"{BILLS_URL}?page_size=2")
+
+    assert [len(page) for page in pages] == [2, 2, 2, 1]
+    assert [bill_id for page in pages for bill_id in page] == [ids[6], ids[5], *reversed(ids[:5])]
+
+
+@pytest.mark.django_db
+def test_bill_list_previous_cursor_returns_the_earlier_page(cashier_client, customer, products):
+    for _ in range(5):
+        cashier_client.post(BILLS_URL, bill_payload(customer, products[:1]), format="json")
+    first = cashier_client.get(f"{BILLS_URL}?page_size=2").data
+    second = cashier_client.get(first["next"]).data
+    back = cashier_client.get(second["previous"]).data
+
+    assert first["previous"] is None
+    assert [row["id"] for row in back["results"]] == [row["id"] for row in first["results"]]
+
+
+@pytest.mark.django_db
+def test_bill_list_rejects_a_malformed_cursor(cashier_client):
+    assert cashier_client.get(f"{BILLS_URL}?cursor=garbage").status_code == 404
+
+
+def paid_bill(client, customer, products, quantity):
+    bill = client.post(BILLS_URL, bill_payload(customer, products, quantity=quantity), format="json").data
+    client.patch(f"{BILLS_URL}{bill['id']}/mark_paid/", {"transaction_id": "t-1", "payment_method": "cash"}, format="json")
+    return {item["product"]: item["id"] for item in bill["items"]}, bill["id"]
+
+
+def return_items(client, bill_id, quantities):
+    return client.post(
+        "/api/returns/",
+        {"bill": bill_id, "items": [{"bill_item": item, "quantity": qty} for item, qty in quantities.items()]},
+        format="json",
+    )
+
+
+@pytest.mark.django_db
+def test_partial_returns_restock_including_striped_products(cashier_client, customer, products):
+    with transaction.atomic():
+        set_stock(products[0], 20, stripe_count=4)
+    items, bill_id = paid_bill(cashier_client, customer, products[:2], quantity=5)
+    striped_item, plain_item = items[products[0].pk], items[products[1].pk]
+
+    assert return_items(cashier_client, bill_id, {striped_item: 2, plain_item: 1}).status_code == 201
+    assert [stock_of(p) for p in products[:2]] == [17, 96]
+
+    assert return_items(cashier_client, bill_id, {striped_item: 3, plain_item: 4}).status_code == 201
+    assert [stock_of(p) for p in products[:2]] == [20, 100]
+
+
+@pytest.mark.django_db
+def test_return_of_more_than_is_left_is_rejected(cashier_client, customer, products):
+    items, bill_id = paid_bill(cashier_client, customer, products[:1], quantity=3)
+    item = items[products[0].pk]
+    return_items(cashier_client, bill_id, {item: 2})
+
+    response = return_items(cashier_client, bill_id, {item: 2})
+
+    assert response.status_code == 400
+    assert f"Bill item {item}: only 1 left to return." in str(response.data)
+    assert stock_of(products[0]) == 99
+
+
+@pytest.mark.django_db
+def test_unpaid_bill_cannot_be_returned(cashier_client, customer, products):
+    bill = cashier_client.post(BILLS_URL, bill_payload(customer, products[:1]), format="json").data
+
+    response = return_items(cashier_client, bill["id"], {bill["items"][0]["id"]: 1})
+
+    assert response.status_code == 400
+    assert stock_of(products[0]) == 99
+
+
+@pytest.fixture
+def cached_invoice(settings, tmp_path, cashier_client, customer, products):
+    """A paid bill whose invoice PDF is already in the document cache, so nothing is rendered."""
+    settings.DOCUMENT_CACHE_ROOT = str(tmp_path)
+    _, bill_id = paid_bill(cashier_client, customer, products[:2], quantity=1)
+    return f"{BILLS_URL}{bill_id}/invoice/", cache_invoice(bill_id)
+
+
+def cache_invoice(bill_id):
+    """Put a stand-in PDF for the bill's current invoice version in the document cache."""
+    bill = Bill.objects.select_related("customer").prefetch_related("items__product").get(pk=bill_id)
+    data = b"%PDF-1.7 cached invoice " + bill.bill_id.encode() + bytes(range(256))
+    storage.store(NAMESPACE, bill.pk, invoice_version(bill), data)
+    return data
+
+
+def body(response):
+    return b"".join(response.streaming_content)
+
+
+@pytest.mark.django_db
+def test_cached_invoice_is_served_with_an_etag_and_revalidated(api_client, cached_invoice):
+    url, data = cached_invoice
+
+    response = api_client.get(url)
+    assert response.status_code == 200
+    assert body(response) == data
+    assert response["Accept-Ranges"] == "bytes"
+
+    revalidated = api_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert revalidated.status_code == 304
+    assert revalidated["ETag"] == response["ETag"]
+    assert api_client.get(url, HTTP_IF_NONE_MATCH='"stale"').status_code == 200
+
+
+@pytest.mark.django_db
+def test_cached_invoice_serves_byte_ranges(api_client, cached_invoice):
+    url, data = cached_invoice
+
+    partial = api_client.get(url, HTTP_RANGE="bytes=0-9")
+    assert partial.status_code == 206
+    assert partial["Content-Range"] == f"bytes 0-9/{len(data)}"
+    assert body(partial) == data[:10]
+
+    tail = api_client.get(url, HTTP_RANGE="bytes=-5")
+    assert tail.status_code == 206
+    assert body(tail) == data[-5:]
+
+    unsatisfiable = api_client.get(url, HTTP_RANGE=f"bytes={len(data)}-")
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable["Content-Range"] == f"bytes */{len(data)}"
+
+
+@pytest.mark.django_db
+def test_range_with_a_stale_if_range_gets_the_whole_file(api_client, cached_invoice):
+    url, data = cached_invoice
+
+    response = api_client.get(url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"')
+
+    assert response.status_code == 200
+    assert body(response) == data
+
+
+@pytest.mark.django_db
+def test_invoice_archive_zips_the_paid_bills_in_the_range(settings, tmp_path, cashier_client, manager_client, customer, products):
+    settings.DOCUMENT_CACHE_ROOT = str(tmp_path)
+    paid = [paid_bill(cashier_client, customer, products[:1], quantity=1)[1] for _ in range(2)]
+    cashier_client.post(BILLS_URL, bill_payload(customer, products[:1]), format="json")
+    expected = {f"{Bill.objects.get(pk=pk).bill_id}.pdf": cache_invoice(pk) for pk in paid}
+    today = timezone.localdate().isoformat()
+
+    response = manager_client.get(f"{BILLS_URL}invoices/archive/?start_date={today}&end_date={today}")
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(body(response))) as archive:
+        assert archive.namelist() == list(expected)
+        assert {name: archive.read(name) for name in archive.namelist()} == expected
+
+
+@pytest.mark.django_db
+def test_invoice_archive_requires_a_date_range(manager_client):
+    response = manager_client.get(f"{BILLS_URL}invoices/archive/?start_date=2025-10-01")
+
+    assert response.status_code == 400
+    assert "end_date" in response.data
+
+
+@pytest.mark.django_db
+def test_admin_inline_items_get_a_price_in_paise(client, customer, products):
+    admin = get_user_model().objects.create_superuser(email="admin@example.com", password="pass123")
+    client.force_login(admin)
+    prefix = "items"
+    response = client.post("/admin/billing/bill/add/", {
+        "cashier": admin.pk, "customer": customer.pk, "payment_status": "pending", "payment_method": "",
+        "subtotal_paise": 0, "tax_paise": 0, "discount_paise": 0, "total_paise": 0,
+        f"{prefix}-TOTAL_FORMS": 2, f"{prefix}-INITIAL_FORMS": 0,
+        f"{prefix}-0-product": products[0].pk, f"{prefix}-0-quantity": 2, f"{prefix}-0-price_paise": 0,
+        f"{prefix}-1-product": products[1].pk, f"{prefix}-1-quantity": 1, f"{prefix}-1-price_paise": 850,
+    })
+
+    assert response.status_code == 302
+    items = Bill.objects.get().items.order_by("product_id")
+    assert [(item.price_paise, str(item.price)) for item in items] == [(1000, "10.00"), (850, "8.50")]
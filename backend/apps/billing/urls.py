@@ -3,6 +3,10 @@ from . import views
 
 urlpatterns = [
     path("billings/", views.BillList.as_view()),
+    path("billings/quote/", views.BillQuoteView.as_view(), name="bill-quote"),
+    path("billings/bulk-status/", views.BillBulkStatusView.as_view(), name="bill-bulk-status"),
+    path("billings/batch/", views.BillBatchView.as_view(), name="bill-batch"),
+    path("billings/invoices/archive/", views.BillInvoiceArchiveView.as_view(), name="bill-invoice-archive"),
     path("billings/<int:pk>/", views.BillDetail.as_view()),
     path("billings/<int:pk>/invoice/", views.BillInvoicePDFView.as_view(), name="bill-invoice"),
     path('billings/<int:pk>/mark_paid/', views.mark_bill_paid, name='mark-bill-paid'),  # ✅ new route
@@ -1,9 +1,17 @@
 from rest_framework import generics, permissions
 from .models import Bill
-from .serializers import BillingSerializer
-from django.http import HttpResponse, FileResponse
-from django.template.loader import render_to_string
-from weasyprint import HTML
+from .serializers import BillingSerializer, BillListSerializer, BulkBillStatusSerializer, QuoteSerializer
+from .invoices import NAMESPACE, STYLESHEET, invoice_archive, invoice_html, invoice_version
+from .receipts import receipt_escpos, receipt_pdf
+from .services import create_bills, mark_bills_paid, void_bills
+from apps.customers.models import Customer
+from apps.documents.jobs import pdf_response
+from apps.products.models import Product
+from apps.products.permissions import IsManager
+from apps.products.stock import InsufficientStock
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.http import HttpResponse, StreamingHttpResponse
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework import status, permissions
 from rest_framework.permissions import AllowAny
@@ -14,30 +22,267 @@ from rest_framework import status, permissions
 from .models import Bill
 from rest_framework.views import APIView
 from django.utils import timezone
+from rest_framework.exceptions import ValidationError
 from rest_framework.authentication import TokenAuthentication
+from apps.idempotency.mixins import IdempotentCreateMixin
+from backend_api.dates import parse_bound
+from backend_api.pagination import KeysetPagination
 import io
 
-class BillList(generics.ListCreateAPIView):
+def filter_bills(queryset, params):
+    """
+    Apply the bill list filters. Each one is served by an index on Bill:
+
+    ?bill_id=BILL-20251031      bill_id prefix (case-insensitive input)
+    ?contact=9876543210         customer contact number (exact)
+    ?cashier=<id>               cashier user id
+    ?payment_status=pending     pending / paid / failed / void
+    ?payment_method=card        payment method (exact)
+    ?start_date=&end_date=      created_at range; dates are inclusive days
+    """
+    bill_id = params.get("bill_id", "").strip()
+    if bill_id:
+        queryset = queryset.filter(bill_id__startswith=bill_id.upper())
+
+    contact = params.get("contact", "").strip()
+    if contact:
+        queryset = queryset.filter(customer__contact_number=contact)
+
+    cashier = params.get("cashier")
+    if cashier:
+        try:
+            queryset = queryset.filter(cashier_id=int(cashier))
+        except ValueError:
+            raise ValidationError({"cashier": "Must be a user id."})
+
+    payment_status = params.get("payment_status")
+    if payment_status:
+        queryset = queryset.filter(payment_status=payment_status)
+
+    payment_method = params.get("payment_method")
+    if payment_method:
+        queryset = queryset.filter(payment_method=payment_method)
+
+    start_date = params.get("start_date")
+    if start_date:
+        queryset = queryset.filter(created_at__gte=parse_bound(start_date, "start_date"))
+    end_date = params.get("end_date")
+    if end_date:
+        queryset = queryset.filter(created_at__lt=parse_bound(end_date, "end_date", end=True))
+    return queryset
+
+
+class BillPagination(KeysetPagination):
+    # ✅ ?recent=N is the size of the first page (newest N bills)
+    page_size_query_params = ["recent", "page_size"]
+
+
+class BillList(IdempotentCreateMixin, generics.ListCreateAPIView):
     serializer_class = BillingSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = BillPagination
+    idempotency_scope = "billings"
 
     def get_queryset(self):
-        queryset = Bill.objects.all().order_by('-created_at')
-        # Filter by recent bills if requested
-        recent = self.request.query_params.get('recent', None)
-        if recent:
-            try:
-                limit = int(recent)
-                queryset = queryset[:limit]
-            except ValueError:
-                pass
+        # Ordered newest first by the paginator, on (created_at, id)
+        queryset = filter_bills(Bill.objects.all(), self.request.query_params)
+        if self._expand_items():
+            queryset = queryset.select_related("customer", "cashier").prefetch_related("items__product")
         return queryset
 
+    def get_serializer_class(self):
+        # ✅ List rows read only the Bill table; ?expand=items adds the nested lines
+        if self.request.method == "GET" and not self._expand_items():
+            return BillListSerializer
+        return BillingSerializer
+
+    def _expand_items(self):
+        return self.request.query_params.get("expand") == "items"
+
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context["request"] = self.request
 
         return context
+
+class BillQuoteView(APIView):
+    """
+    POST /api/billings/quote/
+    Price a cart without creating a bill: per-line prices and tax, subtotal,
+    tax, discount and total, computed exactly as bill creation will.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = QuoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(serializer.quote().as_dict())
+
+
+# Marks a batch entry whose client_id is not a usable string
+INVALID_CLIENT_ID = object()
+
+
+def _collect_ids(values):
+    ids = set()
+    for value in values:
+        try:
+            ids.add(int(value))
+        except (TypeError, ValueError):
+            pass
+    return ids
+
+
+class BillBatchView(APIView):
+    """
+    POST /api/billings/batch/  -> create many bills in one request (offline POS sync)
+
+    Body is a list of bills in the BillingSerializer format. Every bill is
+    validated against products and customers loaded once for the whole batch;
+    valid bills are saved with bulk inserts and one stock update per product.
+    Returns one result per input bill, in order; invalid bills do not stop
+    the others from being saved.
+
+    Each bill may carry a `client_id` (unique per cashier, at most 64
+    characters) so that a sync can be retried safely: a bill whose client id
+    was already saved is not created again, and its result is the existing
+    bill with `"replayed": true`.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        bills_data = request.data
+        if not isinstance(bills_data, list):
+            return Response({"error": "Expected a list of bills"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(bills_data) > settings.BILL_BATCH_MAX_SIZE:
+            return Response(
+                {"error": f"A batch may contain at most {settings.BILL_BATCH_MAX_SIZE} bills"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        context = self._preload_context(bills_data)
+        client_ids = [self._client_id(data) for data in bills_data]
+        saved = self._saved_bills(request.user, client_ids)
+
+        results = [None] * len(bills_data)
+        valid, first_index = [], {}  # client id -> index of its first bill in this batch
+        for index, (data, client_id) in enumerate(zip(bills_data, client_ids)):
+            if client_id is INVALID_CLIENT_ID:
+                results[index] = {
+                    "index": index, "status": "failed",
+                    "errors": {"client_id": ["Must be a string of at most 64 characters."]},
+                }
+            elif client_id in saved:
+                results[index] = self._replayed(index, saved[client_id])
+            elif client_id in first_index:
+                continue  # Repeated in this batch: answered with the first one's result below
+            else:
+                if client_id is not None:
+                    first_index[client_id] = index
+                serializer = BillingSerializer(data=data, context=context)
+                if serializer.is_valid():
+                    serializer.validated_data["client_id"] = client_id
+                    valid.append((index, serializer))
+                else:
+                    results[index] = {"index": index, "status": "failed", "errors": serializer.errors}
+
+        for index, serializer, error in self._persist(valid, request.user):
+            client_id = serializer.validated_data["client_id"]
+            if error is None:
+                bill = serializer.instance
+                results[index] = {"index": index, "status": "created", "id": bill.id, "bill_id": bill.bill_id}
+            elif client_id is not None and (bill := self._saved_bills(request.user, [client_id]).get(client_id)):
+                # A concurrent retry of the same sync saved it first
+                results[index] = self._replayed(index, bill)
+            else:
+                results[index] = {"index": index, "status": "failed", "errors": {"non_field_errors": [error]}}
+
+        for index, client_id in enumerate(client_ids):
+            if results[index] is None:
+                first = results[first_index[client_id]]
+                results[index] = {**first, "index": index}
+                if first["status"] == "created":
+                    results[index]["replayed"] = True
+
+        created = sum(1 for result in results if result["status"] == "created")
+        if created == len(results):
+            response_status = status.HTTP_201_CREATED
+        elif created:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(
+            {"created": created, "failed": len(results) - created, "results": results},
+            status=response_status,
+        )
+
+    def _preload_context(self, bills_data):
+        """Load every product and customer referenced by the batch up front."""
+        bills_data = [data for data in bills_data if isinstance(data, dict)]
+        product_ids = _collect_ids(
+            item.get("product")
+            for data in bills_data
+            if isinstance(data.get("items"), list)
+            for item in data["items"]
+            if isinstance(item, dict)
+        )
+        customer_ids = _collect_ids(data.get("customer") for data in bills_data)
+        return {
+            "request": self.request,
+            "products": Product.objects.in_bulk(product_ids),
+            "customers": Customer.objects.select_related("loyalty").in_bulk(customer_ids),
+        }
+
+    @staticmethod
+    def _client_id(data):
+        client_id = data.get("client_id") if isinstance(data, dict) else None
+        if client_id is None:
+            return None
+        if not isinstance(client_id, str) or not 0 < len(client_id) <= 64:
+            return INVALID_CLIENT_ID
+        return client_id
+
+    @staticmethod
+    def _saved_bills(cashier, client_ids):
+        """{client id: Bill} for the ids this cashier has already synced."""
+        client_ids = {cid for cid in client_ids if isinstance(cid, str)}
+        if not client_ids:
+            return {}
+        bills = Bill.objects.filter(cashier=cashier, client_id__in=client_ids).only("id", "bill_id", "client_id")
+        return {bill.client_id: bill for bill in bills}
+
+    @staticmethod
+    def _replayed(index, bill):
+        return {"index": index, "status": "created", "id": bill.id, "bill_id": bill.bill_id, "replayed": True}
+
+    @staticmethod
+    def _persist(valid, cashier):
+        """
+        Save all valid bills together. If the combined insert fails, retry
+        bill by bill so one bad bill only fails itself.
+        """
+        try:
+            with transaction.atomic():
+                bills = create_bills([serializer.validated_data for _, serializer in valid], cashier=cashier)
+        except (DatabaseError, InsufficientStock):
+            bills = None
+
+        if bills is not None:
+            for (index, serializer), bill in zip(valid, bills):
+                serializer.instance = bill
+                yield index, serializer, None
+            return
+
+        for index, serializer in valid:
+            try:
+                with transaction.atomic():
+                    serializer.instance = create_bills([serializer.validated_data], cashier=cashier)[0]
+            except (DatabaseError, InsufficientStock) as exc:
+                yield index, serializer, str(exc)
+            else:
+                yield index, serializer, None
+
+
 @api_view(["PATCH"])
 @permission_classes([permissions.IsAuthenticated])
 def mark_bill_paid(request, pk: int):
@@ -46,6 +291,9 @@ def mark_bill_paid(request, pk: int):
     except Bill.DoesNotExist:
         return Response({"error": "Bill not found"}, status=status.HTTP_404_NOT_FOUND)
 
+    if bill.payment_status == "void":
+        return Response({"error": "A voided bill cannot be paid"}, status=status.HTTP_400_BAD_REQUEST)
+
     # Update payment details from request data
     transaction_id = request.data.get('transaction_id')
     payment_method = request.data.get('payment_method', 'paypal')
@@ -57,17 +305,109 @@ def mark_bill_paid(request, pk: int):
     bill.save()
     return Response({"message": "Bill marked as paid ✅", "bill_id": bill.bill_id})
 
+class BillBulkStatusView(APIView):
+    """
+    POST /api/billings/bulk-status/  -> settle or void many bills at once (end of day)
+
+    {"action": "mark_paid", "payment_method": "card",
+     "bills": [{"id": 12, "transaction_id": "ch_..."}, ...]}
+    {"action": "void", "bills": [{"id": 13}, ...]}
+
+    Only pending or failed bills change state. Voiding restores their stock
+    and reverses the loyalty points. The response lists which bills changed,
+    which were skipped because of their state, and which do not exist.
+    Managers only.
+    """
+    permission_classes = [IsManager]
+
+    def post(self, request):
+        serializer = BulkBillStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        bill_ids = [entry["id"] for entry in data["bills"]]
+
+        if data["action"] == "mark_paid":
+            changed = mark_bills_paid(
+                {entry["id"]: entry.get("transaction_id") or None for entry in data["bills"]},
+                data["payment_method"],
+            )
+        else:
+            changed = void_bills(bill_ids)
+
+        changed_set = set(changed)
+        unchanged = [bill_id for bill_id in bill_ids if bill_id not in changed_set]
+        existing = set(Bill.objects.filter(id__in=unchanged).values_list("id", flat=True))
+        return Response({
+            "action": data["action"],
+            "changed": changed,
+            "skipped": [bill_id for bill_id in unchanged if bill_id in existing],
+            "not_found": [bill_id for bill_id in unchanged if bill_id not in existing],
+        })
+
+
 class BillDetail(generics.RetrieveAPIView):
-    queryset = Bill.objects.all()
+    queryset = Bill.objects.select_related("customer", "cashier").prefetch_related("items__product")
     serializer_class = BillingSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+class BillInvoiceArchiveView(APIView):
+    """
+    GET /api/billings/invoices/archive/?start_date=2025-10-01&end_date=2025-10-31
+    Streams a ZIP of the invoices of every paid bill in the range (the other
+    bill list filters apply too). Cached PDFs are reused and missing ones are
+    rendered by the PDF worker pool while the archive streams.
+    """
+    permission_classes = [IsManager]
+
+    def get(self, request):
+        missing = {
+            param: "This parameter is required."
+            for param in ("start_date", "end_date") if not request.query_params.get(param)
+        }
+        if missing:
+            raise ValidationError(missing)
+        bills = filter_bills(Bill.objects.all(), request.query_params)
+        start, end = request.query_params["start_date"], request.query_params["end_date"]
+        response = StreamingHttpResponse(invoice_archive(bills), content_type="application/zip")
+        response["Content-Disposition"] = f'attachment; filename="invoices_{start[:10]}_{end[:10]}.zip"'
+        return response
+
 class BillInvoicePDFView(APIView):
+    """
+    GET /api/billings/<id>/invoice/
+    The PDF is rendered once per bill version, in the PDF worker pool, and
+    served from disk after that with an ETag (If-None-Match -> 304) and
+    byte-range support. A render that takes longer than ?wait= seconds
+    answers 202 with a job to poll.
+
+    ?format=receipt returns an 80 mm till receipt PDF and ?format=escpos the
+    same receipt as ESC/POS printer bytes; both are built directly from the
+    bill in a few milliseconds (see receipts.py).
+    """
     permission_classes = [AllowAny]
-    
+    RECEIPT_FORMATS = {
+        "receipt": (receipt_pdf, "application/pdf", "receipt_{}.pdf"),
+        "escpos": (receipt_escpos, "application/octet-stream", "receipt_{}.bin"),
+    }
+
+    def perform_content_negotiation(self, request, force=False):
+        # ✅ ?format= picks the invoice layout here, not a DRF renderer
+        return super().perform_content_negotiation(request, force=True)
+
     def get(self, request, pk):
+        layout = request.query_params.get("format", "a4")
+        if layout != "a4" and layout not in self.RECEIPT_FORMATS:
+            return Response(
+                {"error": f"Unknown format; use a4, {', '.join(self.RECEIPT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
         try:
-            bill = Bill.objects.get(pk=pk)
+            bill = (
+                Bill.objects.select_related("customer")
+                .prefetch_related("items__product")
+                .get(pk=pk)
+            )
         except Bill.DoesNotExist:
             return Response({"error": "Bill not found"}, status=status.HTTP_404_NOT_FOUND)
 
@@ -75,19 +415,16 @@ class BillInvoicePDFView(APIView):
         if bill.payment_status != 'paid':
             return Response({"error": "Invoice is only available after payment is completed"}, status=status.HTTP_403_FORBIDDEN)
 
-        # Calculate total_price for each item for the template
-        for item in bill.items.all():
-            item.total_price = item.quantity * item.price
-
-        # Render HTML template with bill data
-        html_string = render_to_string('billing/invoice.html', {'bill': bill})
-        
-        # Generate PDF from HTML using WeasyPrint
-        pdf_file = HTML(string=html_string).write_pdf()
-        
-        # Create HTTP response with PDF
-        response = HttpResponse(pdf_file, content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="invoice_{bill.bill_id}.pdf"'
-        
-        return response
+        if layout in self.RECEIPT_FORMATS:
+            render, content_type, filename = self.RECEIPT_FORMATS[layout]
+            response = HttpResponse(render(bill), content_type=content_type)
+            response["Content-Disposition"] = f'attachment; filename="{filename.format(bill.bill_id)}"'
+            return response
+
+        # ✅ Cached per bill version; a new version is rendered by the PDF pool
+        return pdf_response(
+            request, NAMESPACE, bill.pk, invoice_version(bill),
+            filename=f"invoice_{bill.bill_id}.pdf", build_html=lambda: invoice_html(bill),
+            stylesheet=STYLESHEET, public=True,
+        )
 
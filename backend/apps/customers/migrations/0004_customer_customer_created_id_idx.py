@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-17 07:15
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False  # CONCURRENTLY cannot run inside a transaction
+
+    dependencies = [
+        ('customers', '0003_customer_address_customer_date_of_birth_and_more'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='customer',
+            index=models.Index(fields=['-created_at', '-id'], name='customer_created_id_idx'),
+        ),
+    ]
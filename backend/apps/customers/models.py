@@ -1,4 +1,8 @@
 from django.db import models
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Greatest
+from django.db.models.lookups import GreaterThanOrEqual
+from django.utils import timezone
 
 # Create your models here.
 
@@ -18,6 +22,12 @@ class Customer(models.Model):
     date_of_birth = models.DateField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Newest-first keyset pagination
+            models.Index(fields=["-created_at", "-id"], name="customer_created_id_idx"),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.contact_number})"
     
@@ -32,14 +42,45 @@ class CustomerLoyalty(models.Model):
     def __str__(self):
         return f"{self.customer.name} - {self.tier}"
 
+    # (minimum lifetime points, tier), highest first; below all of them is bronze
+    TIER_THRESHOLDS = [(10000, "platinum"), (5000, "gold"), (1000, "silver")]
+
+    @classmethod
+    def credit_points(cls, points_by_customer):
+        """
+        Add earned points for many customers with one UPDATE, re-evaluating
+        each tier from the new lifetime total. Negative values take points
+        back (never below zero). Missing loyalty rows are created.
+        """
+        points_by_customer = {cid: pts for cid, pts in points_by_customer.items() if pts}
+        if not points_by_customer:
+            return
+        cls.objects.bulk_create(
+            [cls(customer_id=cid) for cid in points_by_customer], ignore_conflicts=True
+        )
+        earned = Case(
+            *[When(customer_id=cid, then=Value(pts)) for cid, pts in points_by_customer.items()],
+            default=Value(0),
+            output_field=models.IntegerField(),
+        )
+        lifetime = Greatest(F("lifetime_points") + earned, Value(0))
+        cls.objects.filter(customer_id__in=points_by_customer.keys()).update(
+            available_points=Greatest(F("available_points") + earned, Value(0)),
+            lifetime_points=lifetime,
+            tier=Case(
+                *[When(GreaterThanOrEqual(lifetime, minimum), then=Value(tier))
+                  for minimum, tier in cls.TIER_THRESHOLDS],
+                default=Value("bronze"),
+            ),
+            updated_at=timezone.now(),
+        )
+
     def update_tier(self):
         """Auto upgrade tier based on lifetime points."""
-        if self.lifetime_points >= 10000:
-            self.tier = "platinum"
-        elif self.lifetime_points >= 5000:
-            self.tier = "gold"
-        elif self.lifetime_points >= 1000:
-            self.tier = "silver"
+        for minimum, tier in self.TIER_THRESHOLDS:
+            if self.lifetime_points >= minimum:
+                self.tier = tier
+                break
         else:
             self.tier = "bronze"
         self.save()
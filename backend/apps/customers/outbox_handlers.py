@@ -0,0 +1,27 @@
+from collections import defaultdict
+from apps.outbox.dispatch import handler
+from .models import Customer, CustomerLoyalty
+
+
+def _points_by_customer(payloads, sign=1):
+    points = defaultdict(int)
+    for payload in payloads:
+        if payload.get("customer"):
+            points[payload["customer"]] += sign * payload.get("points", 0)
+
+    # Skip customers deleted since the bill was created
+    existing = set(Customer.objects.filter(id__in=points.keys()).values_list("id", flat=True))
+    return {cid: pts for cid, pts in points.items() if cid in existing}
+
+
+@handler("bill.created")
+def accrue_loyalty(payloads):
+    """Credit loyalty points for a batch of new bills with one UPDATE."""
+    CustomerLoyalty.credit_points(_points_by_customer(payloads))
+
+
+@handler("bill.voided")
+@handler("bill.returned")
+def reverse_loyalty(payloads):
+    """Take back the points of voided or returned bills with one UPDATE."""
+    CustomerLoyalty.credit_points(_points_by_customer(payloads, sign=-1))
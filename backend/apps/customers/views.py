@@ -1,4 +1,6 @@
 from rest_framework import generics, permissions
+from backend_api.money import div_round, format_paise
+from backend_api.pagination import KeysetPagination
 from .models import Customer,CustomerLoyalty
 from .serializers import CustomerSerializer
 from rest_framework.response import Response
@@ -20,9 +22,10 @@ class CustomerList(generics.ListCreateAPIView):
     GET  /api/customers/        -> list all customers
     POST /api/customers/        -> create new customer
     """
-    queryset = Customer.objects.all().order_by("-created_at")
+    queryset = Customer.objects.all().order_by("-created_at", "-id")
     serializer_class = CustomerSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
 
 
 class CustomerDetailList(generics.RetrieveUpdateDestroyAPIView):
@@ -91,13 +94,10 @@ def customer_purchase_history(request, pk):
             .prefetch_related("items")
         )
 
-        total_spent = bills.aggregate(total_spent=Sum("total"))["total_spent"] or 0
-        total_bills = bills.count()
-        avg_bill_value = bills.aggregate(avg=Avg("total"))["avg"] or 0
-
-        # ✅ Convert Decimal to float for frontend
-        total_spent = float(total_spent)
-        avg_bill_value = float(avg_bill_value)
+        totals = bills.aggregate(total_spent=Sum("total_paise"), total_bills=Count("id"))
+        total_spent = totals["total_spent"] or 0
+        total_bills = totals["total_bills"]
+        avg_bill_value = div_round(total_spent, total_bills) if total_bills else 0
 
         # ✅ Recent purchases
         recent_purchases = [
@@ -105,7 +105,7 @@ def customer_purchase_history(request, pk):
                 "bill_id": bill.bill_id,
                 "date": bill.created_at,
                 "items_count": bill.items.count(),
-                "total": float(bill.total),
+                "total": format_paise(bill.total_paise),
                 "payment_status": bill.payment_status,
             }
             for bill in bills.order_by("-created_at")[:5]
@@ -121,9 +121,10 @@ def customer_purchase_history(request, pk):
 
         return Response(
             {
-                "total_spent": total_spent,
+                # ✅ Amounts as decimal strings, like the bill API
+                "total_spent": format_paise(total_spent),
                 "total_bills": total_bills,
-                "average_bill_value": avg_bill_value,
+                "average_bill_value": format_paise(avg_bill_value),
                 "recent_purchases": recent_purchases,
                 "frequent_products": list(frequent_products),
             }
@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import RenderJob
+
+
+@admin.register(RenderJob)
+class RenderJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "namespace", "object_id", "status", "public", "created_at", "finished_at")
+    list_filter = ("namespace", "status")
+    readonly_fields = ("created_at", "finished_at")
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class DocumentsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.documents'
+
+    def ready(self):
+        from . import checks  # noqa: F401  warns while the print fonts are missing
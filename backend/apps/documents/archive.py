@@ -0,0 +1,107 @@
+"""
+Streamed ZIP archives of rendered documents.
+
+`rendered` walks a sequence of documents in order, reusing cached versions
+and rendering missing ones through the worker pool with at most
+`window` renders in flight. `zip_stream` writes the resulting files into
+a ZIP that is yielded chunk by chunk. Only the in-flight renders and one
+copy buffer are held in memory, however many documents there are.
+Documents that fail to render are listed in a FAILED.txt entry at the end
+instead of aborting a download that has already started.
+"""
+import io
+import time
+import zipfile
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, wait
+from django.conf import settings
+from . import storage
+from .pool import RenderQueueFull, render_pool
+
+Document = namedtuple("Document", "namespace object_id version arcname build_html stylesheet")
+
+CHUNK_SIZE = 64 * 1024
+
+
+def rendered(documents, window=None):
+    """
+    Yield (Document, path or None, error or None) in order, rendering
+    documents that are not cached yet.
+    """
+    window = window or settings.PDF_ARCHIVE_WINDOW
+    pending = deque()
+    for document in documents:
+        path = storage.cached_path(document.namespace, document.object_id, document.version)
+        future = None if path else _submit(document, pending)
+        pending.append((document, path, future))
+        while len(pending) > window:
+            yield _resolve(*pending.popleft())
+    while pending:
+        yield _resolve(*pending.popleft())
+
+
+def _submit(document, pending):
+    html = document.build_html()
+    while True:
+        try:
+            return render_pool.submit(html, document.stylesheet)
+        except RenderQueueFull:
+            # Other requests hold the free slots; wait for one of ours, or briefly
+            running = [future for _, _, future in pending if future is not None and not future.done()]
+            if running:
+                wait(running, return_when=FIRST_COMPLETED)
+            else:
+                time.sleep(0.2)
+
+
+def _resolve(document, path, future):
+    if future is None:
+        return document, path, None
+    try:
+        data = future.result()
+    except Exception as exc:
+        return document, None, str(exc) or type(exc).__name__
+    return document, storage.store(document.namespace, document.object_id, document.version, data), None
+
+
+class _Sink(io.RawIOBase):
+    """Write-only stream collecting the bytes zipfile writes until they are taken."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def take(self):
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def zip_stream(documents, window=None):
+    """Yield the bytes of a ZIP holding each document under its `arcname`."""
+    sink = _Sink()
+    failed = []
+    # PDFs are already compressed; storing them keeps the export I/O bound
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for document, path, error in rendered(documents, window):
+            if error is not None:
+                failed.append(f"{document.arcname}: {error}")
+                continue
+            with open(path, "rb") as source, archive.open(document.arcname, mode="w", force_zip64=True) as target:
+                while chunk := source.read(CHUNK_SIZE):
+                    target.write(chunk)
+                    yield sink.take()
+            yield sink.take()
+        if failed:
+            archive.writestr("FAILED.txt", "\n".join(failed) + "\n")
+    yield sink.take()
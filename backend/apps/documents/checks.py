@@ -0,0 +1,15 @@
+from django.core.checks import Warning, register
+from . import printing
+
+
+@register()
+def check_print_fonts(app_configs, **kwargs):
+    missing = printing.missing_fonts()
+    if not missing:
+        return []
+    return [Warning(
+        f"Print fonts are not installed: {', '.join(missing)}.",
+        hint="Add them to apps/documents/assets/fonts (see its README.md); until then "
+             "PDFs fall back to a system copy or DejaVu Sans, and missing icons do not render.",
+        id="documents.W001",
+    )]
@@ -0,0 +1,125 @@
+"""
+PDF downloads backed by the version cache and the rendering pool.
+
+`pdf_response` serves a cached version straight from disk. Otherwise it
+queues a render and waits up to `?wait=` seconds (at most PDF_RENDER_WAIT):
+if the PDF is ready by then it is served as usual, if not the client gets
+202 with a RenderJob to poll. Concurrent requests for the same version in
+one process share a single render.
+"""
+import threading
+from django.conf import settings
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from backend_api.downloads import file_response
+from . import storage
+from .models import RenderJob
+from .pool import RenderQueueFull, render_pool
+
+_inflight = {}  # (namespace, object id, version) -> (RenderJob, threading.Event)
+_inflight_lock = threading.Lock()
+
+
+def wait_seconds(request):
+    """Seconds the client is willing to wait, from ?wait= (capped at PDF_RENDER_WAIT)."""
+    try:
+        wait = float(request.query_params.get("wait", settings.PDF_RENDER_WAIT))
+    except ValueError:
+        wait = settings.PDF_RENDER_WAIT
+    return min(max(wait, 0), settings.PDF_RENDER_WAIT)
+
+
+def start_render(namespace, object_id, version, filename, build_html, stylesheet=None, public=False):
+    """Return (RenderJob, Event set when it finishes), starting a render if none is in flight."""
+    key = (namespace, str(object_id), version)
+    with _inflight_lock:
+        if key in _inflight:
+            return _inflight[key]
+        job = RenderJob.objects.create(
+            namespace=namespace, object_id=str(object_id), version=version, filename=filename, public=public
+        )
+        finished = threading.Event()
+        _inflight[key] = (job, finished)
+    try:
+        future = render_pool.submit(build_html(), stylesheet)
+    except BaseException:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        RenderJob.objects.filter(pk=job.pk).delete()
+        raise
+    caller = threading.current_thread()
+    future.add_done_callback(lambda f: _finish(key, job, f, finished, caller))
+    return job, finished
+
+
+def _finish(key, job, future, finished, caller):
+    """Store the PDF and record the outcome; runs on the pool's result thread."""
+    try:
+        storage.store(job.namespace, job.object_id, job.version, future.result())
+        job.status = RenderJob.DONE
+    except Exception as exc:
+        job.status, job.error = RenderJob.FAILED, str(exc) or type(exc).__name__
+    job.finished_at = timezone.now()
+    try:
+        RenderJob.objects.filter(pk=job.pk).update(
+            status=job.status, error=job.error, finished_at=job.finished_at
+        )
+    finally:
+        if threading.current_thread() is not caller:
+            connection.close()
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        finished.set()
+
+
+def download(request, path, version, filename):
+    return file_response(
+        request, path, etag=f'"{version}"', content_type="application/pdf", filename=filename
+    )
+
+
+def job_payload(request, job):
+    payload = {
+        "id": str(job.pk),
+        "status": job.status,
+        "error": job.error,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+        "status_url": request.build_absolute_uri(reverse("render-job", args=[job.pk])),
+    }
+    if job.status == RenderJob.DONE:
+        payload["download_url"] = request.build_absolute_uri(reverse("render-job-file", args=[job.pk]))
+    return payload
+
+
+def pdf_response(request, namespace, object_id, version, filename, build_html, stylesheet=None, public=False):
+    """
+    Serve a document version, rendering it through the pool if needed.
+    `build_html` is called only when the version is not cached yet;
+    `stylesheet` names a printing.STYLESHEETS entry applied to it. Pass
+    `public=True` only when the calling view allows anonymous access, since
+    the job it hands out can then be polled without logging in.
+    """
+    path = storage.cached_path(namespace, object_id, version)
+    if path:
+        return download(request, path, version, filename)
+
+    try:
+        job, finished = start_render(namespace, object_id, version, filename, build_html, stylesheet, public)
+    except RenderQueueFull as exc:
+        return Response(
+            {"error": str(exc)}, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={"Retry-After": "5"}
+        )
+
+    if finished.wait(wait_seconds(request)):
+        if job.status == RenderJob.DONE:
+            return download(request, storage.document_path(namespace, object_id, version), version, filename)
+        return Response(
+            {"error": f"PDF rendering failed: {job.error}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    payload = job_payload(request, job)
+    return Response(payload, status=status.HTTP_202_ACCEPTED, headers={"Location": payload["status_url"]})
@@ -0,0 +1,72 @@
+import os
+import statistics
+import time
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.billing.invoices import STYLESHEET, invoice_html
+from apps.billing.models import Bill, BillItem
+from apps.documents import printing
+from apps.products.models import Product
+
+GOOGLE_FONTS = "https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure per-invoice PDF render time before (inline CSS, Google Fonts link, default "
+        "URL fetcher) and after (bundled fonts, precompiled stylesheet, offline fetcher). "
+        "Runs in this process, not the worker pool. All data is created inside a transaction "
+        "that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lines", type=int, default=20, help="Number of invoice lines.")
+        parser.add_argument("--repeat", type=int, default=10, help="Renders to time per run.")
+        parser.add_argument(
+            "--no-remote-fonts", action="store_true",
+            help="Leave the Google Fonts link out of the baseline (e.g. on a host without network access).",
+        )
+
+    def handle(self, *args, **options):
+        from weasyprint import HTML
+        size = options["lines"]
+
+        with transaction.atomic():
+            products = Product.objects.bulk_create([
+                Product(item_id=f"BENCH-{i:05d}", name=f"Bench product {i}", quantity=10**6, price=Decimal("10.00"))
+                for i in range(size)
+            ])
+            bill = Bill.objects.create(
+                bill_id="BENCH-PDF", subtotal_paise=2000 * size, total_paise=2000 * size, payment_status="paid"
+            )
+            BillItem.objects.bulk_create([
+                BillItem(bill=bill, product=p, quantity=2, price_paise=1000, price=Decimal("10.00")) for p in products
+            ])
+            bill = Bill.objects.select_related("customer").prefetch_related("items__product").get(pk=bill.pk)
+            html = invoice_html(bill)
+            transaction.set_rollback(True)
+
+        css = "".join(
+            open(os.path.join(printing.ASSET_ROOT, name), encoding="utf-8").read()
+            for name in printing.STYLESHEETS[STYLESHEET]
+        )
+        head = "" if options["no_remote_fonts"] else f'<link href="{GOOGLE_FONTS}" rel="stylesheet">'
+        legacy_html = html.replace("</head>", f"{head}<style>{css}</style></head>", 1)
+
+        self.stdout.write(f"{'run':>7} {'first ms':>9} {'mean ms':>8} {'p95 ms':>7}")
+        self._measure(
+            "before", options["repeat"],
+            lambda: HTML(string=legacy_html, base_url=printing.BASE_URL).write_pdf(),
+        )
+        self._measure("after", options["repeat"], lambda: printing.write_pdf(html, STYLESHEET))
+
+    def _measure(self, label, repeat, render):
+        timings = []
+        for _ in range(repeat + 1):
+            started = time.perf_counter()
+            render()
+            timings.append((time.perf_counter() - started) * 1000)
+        first, warm = timings[0], sorted(timings[1:])
+        p95 = warm[min(len(warm) - 1, int(len(warm) * 0.95))]
+        self.stdout.write(f"{label:>7} {first:>9.1f} {statistics.mean(warm):>8.1f} {p95:>7.1f}")
@@ -0,0 +1,95 @@
+import os
+import subprocess
+import sys
+from django.core.management.base import BaseCommand, CommandError
+
+# Loaded only by the code that renders documents, never at worker start-up
+HEAVY_MODULES = (
+    "weasyprint", "pydyf", "fontTools", "cffi", "PIL", "tinycss2", "cssselect2",
+    "tinyhtml5", "pyphen", "brotli", "zopfli", "multiprocessing",
+)
+
+# What a WSGI/ASGI worker does before its first request
+BOOT = """
+import resource, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+for name in sys.argv[1:]:
+    __import__(name)
+elapsed = time.perf_counter() - started
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(f"{elapsed:.6f} {rss}")
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Profile what a worker imports at start-up (settings, apps and the URLconf) in a fresh "
+        "interpreter with -X importtime. Fails if a heavyweight module is loaded or a budget is exceeded."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=15, help="Slowest top-level imports to list.")
+        parser.add_argument("--also", nargs="*", default=[], help="Extra modules to import after start-up.")
+        parser.add_argument("--allow", nargs="*", default=[], help="Heavy modules that may be loaded.")
+        parser.add_argument("--budget-ms", type=float, help="Fail if start-up takes longer than this.")
+        parser.add_argument("--budget-mb", type=float, help="Fail if peak RSS exceeds this.")
+
+    def handle(self, *args, **options):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", BOOT, *options["also"]],
+            capture_output=True, text=True, env=os.environ.copy(),
+        )
+        if result.returncode:
+            raise CommandError(f"Start-up failed:\n{result.stderr[-2000:]}")
+        elapsed, rss = result.stdout.split()[-2:]
+        elapsed_ms = float(elapsed) * 1000
+        rss_mb = int(rss) / 1024 if sys.platform != "darwin" else int(rss) / 1024 / 1024
+        entries = parse_importtime(result.stderr)
+
+        self.stdout.write(f"start-up {elapsed_ms:.0f} ms, peak RSS {rss_mb:.1f} MB, {len(entries)} modules")
+        self.stdout.write(f"{'cumulative ms':>13} {'self ms':>8}  module")
+        top_level = sorted((e for e in entries if e[3] == 0), key=lambda e: e[2], reverse=True)
+        for name, self_us, cumulative_us, _ in top_level[:options["top"]]:
+            self.stdout.write(f"{cumulative_us / 1000:>13.1f} {self_us / 1000:>8.1f}  {name}")
+
+        problems = []
+        heavy = set(HEAVY_MODULES) - set(options["allow"])
+        for index, (name, *_rest) in enumerate(entries):
+            if name in heavy:
+                problems.append(f"{name} imported via {' <- '.join(importers(entries, index)) or 'start-up'}")
+        if options["budget_ms"] is not None and elapsed_ms > options["budget_ms"]:
+            problems.append(f"start-up took {elapsed_ms:.0f} ms (budget {options['budget_ms']:.0f} ms)")
+        if options["budget_mb"] is not None and rss_mb > options["budget_mb"]:
+            problems.append(f"peak RSS {rss_mb:.1f} MB (budget {options['budget_mb']:.1f} MB)")
+        if problems:
+            raise CommandError("Import profile regressed:\n  " + "\n  ".join(problems))
+        self.stdout.write(self.style.SUCCESS("No heavyweight modules loaded at start-up"))
+
+
+def parse_importtime(stderr):
+    """-X importtime output -> [(module, self us, cumulative us, depth)] in report order."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def importers(entries, index):
+    """Names of the modules whose import pulled in entries[index], innermost first."""
+    chain, depth = [], entries[index][3]
+    # A module is reported after everything it imported, at a smaller depth
+    for name, _, _, entry_depth in entries[index + 1:]:
+        if entry_depth < depth:
+            chain.append(name)
+            depth = entry_depth
+            if depth == 0:
+                break
+    return chain
@@ -0,0 +1,20 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.documents.models import RenderJob
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete old render job records. Rendered files are kept: they belong "
+        "to the document cache, not to the job."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=7, help="Delete jobs created more than this many days ago.")
+
+    def handle(self, *args, **options):
+        # Jobs still pending by then were lost with the process that started them
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        deleted, _ = RenderJob.objects.filter(created_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} render jobs"))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-17 08:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='renderjob',
+            name='public',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,33 @@
+import uuid
+from django.db import models
+
+
+class RenderJob(models.Model):
+    """
+    A PDF render handed to the rendering pool. Clients that did not wait for
+    it poll GET /api/documents/jobs/<id>/ and download the file when done.
+    Only jobs for documents that are themselves public (the bill invoice URL)
+    can be polled without logging in.
+    """
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    namespace = models.CharField(max_length=50)  # e.g. "invoices", "purchase_orders"
+    object_id = models.CharField(max_length=64)
+    version = models.CharField(max_length=64)
+    filename = models.CharField(max_length=200)
+    public = models.BooleanField(default=False)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.namespace}/{self.object_id} ({self.status})"
@@ -0,0 +1,129 @@
+"""
+PDF rendering in a pool of worker processes.
+
+WeasyPrint layout is CPU-bound and holds the GIL, so rendering inside a
+WSGI worker stalls every other request it serves. `render_pool` hands the
+HTML to separate processes instead. Each worker imports WeasyPrint and
+parses the document stylesheets (see printing.py) and renders a
+throwaway page once at start-up, so fonts and CSS are warm for real jobs.
+
+The queue is bounded: when PDF_RENDER_WORKERS jobs are running and
+PDF_RENDER_QUEUE_SIZE more are waiting, `submit` raises RenderQueueFull
+instead of piling work up. A job running longer than PDF_RENDER_TIMEOUT
+seconds is interrupted inside its worker. PDF_RENDER_WORKERS = 0 renders
+in the calling thread (tests, single-process development).
+
+Worker processes only receive HTML strings; they never touch the database.
+WeasyPrint and multiprocessing are imported on first use, so web workers
+and management commands that never render do not load them.
+"""
+import signal
+import threading
+from concurrent.futures import Future
+from django.conf import settings
+from . import printing
+
+
+class RenderQueueFull(Exception):
+    pass
+
+
+class RenderTimeout(Exception):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise RenderTimeout("PDF rendering took too long")
+
+
+def _warm_worker():
+    for name in printing.STYLESHEETS:
+        printing.stylesheets(name)
+    printing.write_pdf("<p>warm-up</p>")
+
+
+def render_html(html, stylesheet=None, timeout=None):
+    """Render `html` to PDF bytes; runs inside a worker process."""
+    alarm = timeout and hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+    if alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return printing.write_pdf(html, stylesheet)
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+class RenderPool:
+    def __init__(self, workers, queue_size, timeout, start_method="spawn"):
+        self.workers = workers
+        self.timeout = timeout
+        self.start_method = start_method
+        self._slots = threading.BoundedSemaphore(workers + queue_size) if workers else None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, html, stylesheet=None):
+        """Queue a render and return a Future of the PDF bytes; raises RenderQueueFull."""
+        if not self.workers:
+            return self._render_inline(html, stylesheet)
+        if not self._slots.acquire(blocking=False):
+            raise RenderQueueFull("The PDF renderer is busy")
+        try:
+            future = self._submit(html, stylesheet)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _submit(self, html, stylesheet):
+        from concurrent.futures.process import BrokenProcessPool
+        executor = self._get_executor()
+        try:
+            return executor.submit(render_html, html, stylesheet, self.timeout)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool once
+            self._reset(executor)
+            return self._get_executor().submit(render_html, html, stylesheet, self.timeout)
+
+    def _get_executor(self):
+        # multiprocessing is only loaded once a process actually renders
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=_warm_worker,
+                )
+            return self._executor
+
+    def _reset(self, broken):
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _render_inline(self, html, stylesheet):
+        future = Future()
+        try:
+            future.set_result(render_html(html, stylesheet))
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+render_pool = RenderPool(
+    workers=settings.PDF_RENDER_WORKERS,
+    queue_size=settings.PDF_RENDER_QUEUE_SIZE,
+    timeout=settings.PDF_RENDER_TIMEOUT,
+)
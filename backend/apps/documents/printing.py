@@ -0,0 +1,89 @@
+"""
+Offline print assets for WeasyPrint.
+
+Templates carry markup only. Their CSS lives in `assets/` and is named by
+a key of STYLESHEETS. Each worker process parses a stylesheet once, with
+one shared FontConfiguration, and reuses the parsed CSS for every render.
+Fonts are committed under `assets/fonts` (see its README), and a system
+check warns while any of BUNDLED_FONTS is missing. `offline_url_fetcher` serves only files under `assets/` and
+data: URLs, so a stray <link> or url() fails immediately instead of waiting
+on the network.
+"""
+import hashlib
+import os
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+ASSET_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+BASE_URL = Path(ASSET_ROOT).as_uri() + "/"
+FONT_ROOT = os.path.join(ASSET_ROOT, "fonts")
+
+# Files under FONT_ROOT that print.css loads (all SIL Open Font License)
+BUNDLED_FONTS = (
+    *(f"Poppins-{style}.ttf" for style in ("Light", "Regular", "Medium", "SemiBold", "Bold")),
+    "fa-solid-900.ttf",
+)
+
+STYLESHEETS = {
+    "invoice": ("print.css", "invoice.css"),
+    "purchase_order": ("print.css", "purchase_order.css"),
+    "supplier_statement": ("print.css", "purchase_order.css", "statement.css"),
+}
+
+
+def missing_fonts():
+    """BUNDLED_FONTS that are not installed under FONT_ROOT."""
+    return [name for name in BUNDLED_FONTS if not os.path.exists(os.path.join(FONT_ROOT, name))]
+
+
+def offline_url_fetcher(url):
+    """Fetch data: URLs and files under ASSET_ROOT; refuse everything else."""
+    from weasyprint import default_url_fetcher
+    parts = urlsplit(url)
+    if parts.scheme == "data":
+        return default_url_fetcher(url)
+    if parts.scheme == "file":
+        path = os.path.realpath(unquote(parts.path))
+        if path.startswith(os.path.realpath(ASSET_ROOT) + os.sep):
+            return default_url_fetcher(url)
+    raise ValueError(f"{url} is not a bundled print asset")
+
+
+@lru_cache(maxsize=None)
+def font_config():
+    from weasyprint.text.fonts import FontConfiguration
+    return FontConfiguration()
+
+
+@lru_cache(maxsize=None)
+def stylesheets(name):
+    """Parsed CSS for a STYLESHEETS entry, compiled once per process."""
+    from weasyprint import CSS
+    return [
+        CSS(filename=os.path.join(ASSET_ROOT, filename), url_fetcher=offline_url_fetcher, font_config=font_config())
+        for filename in STYLESHEETS[name]
+    ]
+
+
+@lru_cache(maxsize=None)
+def stylesheet_digest(name):
+    """Digest of a stylesheet's files and the installed fonts, for document versions."""
+    digest = hashlib.sha256()
+    paths = [os.path.join(ASSET_ROOT, filename) for filename in STYLESHEETS[name]]
+    # Adding or replacing a font changes the rendered PDFs too
+    missing = missing_fonts()
+    paths += [os.path.join(FONT_ROOT, font) for font in BUNDLED_FONTS if font not in missing]
+    for path in paths:
+        with open(path, "rb") as source:
+            digest.update(source.read())
+    return digest.hexdigest()
+
+
+def write_pdf(html, stylesheet=None):
+    """Render `html` to PDF bytes with a precompiled stylesheet and no network access."""
+    from weasyprint import HTML
+    document = HTML(string=html, base_url=BASE_URL, url_fetcher=offline_url_fetcher)
+    return document.write_pdf(
+        stylesheets=stylesheets(stylesheet) if stylesheet else None, font_config=font_config()
+    )
@@ -0,0 +1,67 @@
+"""
+Rendered documents on disk, one file per document version.
+
+A version is a digest of everything the document shows, computed by the
+caller, so a changed document simply gets a new file and stale ones are
+never served. Files live under DOCUMENT_CACHE_ROOT/<namespace>/<object id>/
+<version>.pdf; storing a version removes that object's older ones.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from functools import lru_cache
+from django.conf import settings
+from django.template.loader import get_template
+
+
+@lru_cache(maxsize=None)
+def template_digest(name):
+    """Digest of a template's source, so editing the template changes every version."""
+    with open(get_template(name).origin.name, "rb") as source:
+        return hashlib.sha256(source.read()).hexdigest()
+
+
+def version_of(state):
+    """Short digest of a JSON-serializable description of a document."""
+    payload = json.dumps(state, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def object_dir(namespace, object_id):
+    return os.path.join(settings.DOCUMENT_CACHE_ROOT, namespace, str(object_id))
+
+
+def document_path(namespace, object_id, version):
+    return os.path.join(object_dir(namespace, object_id), f"{version}.pdf")
+
+
+def cached_path(namespace, object_id, version):
+    """Path of the stored version, or None if it has not been rendered yet."""
+    path = document_path(namespace, object_id, version)
+    return path if os.path.exists(path) else None
+
+
+def store(namespace, object_id, version, data):
+    """Write a version atomically and drop the object's older versions. Returns the path."""
+    directory = object_dir(namespace, object_id)
+    path = document_path(namespace, object_id, version)
+    os.makedirs(directory, exist_ok=True)
+    # Write then rename, so a concurrent reader never sees a partial file
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "wb") as out:
+        out.write(data)
+    os.replace(tmp, path)
+
+    for name in os.listdir(directory):
+        if name.endswith(".pdf") and name != os.path.basename(path):
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+    return path
+
+
+def discard(namespace, object_id):
+    shutil.rmtree(object_dir(namespace, object_id), ignore_errors=True)
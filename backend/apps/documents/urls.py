@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path("documents/jobs/<uuid:pk>/", views.RenderJobDetail.as_view(), name="render-job"),
+    path("documents/jobs/<uuid:pk>/file/", views.RenderJobFile.as_view(), name="render-job-file"),
+]
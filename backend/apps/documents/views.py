@@ -0,0 +1,48 @@
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.permissions import BasePermission
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from . import storage
+from .jobs import download, job_payload
+from .models import RenderJob
+
+
+class CanReadRenderJob(BasePermission):
+    """Jobs for public documents (the bill invoice URL) are open; the rest need a login."""
+
+    def has_object_permission(self, request, view, job) -> bool:
+        return job.public or bool(request.user and request.user.is_authenticated)
+
+
+class RenderJobView(APIView):
+    permission_classes = [CanReadRenderJob]
+
+    def get_job(self, pk):
+        job = get_object_or_404(RenderJob, pk=pk)
+        self.check_object_permissions(self.request, job)
+        return job
+
+
+class RenderJobDetail(RenderJobView):
+    """
+    GET /api/documents/jobs/<id>/ -> status of a render returned with 202
+    The job id is an unguessable UUID handed out by the document's own view.
+    """
+
+    def get(self, request, pk):
+        return Response(job_payload(request, self.get_job(pk)))
+
+
+class RenderJobFile(RenderJobView):
+    """GET /api/documents/jobs/<id>/file/ -> the rendered PDF once the job is done"""
+
+    def get(self, request, pk):
+        job = self.get_job(pk)
+        if job.status != RenderJob.DONE:
+            return Response(job_payload(request, job), status=status.HTTP_409_CONFLICT)
+        path = storage.cached_path(job.namespace, job.object_id, job.version)
+        if path is None:
+            # The document changed since and this version was replaced
+            return Response({"error": "This version is no longer available"}, status=status.HTTP_410_GONE)
+        return download(request, path, job.version, job.filename)
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-17 08:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('idempotency', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='idempotencykey',
+            name='unique_idempotency_key_per_scope',
+        ),
+        migrations.AddConstraint(
+            model_name='idempotencykey',
+            constraint=models.UniqueConstraint(fields=('scope', 'user', 'key'), name='unique_idempotency_key_per_user', nulls_distinct=False),
+        ),
+    ]
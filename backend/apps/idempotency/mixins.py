@@ -0,0 +1,86 @@
+import hashlib
+import json
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def request_fingerprint(request):
+    """Hash of the request payload, used to reject a key reused for a different body."""
+    payload = json.dumps(request.data, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class IdempotentCreateMixin:
+    """
+    Makes `create()` safe to retry.
+
+    When a POST carries an `Idempotency-Key` header, the key is claimed (per
+    user and scope) in the same transaction that creates the object and the response is stored with it.
+    A retry with the same key gets the stored response back without running
+    `create()` again. A concurrent retry waits on the key's unique index until
+    the first request commits (replay) or rolls back (runs normally).
+    """
+    idempotency_scope = None
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return super().create(request, *args, **kwargs)
+        if len(key) > 255:
+            return Response(
+                {"error": f"{IDEMPOTENCY_HEADER} must be at most 255 characters"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        fingerprint = request_fingerprint(request)
+        with transaction.atomic():
+            record, claimed = self._claim_key(request, key, fingerprint)
+            if not claimed:
+                return self._replay(record, fingerprint)
+
+            response = super().create(request, *args, **kwargs)
+            record.response_status = response.status_code
+            record.response_body = response.data
+            record.save(update_fields=["response_status", "response_body"])
+        return response
+
+    def _claim_key(self, request, key, fingerprint):
+        scope = self.idempotency_scope or type(self).__name__
+        user = request.user if request.user and request.user.is_authenticated else None
+        expires_at = timezone.now() + settings.IDEMPOTENCY_KEY_TTL
+
+        for _ in range(2):
+            try:
+                with transaction.atomic():
+                    record = IdempotencyKey.objects.create(
+                        scope=scope, key=key, user=user,
+                        request_fingerprint=fingerprint, expires_at=expires_at,
+                    )
+                return record, True
+            except IntegrityError:
+                record = IdempotencyKey.objects.filter(scope=scope, user=user, key=key).first()
+                if record is None:
+                    continue
+                if record.expires_at > timezone.now():
+                    return record, False
+                # Expired keys are treated as never seen
+                record.delete()
+        raise IntegrityError(f"Could not claim idempotency key {key!r}")
+
+    def _replay(self, record, fingerprint):
+        if record.request_fingerprint != fingerprint:
+            return Response(
+                {"error": f"{IDEMPOTENCY_HEADER} was already used for a different request"},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        response = Response(record.response_body, status=record.response_status)
+        response[REPLAYED_HEADER] = "true"
+        return response
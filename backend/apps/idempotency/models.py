@@ -0,0 +1,30 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from apps.accounts.models import CustomUser
+
+
+class IdempotencyKey(models.Model):
+    """
+    Stored outcome of a create request sent with an `Idempotency-Key` header.
+    Retries with the same key get this response back instead of creating again.
+    Keys belong to the user who sent them, so two users cannot collide.
+    """
+    scope = models.CharField(max_length=100)
+    key = models.CharField(max_length=255)
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, null=True, blank=True)
+    request_fingerprint = models.CharField(max_length=64)
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(encoder=DjangoJSONEncoder, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            # Anonymous requests (no user) share one namespace per scope
+            models.UniqueConstraint(
+                fields=["scope", "user", "key"], name="unique_idempotency_key_per_user", nulls_distinct=False
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.scope}:{self.key}"
@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import OutboxEvent
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ("id", "topic", "created_at", "processed_at", "attempts", "next_attempt_at")
+    list_filter = ("topic",)
+    readonly_fields = ("created_at",)
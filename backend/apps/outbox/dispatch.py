@@ -0,0 +1,104 @@
+import logging
+from collections import defaultdict
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from .models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+_handlers = {}
+
+
+def handler(topic):
+    """
+    Register `func(payloads)` as the handler for `topic`.
+    It receives the payloads of a whole batch, so it can apply them set-wise.
+    """
+    def register(func):
+        _handlers[topic] = func
+        return func
+    return register
+
+
+def publish(topic, payload):
+    """Record an event; call inside the transaction that makes the change."""
+    return OutboxEvent.objects.create(topic=topic, payload=payload)
+
+
+def publish_many(topic, payloads):
+    """Record several events of one topic with a single INSERT."""
+    return OutboxEvent.objects.bulk_create(
+        [OutboxEvent(topic=topic, payload=payload) for payload in payloads]
+    )
+
+
+def drain(batch_size=500):
+    """
+    Apply one batch of due events, oldest first, and return how many were taken.
+
+    Rows are claimed with SKIP LOCKED so several workers can drain in parallel.
+    Each topic's handler runs over its whole group in one savepoint. If that
+    fails, the group is retried one event per savepoint, so only the events
+    that fail themselves are charged an attempt. A failed event waits
+    OUTBOX_RETRY_DELAY, doubled after every attempt, before it is claimed
+    again, and is left alone once it reaches OUTBOX_MAX_ATTEMPTS.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(processed_at__isnull=True, attempts__lt=settings.OUTBOX_MAX_ATTEMPTS)
+            .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+            .order_by("id")[:batch_size]
+        )
+        by_topic = defaultdict(list)
+        for event in events:
+            by_topic[event.topic].append(event)
+
+        done, failed = [], []
+        for topic, group in by_topic.items():
+            func = _handlers.get(topic)
+            if func is None:
+                error = LookupError(f"No outbox handler registered for {topic!r}")
+                logger.error("%s (%d events)", error, len(group))
+                failed.extend((event, error) for event in group)
+                continue
+            try:
+                _apply(func, group)
+            except Exception as exc:
+                if len(group) == 1:
+                    logger.exception("Outbox handler for %s failed on event %d", topic, group[0].id)
+                    failed.append((group[0], exc))
+                    continue
+                logger.warning("Outbox handler for %s failed on %d events (%s); retrying them one by one",
+                               topic, len(group), exc)
+                for event in group:
+                    try:
+                        _apply(func, [event])
+                    except Exception as error:
+                        logger.exception("Outbox handler for %s failed on event %d", topic, event.id)
+                        failed.append((event, error))
+                    else:
+                        done.append(event.id)
+            else:
+                done.extend(event.id for event in group)
+
+        if done:
+            OutboxEvent.objects.filter(id__in=done).update(
+                attempts=F("attempts") + 1, processed_at=now, last_error="", next_attempt_at=None
+            )
+        for event, exc in failed:
+            event.attempts += 1
+            event.last_error = str(exc)
+            event.next_attempt_at = now + settings.OUTBOX_RETRY_DELAY * 2 ** (event.attempts - 1)
+        OutboxEvent.objects.bulk_update(
+            [event for event, _ in failed], ["attempts", "last_error", "next_attempt_at"]
+        )
+    return len(events)
+
+
+def _apply(func, events):
+    with transaction.atomic():
+        func([event.payload for event in events])
@@ -0,0 +1,42 @@
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.outbox.dispatch import drain
+from apps.outbox.models import OutboxEvent
+
+
+class Command(BaseCommand):
+    help = "Apply pending outbox events (loyalty accrual and other post-checkout updates) in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Events claimed per transaction.")
+        parser.add_argument(
+            "--loop", action="store_true",
+            help="Keep running and poll for new events instead of exiting once the outbox is empty.",
+        )
+        parser.add_argument("--interval", type=float, default=1.0, help="Seconds to sleep when idle (with --loop).")
+        parser.add_argument(
+            "--purge-days", type=int, default=7,
+            help="Delete processed events older than this many days (0 keeps them).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        total = 0
+        while True:
+            taken = drain(batch_size)
+            total += taken
+            if taken >= batch_size:
+                continue  # probably more waiting; failed events are not due again until their backoff ends
+            self._purge(options["purge_days"])
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS(f"Processed {total} outbox events"))
+
+    @staticmethod
+    def _purge(days):
+        if days > 0:
+            cutoff = timezone.now() - timedelta(days=days)
+            OutboxEvent.objects.filter(processed_at__lt=cutoff).delete()
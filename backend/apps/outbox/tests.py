@@ -0,0 +1,110 @@
+from datetime import timedelta
+import pytest
+from django.utils import timezone
+from apps.customers.models import CustomerLoyalty
+from apps.outbox import dispatch
+from apps.outbox.dispatch import drain, publish_many
+from apps.outbox.models import OutboxEvent
+
+
+@pytest.fixture
+def flaky_handler(monkeypatch):
+    """Register a handler for `test.flaky` that fails while `calls["fail"]` is True, or on the event with that `n`."""
+    calls = {"fail": True, "payloads": []}
+
+    def handle(payloads):
+        if calls["fail"] is True or any(p.get("n") == calls["fail"] for p in payloads):
+            raise RuntimeError("downstream unavailable")
+        calls["payloads"].extend(payloads)
+
+    monkeypatch.setitem(dispatch._handlers, "test.flaky", handle)
+    return calls
+
+
+def make_due():
+    OutboxEvent.objects.update(next_attempt_at=timezone.now())
+
+
+@pytest.mark.django_db
+def test_drain_retries_failed_events_and_counts_attempts(flaky_handler):
+    publish_many("test.flaky", [{"n": 1}, {"n": 2}])
+
+    assert drain() == 2
+    pending = list(OutboxEvent.objects.order_by("id"))
+    assert [(e.attempts, e.processed_at, e.last_error) for e in pending] == [(1, None, "downstream unavailable")] * 2
+
+    flaky_handler["fail"] = False
+    make_due()
+    assert drain() == 2
+    assert flaky_handler["payloads"] == [{"n": 1}, {"n": 2}]
+    done = list(OutboxEvent.objects.order_by("id"))
+    assert all(e.attempts == 2 and e.processed_at and e.last_error == "" for e in done)
+    assert drain() == 0
+
+
+@pytest.mark.django_db
+def test_one_bad_event_does_not_charge_the_rest_of_the_batch(flaky_handler):
+    flaky_handler["fail"] = 2
+    publish_many("test.flaky", [{"n": 1}, {"n": 2}, {"n": 3}])
+
+    assert drain() == 3
+
+    assert flaky_handler["payloads"] == [{"n": 1}, {"n": 3}]
+    events = {e.payload["n"]: e for e in OutboxEvent.objects.all()}
+    assert events[1].processed_at and events[3].processed_at
+    assert events[1].attempts == events[3].attempts == 1
+    assert events[2].processed_at is None
+    assert events[2].attempts == 1
+
+
+@pytest.mark.django_db
+def test_failed_events_back_off_before_the_next_attempt(flaky_handler, settings):
+    settings.OUTBOX_RETRY_DELAY = timedelta(seconds=30)
+    publish_many("test.flaky", [{"n": 1}])
+
+    before = timezone.now()
+    assert drain() == 1
+    assert drain() == 0  # not due yet
+    first_wait = OutboxEvent.objects.get().next_attempt_at - before
+    assert timedelta(seconds=30) <= first_wait < timedelta(seconds=40)
+
+    make_due()
+    before = timezone.now()
+    assert drain() == 1
+    second_wait = OutboxEvent.objects.get().next_attempt_at - before
+    assert timedelta(seconds=60) <= second_wait < timedelta(seconds=70)
+
+
+@pytest.mark.django_db
+def test_drain_gives_up_after_max_attempts(flaky_handler, settings):
+    settings.OUTBOX_MAX_ATTEMPTS = 2
+    publish_many("test.flaky", [{"n": 1}])
+
+    assert drain() == 1
+    make_due()
+    assert drain() == 1
+    make_due()
+    assert drain() == 0
+    assert OutboxEvent.objects.get().attempts == 2
+
+
+@pytest.mark.django_db
+def test_failing_topic_does_not_block_other_topics(flaky_handler, customer):
+    publish_many("test.flaky", [{"n": 1}])
+    publish_many("bill.created", [{"customer": customer.pk, "points": 40}])
+
+    assert drain() == 2
+    assert OutboxEvent.objects.get(topic="bill.created").processed_at is not None
+    assert OutboxEvent.objects.get(topic="test.flaky").processed_at is None
+    assert CustomerLoyalty.objects.get(customer=customer).available_points == 40
+
+
+@pytest.mark.django_db
+def test_unknown_topic_stays_pending():
+    publish_many("test.unhandled", [{"n": 1}])
+
+    assert drain() == 1
+    event = OutboxEvent.objects.get()
+    assert event.attempts == 1
+    assert event.processed_at is None
+    assert "test.unhandled" in event.last_error
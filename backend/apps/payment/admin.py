@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Payment
+from .models import Payment, Refund
 
 
 @admin.register(Payment)
@@ -30,7 +30,7 @@ class PaymentAdmin(admin.ModelAdmin):
             "fields": (
                 "transaction_id",
                 "bill",
-                "amount",
+                "amount_paise",  # the rupee amount is derived on save
                 "status",
             )
         }),
@@ -43,3 +43,12 @@ class PaymentAdmin(admin.ModelAdmin):
         """Display linked Bill's payment status (for quick reference)."""
         return obj.bill.payment_status if obj.bill else "-"
     bill_status.short_description = "Bill Payment Status"
+
+
+@admin.register(Refund)
+class RefundAdmin(admin.ModelAdmin):
+    """Refunds are written by the returns flow; shown here read-only."""
+    list_display = ("reference", "bill", "payment", "amount_paise", "method", "created_at")
+    search_fields = ("reference", "bill__bill_id", "payment__transaction_id")
+    readonly_fields = ("payment", "bill", "amount_paise", "method", "reference", "created_at")
+    ordering = ("-created_at",)
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-17 07:15
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False  # CONCURRENTLY cannot run inside a transaction
+
+    dependencies = [
+        ('billing', '0012_bill_created_id_idx'),
+        ('payment', '0003_alter_payment_transaction_id'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='payment',
+            index=models.Index(fields=['-created_at', '-id'], name='payment_created_id_idx'),
+        ),
+    ]
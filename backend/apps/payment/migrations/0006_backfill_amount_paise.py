@@ -0,0 +1,15 @@
+from django.db import migrations
+
+# amount stays and is written from amount_paise until every reader has moved over
+BACKFILL = "UPDATE payment_payment SET amount_paise = ROUND(amount * 100)"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0005_payment_amount_paise'),
+    ]
+
+    operations = [
+        migrations.RunSQL(BACKFILL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-17 07:23
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0016_backfill_paise_amounts'),
+        ('payment', '0006_backfill_amount_paise'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Refund',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount_paise', models.BigIntegerField()),
+                ('method', models.CharField(blank=True, default='', max_length=50)),
+                ('reference', models.CharField(blank=True, default='', max_length=100)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('bill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='refunds', to='billing.bill')),
+                ('payment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='refunds', to='payment.payment')),
+            ],
+        ),
+    ]
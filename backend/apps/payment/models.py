@@ -1,5 +1,7 @@
 from django.db import models
+from django.utils import timezone
 from apps.billing.models import Bill
+from backend_api.money import from_paise
 
 
 class Payment(models.Model):
@@ -18,11 +20,19 @@ class Payment(models.Model):
         blank=True,
     )
     transaction_id = models.CharField(max_length=255, unique=True)
-    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    amount_paise = models.BigIntegerField(default=0)
+    # Legacy rupee column, written from amount_paise
+    amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Newest-first keyset pagination
+            models.Index(fields=["-created_at", "-id"], name="payment_created_id_idx"),
+        ]
+
     def __str__(self) -> str:
         return f"Payment {self.transaction_id} ({self.status})"
 
@@ -35,7 +45,8 @@ class Payment(models.Model):
                 original_status = original.status
             except Payment.DoesNotExist:
                 pass
-        
+
+        self.amount = from_paise(self.amount_paise)
         super().save(*args, **kwargs)
         
         # 🔄 Sync payment status with Bill (only if status changed)
@@ -51,3 +62,18 @@ class Payment(models.Model):
             except Exception as e:
                 # Log the error but don't fail the payment save
                 print(f"Error updating bill payment status: {e}")
+
+
+class Refund(models.Model):
+    """Money paid back to a customer, e.g. for a bill return."""
+    payment = models.ForeignKey(
+        Payment, on_delete=models.SET_NULL, null=True, blank=True, related_name="refunds"
+    )
+    bill = models.ForeignKey(Bill, on_delete=models.CASCADE, related_name="refunds")
+    amount_paise = models.BigIntegerField()
+    method = models.CharField(max_length=50, blank=True, default="")
+    reference = models.CharField(max_length=100, blank=True, default="")  # e.g. the return number
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self) -> str:
+        return f"Refund {self.reference or self.pk} on {self.bill_id}"
@@ -1,11 +1,13 @@
 from rest_framework import serializers
 from .models import Payment
 from apps.billing.models import Bill
+from backend_api.money import PaiseField
 
 
 class PaymentSerializer(serializers.ModelSerializer):
     bill_id = serializers.ReadOnlyField(source="bill.id")
     bill = serializers.PrimaryKeyRelatedField(queryset=Bill.objects.all(), required=False, allow_null=True)
+    amount = PaiseField(source="amount_paise", min_value=0)
 
     class Meta:
         model = Payment
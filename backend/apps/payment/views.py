@@ -5,10 +5,14 @@ from rest_framework.response import Response
 from .models import Payment
 from .serializers import PaymentSerializer
 from apps.billing.models import Bill
+from apps.idempotency.mixins import IdempotentCreateMixin
+from backend_api.pagination import KeysetPagination
 
-class PaymentListCreateView(generics.ListCreateAPIView):
-    queryset = Payment.objects.all().order_by("-created_at")
+class PaymentListCreateView(IdempotentCreateMixin, generics.ListCreateAPIView):
+    queryset = Payment.objects.all().order_by("-created_at", "-id")
     serializer_class = PaymentSerializer
+    pagination_class = KeysetPagination
+    idempotency_scope = "payments"
 
 
 @api_view(["PATCH"])
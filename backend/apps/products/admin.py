@@ -3,5 +3,6 @@ from .models import Product, Category, StockEntry
 
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
-    list_display = ("item_id", "name", "category", "supplier", "price", "quantity", "created_at")
-    search_fields = ("name", "item_id", "manufacturer")  # ✅ required
+    list_display = ("item_id", "name", "category", "supplier", "price", "quantity", "stripe_count", "created_at")
+    search_fields = ("name", "item_id", "barcode", "manufacturer")  # ✅ required
+    readonly_fields = ("stripe_count",)  # change with `manage.py stripe_stock`
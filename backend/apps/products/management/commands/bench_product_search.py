@@ -0,0 +1,86 @@
+import random
+import statistics
+import time
+from decimal import Decimal
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+from apps.accounts.models import CustomUser
+from apps.products.models import Category, Product
+from apps.products.search import search_products
+from apps.products.views import ProductList
+
+WORDS = (
+    "basmati rice atta wheat flour sugar salt turmeric chilli coriander cumin mustard oil ghee butter "
+    "milk curd paneer cheese bread biscuit cookies chocolate coffee tea green masala noodles pasta "
+    "ketchup jam honey almonds cashew raisins dates soap shampoo toothpaste detergent dishwash "
+    "tissue napkin juice mango orange apple banana tomato onion potato garlic ginger lentils chana"
+).split()
+BRANDS = "Amul Tata Nestle Britannia Haldiram Dabur Fortune Aashirvaad Patanjali MDH Everest Parle".split()
+QUERIES = ("choc", "chocolate cookies", "choclate", "amul butter", "P-0123", "basmati", "tumeric", "oil")
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure GET /api/products/?search= latency over a large catalogue. "
+        "All data is created inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=200_000, help="Catalogue size.")
+        parser.add_argument("--repeat", type=int, default=20, help="Requests per query.")
+        parser.add_argument("--explain", action="store_true", help="Print the plan of each search query.")
+
+    def handle(self, *args, **options):
+        size = options["products"]
+        rng = random.Random(42)
+        factory = APIRequestFactory(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+        view = ProductList.as_view()
+
+        with transaction.atomic():
+            user = CustomUser.objects.create(email="bench-product-search@example.com", role=CustomUser.ROLE_CASHIER)
+            categories = Category.objects.bulk_create([Category(name=f"Bench category {word}") for word in WORDS[:20]])
+            for start in range(0, size, 10_000):
+                Product.objects.bulk_create([
+                    Product(
+                        item_id=f"P-{i + 1:04d}",
+                        name=" ".join(rng.sample(WORDS, 3)).title() + f" {rng.choice((100, 250, 500, 1000))}g",
+                        manufacturer=rng.choice(BRANDS),
+                        category=rng.choice(categories),
+                        price=Decimal("10.00"),
+                    )
+                    for i in range(start, min(start + 10_000, size))
+                ])
+            with connection.cursor() as cursor:
+                # Autovacuum would merge fresh rows out of the GIN pending lists; VACUUM
+                # cannot run in a transaction, so flush them by hand
+                cursor.execute(
+                    "SELECT gin_clean_pending_list(indexrelid) FROM pg_index"
+                    " JOIN pg_class ON pg_class.oid = indexrelid JOIN pg_am ON pg_am.oid = pg_class.relam"
+                    " WHERE indrelid = %s::regclass AND amname = 'gin'",
+                    [Product._meta.db_table],
+                )
+                cursor.execute(f"ANALYZE {Product._meta.db_table}")
+
+            self.stdout.write(f"{size} products")
+            self.stdout.write(f"{'query':<20} {'results':>8} {'mean ms':>8} {'p95 ms':>7}  first hit")
+            for query in QUERIES:
+                timings = []
+                for _ in range(options["repeat"] + 1):
+                    request = factory.get("/api/products/", {"search": query})
+                    force_authenticate(request, user=user)
+                    started = time.perf_counter()
+                    response = view(request)
+                    response.render()
+                    timings.append((time.perf_counter() - started) * 1000)
+                timings = sorted(timings[1:])
+                first = response.data["results"][0]["name"] if response.data["results"] else "-"
+                p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                self.stdout.write(
+                    f"{query:<20} {response.data['count']:>8} {statistics.mean(timings):>8.1f} {p95:>7.1f}  {first}"
+                )
+                if options["explain"]:
+                    self.stdout.write(search_products(Product.objects.with_stock(), query)[:20].explain())
+
+            transaction.set_rollback(True)
@@ -0,0 +1,71 @@
+import statistics
+import time
+from decimal import Decimal
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.accounts.models import CustomUser
+from apps.products.models import Product
+from apps.products.scan import scan_cache
+from apps.products.views import ProductScanView
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure GET /api/products/scan/<code>/ latency, cold (empty scan cache) and warm. "
+        "The cache only keeps committed reads, so the bench products are committed and deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=1000, help="Products to scan.")
+        parser.add_argument("--repeat", type=int, default=5, help="Warm passes over every code.")
+
+    def handle(self, *args, **options):
+        size = options["products"]
+        factory = APIRequestFactory(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+        view = ProductScanView.as_view()
+
+        user = CustomUser.objects.create(email="bench-scan@example.com", role=CustomUser.ROLE_CASHIER)
+        products = Product.objects.bulk_create([
+            Product(item_id=f"SCAN-BENCH-{i:05d}", barcode=f"89000{i:08d}", name=f"Bench product {i}",
+                    quantity=100, price=Decimal("10.00"))
+            for i in range(size)
+        ])
+        try:
+            auth = f"Bearer {AccessToken.for_user(user)}"
+            codes = [p.barcode for p in products]
+
+            scan_cache.invalidate()
+            self.stdout.write(f"{size} codes")
+            self.stdout.write(f"{'run':>5} {'queries':>8} {'median ms':>10} {'p99 ms':>7}")
+            self._measure("cold", view, factory, auth, codes)
+            self._measure("warm", view, factory, auth, codes * options["repeat"])
+
+            started = time.perf_counter()
+            for code in codes:
+                scan_cache.lookup(code)
+            per_hit = (time.perf_counter() - started) * 1_000_000 / size
+            self.stdout.write(f"cache hit alone: {per_hit:.1f} µs")
+        finally:
+            Product.objects.filter(pk__in=[p.pk for p in products]).delete()
+            user.delete()
+            scan_cache.invalidate()
+
+    def _measure(self, label, view, factory, auth, codes):
+        timings = []
+        with CaptureQueriesContext(connection) as ctx:
+            for code in codes:
+                request = factory.get(f"/api/products/scan/{code}/", HTTP_AUTHORIZATION=auth)
+                started = time.perf_counter()
+                response = view(request, code=code)
+                response.render()
+                timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        self.stdout.write(
+            f"{label:>5} {len(ctx.captured_queries) / len(codes):>8.1f} "
+            f"{statistics.median(timings):>10.3f} {p99:>7.3f}"
+        )
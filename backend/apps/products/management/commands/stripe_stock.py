@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from apps.products.models import Product
+from apps.products.stock import restripe
+
+
+class Command(BaseCommand):
+    help = (
+        "Spread a hot product's stock over N stripes so concurrent sales don't "
+        "queue on one row. Use --stripes 0 to fold it back into a plain counter."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("item_ids", nargs="+", help="Product item ids, e.g. P-0001")
+        parser.add_argument("--stripes", type=int, default=8, help="Number of stripes (0 disables striping).")
+
+    def handle(self, *args, **options):
+        stripes = options["stripes"]
+        if stripes < 0:
+            raise CommandError("--stripes must be 0 or more")
+
+        for item_id in options["item_ids"]:
+            product = Product.objects.filter(item_id=item_id).first()
+            if product is None:
+                raise CommandError(f"Product {item_id} not found")
+            with transaction.atomic():
+                quantity = restripe(product, stripes)
+            self.stdout.write(self.style.SUCCESS(f"{item_id}: {quantity} units over {stripes} stripe(s)"))
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-17 07:03
+
+import datetime
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0029_product_image_alter_stockentry_created_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='stripe_count',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='stockentry',
+            name='created_at',
+            field=models.DateTimeField(default=datetime.datetime(2026, 10, 17, 7, 3, 16, 325877, tzinfo=datetime.timezone.utc)),
+        ),
+        migrations.CreateModel(
+            name='StockStripe',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.PositiveSmallIntegerField()),
+                ('quantity', models.IntegerField(default=0)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_stripes', to='products.product')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('product', 'index'), name='unique_stock_stripe_index')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-17 07:04
+
+import datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0030_product_stripe_count_alter_stockentry_created_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='tax_rate',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True),
+        ),
+        migrations.AlterField(
+            model_name='stockentry',
+            name='created_at',
+            field=models.DateTimeField(default=datetime.datetime(2026, 10, 17, 7, 4, 18, 36974, tzinfo=datetime.timezone.utc)),
+        ),
+    ]
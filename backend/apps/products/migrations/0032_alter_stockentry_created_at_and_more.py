@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-17 07:15
+
+import datetime
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False  # CONCURRENTLY cannot run inside a transaction
+
+    dependencies = [
+        ('products', '0031_category_tax_rate_alter_stockentry_created_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='stockentry',
+            name='created_at',
+            field=models.DateTimeField(default=datetime.datetime(2026, 10, 17, 7, 15, 15, 121924, tzinfo=datetime.timezone.utc)),
+        ),
+        AddIndexConcurrently(
+            model_name='stockentry',
+            index=models.Index(fields=['-created_at', '-id'], name='stockentry_created_id_idx'),
+        ),
+    ]
@@ -1,8 +1,11 @@
-from django.db import models
+from django.db import models, transaction
 from decimal import Decimal
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db.models.functions import Coalesce, Upper
 from django.utils import timezone
-from django.db.models import Max
 from apps.accounts.models import CustomUser
+from apps.sequences.allocator import document_number
 # Create your models here.
 
 # apps/products/models.py
@@ -10,6 +13,8 @@ from apps.accounts.models import CustomUser
 class Category(models.Model):
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True)
+    # Percentage; empty means settings.BILLING_DEFAULT_TAX_RATE
+    tax_rate = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -20,30 +25,96 @@ class Category(models.Model):
         return self.name
 
 
+class ProductQuerySet(models.QuerySet):
+    def with_stock(self):
+        """
+        Annotate `stock_quantity`: the sellable quantity, i.e. `quantity`
+        plus the stock held in stripes for striped products.
+        """
+        stripes = (
+            StockStripe.objects.filter(product=models.OuterRef("pk"))
+            .values("product")
+            .annotate(total=models.Sum("quantity"))
+            .values("total")
+        )
+        return self.annotate(
+            stock_quantity=models.F("quantity") + Coalesce(models.Subquery(stripes), 0)
+        )
+
+
 class Product(models.Model):
     item_id = models.CharField(max_length=50, unique=True, editable=False)
     name = models.CharField(max_length=200)
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True)
     supplier = models.ForeignKey("suppliers.Supplier", on_delete=models.SET_NULL, null=True, blank=True)
     manufacturer = models.CharField(max_length=100, blank=True)
+    # Printed barcode (EAN/UPC), for scanning; products without one scan by item_id
+    barcode = models.CharField(max_length=64, blank=True, default="")
     quantity = models.IntegerField(default=0)
     cost_price = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     price = models.DecimalField(max_digits=10, decimal_places=2)
     image = models.ImageField(upload_to='products/%Y/%m/%d/', blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Hot SKUs keep their stock in this many StockStripe rows (0 = plain counter)
+    stripe_count = models.PositiveSmallIntegerField(default=0)
+    # Full-text document for ?search= (see search.py), kept by the database
+    search_document = models.GeneratedField(
+        expression=SearchVector("name", "manufacturer", config="simple"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = ProductQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # ?search= (see search.py): full-text, plus trigrams for item codes and typos
+            GinIndex(fields=["search_document"], name="product_search_idx"),
+            GinIndex(OpClass(Upper("item_id"), name="gin_trgm_ops"), name="product_item_id_trgm_idx"),
+            GinIndex(fields=["name"], opclasses=["gin_trgm_ops"], name="product_name_trgm_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["barcode"], condition=~models.Q(barcode=""), name="product_barcode_unique"),
+        ]
+
+    @property
+    def available_quantity(self):
+        """Sellable quantity, including stock held in stripes."""
+        if hasattr(self, "stock_quantity"):
+            return self.stock_quantity
+        if not self.stripe_count:
+            return self.quantity
+        striped = self.stock_stripes.aggregate(total=models.Sum("quantity"))["total"] or 0
+        return self.quantity + striped
 
     def save(self, *args, **kwargs):
         # Only generate a new ID if it doesn’t exist already
         if not self.item_id:
-            last_item = Product.objects.aggregate(max_id=Max("id"))["max_id"] or 0
-            new_id = last_item + 1
-            self.item_id = f"P-{new_id:04d}"  # Example: P-0001, P-0002, etc.
+            self.item_id = document_number("P", "product", daily=False, width=4)  # Example: P-0001, P-0002, etc.
         super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.item_id} - {self.name}"
 
 
+class StockStripe(models.Model):
+    """
+    One slice of a striped product's stock. Concurrent sales of the same hot
+    product update different stripes instead of queueing on one Product row.
+    """
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="stock_stripes")
+    index = models.PositiveSmallIntegerField()
+    quantity = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["product", "index"], name="unique_stock_stripe_index"),
+        ]
+
+    def __str__(self):
+        return f"{self.product.name} stripe {self.index}: {self.quantity}"
+
+
 class StockEntry(models.Model):
     """
     Represents a manual stock addition (e.g., new purchase or restock)
@@ -54,12 +125,23 @@ class StockEntry(models.Model):
     added_by = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True)
     created_at = models.DateTimeField(default=timezone.now())
 
+    class Meta:
+        indexes = [
+            # Newest-first keyset pagination
+            models.Index(fields=["-created_at", "-id"], name="stockentry_created_id_idx"),
+        ]
+
     def save(self, *args, **kwargs):
-        # When a stock entry is created, update the product quantity
-        if not self.pk:  # only when creating (not updating)
-            self.product.quantity += self.quantity_added
-            self.product.save()
-        super().save(*args, **kwargs)
+        # Stock moves once, when the entry is created; editing an existing
+        # entry (e.g. its note) saves it without touching the product's stock
+        if self.pk:
+            return super().save(*args, **kwargs)
+
+        from .stock import increment_stock
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            increment_stock({self.product_id: self.quantity_added})
+        self.product.refresh_from_db(fields=["quantity"])
 
     def __str__(self):
         return f"{self.product.name} +{self.quantity_added} units"
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""
+Till scan lookups.
+
+`scan_cache` resolves a scanned code (an item_id or a barcode) to a
+ScanRecord: the product's price and sellable stock, nothing else. It is
+an in-process LRU of SCAN_CACHE_SIZE codes. Entries are dropped when this
+worker commits a change to the product or its stock (Product saves and
+the `stock_changed` signal, which covers stock entries, bills, returns
+and purchase orders) and expire after SCAN_CACHE_TTL seconds, which
+bounds how stale other workers can be.
+"""
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from backend_api.money import format_paise, to_paise
+from .models import Product
+from .stock import stock_changed
+
+# price in paise; stock includes units held in stripes
+ScanRecord = namedtuple("ScanRecord", "product_id item_id barcode name price stock")
+
+
+def load_record(code):
+    """ScanRecord for the product whose item_id or barcode is `code`, or None."""
+    # Item ids are generated in upper case; barcodes are matched as printed
+    row = (
+        Product.objects.with_stock()
+        .filter(Q(item_id=code.upper()) | Q(barcode=code))
+        .values_list("id", "item_id", "barcode", "name", "price", "stock_quantity")
+        .first()
+    )
+    if row is None:
+        return None
+    product_id, item_id, barcode, name, price, stock = row
+    return ScanRecord(product_id, item_id, barcode, name, to_paise(price), stock)
+
+
+def record_data(record):
+    """JSON-ready ScanRecord; price is a decimal string like the rest of the API."""
+    return {
+        "id": record.product_id,
+        "item_id": record.item_id,
+        "barcode": record.barcode,
+        "name": record.name,
+        "price": format_paise(record.price),
+        "stock": record.stock,
+    }
+
+
+class ScanCache:
+    def __init__(self, size, ttl):
+        self.size = size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # code -> (ScanRecord, loaded at), least recently used first
+        self._codes = {}  # product id -> codes cached for it
+        self._generation = 0  # bumped by every invalidation
+        self._lock = threading.Lock()
+
+    def lookup(self, code):
+        """ScanRecord for `code`, or None when no product has it (misses are not cached)."""
+        now = time.monotonic()
+        with self._lock:
+            hit = self._entries.get(code)
+            if hit is not None and now - hit[1] <= self.ttl:
+                self._entries.move_to_end(code)
+                return hit[0]
+            generation = self._generation
+
+        record = load_record(code)
+        if transaction.get_connection().in_atomic_block:
+            return record  # may include this transaction's uncommitted changes
+        with self._lock:
+            # An invalidation while we read may have committed after our snapshot
+            if generation == self._generation:
+                self._discard(code)
+                if record is not None:
+                    self._store(code, record, now)
+        return record
+
+    def invalidate(self, product_ids=None):
+        with self._lock:
+            self._generation += 1
+            if product_ids is None:
+                self._entries.clear()
+                self._codes.clear()
+                return
+            for product_id in product_ids:
+                for code in self._codes.pop(product_id, ()):
+                    del self._entries[code]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _store(self, code, record, now):
+        self._entries[code] = (record, now)
+        self._codes.setdefault(record.product_id, set()).add(code)
+        while len(self._entries) > self.size:
+            oldest, (old_record, _) = self._entries.popitem(last=False)
+            self._forget(old_record.product_id, oldest)
+
+    def _discard(self, code):
+        hit = self._entries.pop(code, None)
+        if hit is not None:
+            self._forget(hit[0].product_id, code)
+
+    def _forget(self, product_id, code):
+        codes = self._codes.get(product_id)
+        if codes is not None:
+            codes.discard(code)
+            if not codes:
+                del self._codes[product_id]
+
+
+scan_cache = ScanCache(size=settings.SCAN_CACHE_SIZE, ttl=settings.SCAN_CACHE_TTL)
+
+
+@receiver([post_save, post_delete], sender=Product)
+def _drop_scanned_product(sender, instance, **kwargs):
+    product_id = instance.pk
+    transaction.on_commit(lambda: scan_cache.invalidate([product_id]))
+
+
+@receiver(stock_changed)
+def _drop_scanned_stock(sender, product_ids, **kwargs):
+    product_ids = list(product_ids)
+    transaction.on_commit(lambda: scan_cache.invalidate(product_ids))
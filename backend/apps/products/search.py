@@ -0,0 +1,112 @@
+"""
+Product search for ?search= on PostgreSQL.
+
+Every branch of the match is served by an index (see Product.Meta):
+
+- name and manufacturer: full-text query over the stored
+  `search_document`, every word matched as a prefix, in any order
+- item_id: case-insensitive substring (trigram index on UPPER(item_id),
+  which is what `icontains` compiles to)
+- category: names matched in the small Category table first, so the ids
+  reach the planner as a literal list (a subquery inside the OR would
+  force a sequential scan of products)
+
+When nothing matches, the text is taken to be misspelt and product names
+are matched by pg_trgm word similarity instead ("choclate"). The `%>`
+operator is what the trigram index serves; it compares against
+pg_trgm.word_similarity_threshold, which is set to
+PRODUCT_SEARCH_SIMILARITY for that one query only (pg_trgm's default of
+0.6 misses one-letter typos in short words).
+
+The PRODUCT_SEARCH_CANDIDATES best matches (plus an exact item_id or
+barcode) are kept: each candidate query ranks every row the indexes
+return and keeps the top ones, so a broad term like "oil" can never crowd
+out a better match. The price is that a query reads every matching row:
+broad terms and typos cost more than narrow ones. Results are ordered by relevance: the exact code
+first, then full-text rank (or name similarity for the typo fallback).
+Other databases fall back to DRF's SearchFilter.
+"""
+import re
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db import connections, transaction
+from django.db.models import Case, F, FloatField, Q, Value, When
+from rest_framework import filters
+from .models import Category
+
+MAX_QUERY_LENGTH = 100
+WORD_RE = re.compile(r"\w+")
+
+
+def prefix_query(text):
+    """Full-text query matching every word of `text` as a prefix, or None."""
+    words = WORD_RE.findall(text.lower())
+    if not words:
+        return None
+    return SearchQuery(" & ".join(f"{word}:*" for word in words), search_type="raw", config="simple")
+
+
+def best_ids(candidates, relevance, limit):
+    """Ids of the `limit` most relevant rows of `candidates`, best first."""
+    return list(
+        candidates.annotate(relevance=relevance)
+        .order_by("-relevance", "name", "pk")
+        .values_list("pk", flat=True)[:limit]
+    )
+
+
+def similar_ids(candidates, text, limit):
+    """Ids of the `limit` names most similar to `text`, through the trigram index."""
+    with transaction.atomic(using=candidates.db):
+        with connections[candidates.db].cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+                [str(settings.PRODUCT_SEARCH_SIMILARITY)],
+            )
+        ids = best_ids(candidates.filter(name__trigram_word_similar=text), TrigramWordSimilarity(text, "name"), limit)
+        # Nothing was written; rolling back undoes the SET LOCAL even inside an outer transaction
+        transaction.set_rollback(True, using=candidates.db)
+    return ids
+
+
+def search_products(queryset, text):
+    text = text.strip()[:MAX_QUERY_LENGTH]
+    match = Q(item_id__icontains=text)
+    category_ids = list(Category.objects.filter(name__icontains=text).values_list("pk", flat=True))
+    if category_ids:
+        match |= Q(category_id__in=category_ids)
+    relevance = Value(0.0, output_field=FloatField())
+    query = prefix_query(text)
+    if query is not None:
+        match |= Q(search_document=query)
+        relevance = SearchRank(F("search_document"), query)
+
+    # Item ids are generated in upper case, so the unique indexes find an exact code
+    exact = Q(item_id=text.upper()) | Q(barcode=text)
+    candidates = queryset.order_by()
+    limit = settings.PRODUCT_SEARCH_CANDIDATES
+    ids = list(candidates.filter(exact).values_list("pk", flat=True))
+    ids += best_ids(candidates.filter(match), relevance, limit)
+    if not ids:
+        ids = similar_ids(candidates, text, limit)
+        relevance = TrigramWordSimilarity(text, "name")
+
+    return queryset.filter(pk__in=ids).annotate(
+        search_rank=Case(
+            When(exact, then=Value(2.0)),
+            default=relevance,
+            output_field=FloatField(),
+        )
+    ).order_by("-search_rank", "name", "id")
+
+
+class ProductSearchFilter(filters.SearchFilter):
+    """`?search=` backed by the full-text and trigram indexes on PostgreSQL."""
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, "").strip()
+        if not text:
+            return queryset
+        if connections[queryset.db].vendor != "postgresql":
+            return super().filter_queryset(request, queryset, view)
+        return search_products(queryset, text)
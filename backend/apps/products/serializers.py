@@ -1,5 +1,7 @@
 from rest_framework import serializers
+from django.db import transaction
 from . models import Product,Category
+from .stock import set_stock
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -20,6 +22,7 @@ class ProductSerializer(serializers.ModelSerializer):
             "category",
             "category_detail",
             "manufacturer",
+            "barcode",
             "supplier",
             "image",
             "quantity",
@@ -28,6 +31,21 @@ class ProductSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["item_id", "created_at"]
         depth = 1
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Striped products hold most of their stock outside the quantity column
+        data["quantity"] = instance.available_quantity
+        return data
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        quantity = validated_data.pop("quantity", None) if instance.stripe_count else None
+        instance = super().update(instance, validated_data)
+        if quantity is not None:
+            set_stock(instance, quantity)
+        instance.__dict__.pop("stock_quantity", None)  # annotation is stale now
+        return instance
 # apps/stocks/serializers.py
 from rest_framework import serializers
 from .models import StockEntry
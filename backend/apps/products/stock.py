@@ -0,0 +1,181 @@
+import random
+from django.db.models import Case, F, IntegerField, Subquery, Sum, Value, When
+from django.dispatch import Signal
+from .models import Product, StockStripe
+
+# Sent with `product_ids` whenever the functions below change stock, inside the caller's transaction
+stock_changed = Signal()
+
+
+class InsufficientStock(Exception):
+    """A product does not have enough stock for the requested sale."""
+
+    def __init__(self, product_ids):
+        self.product_ids = sorted(product_ids)
+        super().__init__(f"Insufficient stock for product(s): {', '.join(map(str, self.product_ids))}")
+
+
+def _per_product(quantities):
+    """Build a CASE expression mapping each product id to its quantity."""
+    return Case(
+        *[When(id=product_id, then=Value(int(qty))) for product_id, qty in quantities.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def lock_products(product_ids):
+    """
+    Take row locks on the given products in primary-key order.
+    Every writer locks in the same order, so concurrent checkouts queue
+    instead of deadlocking. NO KEY UPDATE locks don't block other
+    transactions inserting bill items that reference these products.
+    """
+    return list(
+        Product.objects.select_for_update(no_key=True)
+        .filter(id__in=product_ids)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+
+
+def striped_products(product_ids):
+    """Map product id -> stripe count for the striped products among `product_ids`."""
+    return dict(
+        Product.objects.filter(id__in=product_ids, stripe_count__gt=0)
+        .values_list("id", "stripe_count")
+    )
+
+
+def stripe_totals(product_ids=None):
+    """Map product id -> stock held in stripes (only products that have stripes)."""
+    stripes = StockStripe.objects.all()
+    if product_ids is not None:
+        stripes = stripes.filter(product_id__in=product_ids)
+    return dict(stripes.values("product").annotate(total=Sum("quantity")).values_list("product", "total"))
+
+
+def decrement_stock(quantities):
+    """
+    Subtract stock for many products. `quantities` maps product id -> units sold.
+    Must be called inside a transaction.
+
+    Plain products are updated with a single UPDATE. Striped products take
+    the units from one stripe that can cover them, so concurrent sales of a
+    hot product rarely wait on each other. Overselling any product raises
+    InsufficientStock; the caller's transaction must then be rolled back.
+    """
+    quantities = {pid: qty for pid, qty in quantities.items() if qty}
+    if not quantities:
+        return
+    striped = striped_products(quantities.keys())
+    plain = {pid: qty for pid, qty in quantities.items() if pid not in striped}
+
+    if plain:
+        lock_products(plain.keys())
+        short = list(
+            Product.objects.filter(id__in=plain.keys(), quantity__lt=_per_product(plain))
+            .values_list("id", flat=True)
+        )
+        if short:
+            raise InsufficientStock(short)
+        Product.objects.filter(id__in=plain.keys()).update(quantity=F("quantity") - _per_product(plain))
+
+    short = [pid for pid in sorted(striped) if not _take_from_stripes(pid, int(quantities[pid]))]
+    if short:
+        raise InsufficientStock(short)
+    stock_changed.send(sender=Product, product_ids=list(quantities))
+
+
+def _take_from_stripes(product_id, qty):
+    # Fast path: any stripe nobody else holds that covers the whole sale
+    candidate = (
+        StockStripe.objects.select_for_update(skip_locked=True)
+        .filter(product_id=product_id, quantity__gte=qty)
+        .order_by("?")
+        .values("id")[:1]
+    )
+    if StockStripe.objects.filter(id__in=Subquery(candidate), quantity__gte=qty).update(
+        quantity=F("quantity") - qty
+    ):
+        return True
+
+    # Slow path: lock the product and all its stripes (in order) and drain across them
+    lock_products([product_id])
+    stripes = list(
+        StockStripe.objects.select_for_update().filter(product_id=product_id).order_by("index")
+    )
+    product = Product.objects.only("quantity").get(pk=product_id)
+    if product.quantity + sum(stripe.quantity for stripe in stripes) < qty:
+        return False
+
+    remaining = qty
+    for stripe in stripes:
+        taken = min(max(stripe.quantity, 0), remaining)
+        stripe.quantity -= taken
+        remaining -= taken
+    StockStripe.objects.bulk_update(stripes, ["quantity"])
+    if remaining:
+        Product.objects.filter(pk=product_id).update(quantity=F("quantity") - remaining)
+    return True
+
+
+def increment_stock(quantities):
+    """
+    Add stock for many products. `quantities` maps product id -> units added.
+    Must be called inside a transaction. Striped products receive the units
+    on a random stripe.
+    """
+    quantities = {pid: qty for pid, qty in quantities.items() if qty}
+    if not quantities:
+        return
+    striped = striped_products(quantities.keys())
+    plain = {pid: qty for pid, qty in quantities.items() if pid not in striped}
+
+    if plain:
+        lock_products(plain.keys())
+        Product.objects.filter(id__in=plain.keys()).update(
+            quantity=F("quantity") + _per_product(plain)
+        )
+    for pid, stripe_count in sorted(striped.items()):
+        StockStripe.objects.filter(product_id=pid, index=random.randrange(stripe_count)).update(
+            quantity=F("quantity") + int(quantities[pid])
+        )
+    stock_changed.send(sender=Product, product_ids=list(quantities))
+
+
+def set_stock(product, quantity, stripe_count=None):
+    """
+    Set a product's total stock, spreading it evenly over `stripe_count`
+    stripes (default: its current count; 0 keeps it all on the product row).
+    Must be called inside a transaction.
+    """
+    if stripe_count is None:
+        stripe_count = product.stripe_count
+    lock_products([product.pk])
+    StockStripe.objects.filter(product=product).delete()
+
+    share, extra = divmod(max(int(quantity), 0), stripe_count) if stripe_count else (0, 0)
+    StockStripe.objects.bulk_create([
+        StockStripe(product=product, index=index, quantity=share + (1 if index < extra else 0))
+        for index in range(stripe_count)
+    ])
+    product.quantity = quantity if not stripe_count else 0
+    product.stripe_count = stripe_count
+    Product.objects.filter(pk=product.pk).update(quantity=product.quantity, stripe_count=stripe_count)
+    stock_changed.send(sender=Product, product_ids=[product.pk])
+
+
+def restripe(product, stripe_count):
+    """
+    Move a product's whole stock onto `stripe_count` stripes (0 folds it back
+    onto the product row). Returns the quantity moved. Must be called inside a transaction.
+    """
+    lock_products([product.pk])
+    stripes = StockStripe.objects.select_for_update().filter(product=product).order_by("index")
+    quantity = (
+        Product.objects.values_list("quantity", flat=True).get(pk=product.pk)
+        + sum(stripe.quantity for stripe in stripes)
+    )
+    set_stock(product, quantity, stripe_count=stripe_count)
+    return quantity
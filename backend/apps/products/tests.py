@@ -1,3 +1,138 @@
-from django.test import TestCase
+import pytest
+from django.db import transaction
+from apps.products.models import Product, StockEntry, StockStripe
+from apps.products.stock import InsufficientStock, decrement_stock, increment_stock, restripe, set_stock
 
-# Create your tests here.
+
+def stock_of(product):
+    return Product.objects.with_stock().get(pk=product.pk).stock_quantity
+
+
+@pytest.fixture
+def striped(products):
+    product = products[0]
+    with transaction.atomic():
+        set_stock(product, 10, stripe_count=4)
+    return product
+
+
+@pytest.mark.django_db
+def test_set_stock_spreads_quantity_over_stripes(striped):
+    assert sorted(StockStripe.objects.filter(product=striped).values_list("quantity", flat=True)) == [2, 2, 3, 3]
+    assert Product.objects.get(pk=striped.pk).quantity == 0
+    assert stock_of(striped) == 10
+
+
+@pytest.mark.django_db
+def test_striped_sale_drains_across_stripes_when_no_single_stripe_covers_it(striped):
+    with transaction.atomic():
+        decrement_stock({striped.pk: 3})
+        decrement_stock({striped.pk: 6})
+    assert stock_of(striped) == 1
+    assert all(q >= 0 for q in StockStripe.objects.filter(product=striped).values_list("quantity", flat=True))
+
+
+@pytest.mark.django_db
+def test_striped_oversell_raises_and_leaves_stock(striped, products):
+    with pytest.raises(InsufficientStock) as excinfo:
+        with transaction.atomic():
+            decrement_stock({striped.pk: 11, products[1].pk: 1})
+    assert excinfo.value.product_ids == [striped.pk]
+    assert stock_of(striped) == 10
+    assert stock_of(products[1]) == 100
+
+
+@pytest.mark.django_db
+def test_plain_oversell_raises_and_leaves_stock(products):
+    with pytest.raises(InsufficientStock) as excinfo:
+        with transaction.atomic():
+            decrement_stock({products[0].pk: 150, products[1].pk: 5})
+    assert excinfo.value.product_ids == [products[0].pk]
+    assert [stock_of(p) for p in products[:2]] == [100, 100]
+
+    with transaction.atomic():
+        decrement_stock({products[0].pk: 100, products[1].pk: 5})
+    assert [stock_of(p) for p in products[:2]] == [0, 95]
+
+
+@pytest.mark.django_db
+def test_increment_and_restripe_keep_the_total(striped, products):
+    with transaction.atomic():
+        increment_stock({striped.pk: 5, products[1].pk: 5})
+        assert restripe(striped, 0) == 15
+    assert stock_of(striped) == 15
+    assert Product.objects.get(pk=striped.pk).quantity == 15
+    assert not StockStripe.objects.filter(product=striped).exists()
+    assert stock_of(products[1]) == 105
+
+
+@pytest.mark.django_db
+def test_bill_for_more_than_striped_stock_is_rejected(cashier_client, customer, striped):
+    response = cashier_client.post(
+        "/api/billings/",
+        {"customer": customer.pk, "discount": "0", "items": [{"product": striped.pk, "quantity": 11, "price": "0"}]},
+        format="json",
+    )
+    assert response.status_code == 400
+    assert stock_of(striped) == 10
+
+
+@pytest.mark.django_db
+def test_bill_for_more_than_plain_stock_is_rejected(cashier_client, customer, products):
+    response = cashier_client.post(
+        "/api/billings/",
+        {"customer": customer.pk, "discount": "0", "items": [{"product": products[0].pk, "quantity": 101, "price": "0"}]},
+        format="json",
+    )
+    assert response.status_code == 400
+    assert stock_of(products[0]) == 100
+
+
+@pytest.mark.django_db
+def test_stock_entry_adds_stock_only_when_created(products):
+    entry = StockEntry.objects.create(product=products[0], quantity_added=5)
+    entry.note = "Invoice 42"
+    entry.save()
+    assert stock_of(products[0]) == 105
+
+
+def search(client, text):
+    response = client.get("/api/products/", {"search": text})
+    assert response.status_code == 200
+    return [row["name"] for row in response.data["results"]]
+
+
+@pytest.fixture
+def catalogue(db):
+    names = ["Dark Chocolate 100g", "Chocolate Cookies", "Choco Chip Choco Cookies", "Basmati Rice 1kg", "Vanilla Cake"]
+    return {name: Product.objects.create(name=name, price="10.00", manufacturer="Amul") for name in names}
+
+
+@pytest.mark.django_db
+def test_search_puts_an_exact_item_id_or_barcode_first(cashier_client, catalogue):
+    rice = catalogue["Basmati Rice 1kg"]
+    Product.objects.filter(pk=rice.pk).update(barcode="8901234567890")
+
+    assert search(cashier_client, rice.item_id.lower())[0] == rice.name
+    assert search(cashier_client, "8901234567890") == [rice.name]
+
+
+@pytest.mark.django_db
+def test_search_matches_every_word_as_a_prefix(cashier_client, catalogue):
+    assert search(cashier_client, "choc cook") == ["Choco Chip Choco Cookies", "Chocolate Cookies"]
+    assert search(cashier_client, "amul rice") == ["Basmati Rice 1kg"]
+
+
+@pytest.mark.django_db
+def test_search_ranks_all_matches_before_keeping_the_best(cashier_client, catalogue, settings):
+    settings.PRODUCT_SEARCH_CANDIDATES = 1
+    # The best match was created last, so an unordered LIMIT would not find it first
+    assert search(cashier_client, "choco") == ["Choco Chip Choco Cookies"]
+
+
+@pytest.mark.django_db
+def test_search_falls_back_to_similar_names_for_typos(cashier_client, catalogue):
+    results = search(cashier_client, "choclate")
+
+    assert set(results) == {"Dark Chocolate 100g", "Chocolate Cookies"}
+    assert search(cashier_client, "xylophone") == []
@@ -4,6 +4,7 @@ urlpatterns = [
     path('products/',views.ProductList.as_view()),
     path('categories/',views.CategoryList.as_view()),
     path('products/<int:pk>/',views.ProductDetail.as_view()),
+    path("products/scan/<str:code>/", views.ProductScanView.as_view(), name="product-scan"),
     path("products/low-stock/", views.LowStockProductsView.as_view(), name="low-stock-products"),
     path("stocks/", views.StockEntryListCreateView.as_view(), name="stock-entry-list"),
     path("stocks/report/", views.StockReportView.as_view(), name="stock-report"),
@@ -1,11 +1,17 @@
 from rest_framework import generics, permissions, filters
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
 from .models import Product,StockEntry,Category
+from .stock import stripe_totals
 from .serializers import ProductSerializer,StockEntrySerializer,CategorySerializer
-from django.db.models import Sum, F
 from rest_framework.parsers import MultiPartParser, FormParser
 from .permissions import IsManagerOrReadOnly
+from .scan import record_data, scan_cache
+from .search import ProductSearchFilter
+from backend_api.money import format_paise, to_paise
+from backend_api.pagination import KeysetPagination
 
 
 class CategoryList(generics.ListCreateAPIView):
@@ -22,16 +28,17 @@ class ProductList(generics.ListCreateAPIView):
     GET  /api/products/        -> list all (search/order supported)
     POST /api/products/        -> add new product (manager only)
     """
-    queryset = Product.objects.all()
+    # ✅ category and supplier are nested in every row (depth=1)
+    queryset = Product.objects.with_stock().select_related("category", "supplier")
     serializer_class = ProductSerializer
     permission_classes = [permissions.IsAuthenticated, IsManagerOrReadOnly]
     parser_classes = [MultiPartParser, FormParser]
 
 
-    # enable search and ordering
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    # enable search and ordering (✅ ?search= is ranked; see search.py)
+    filter_backends = [ProductSearchFilter, filters.OrderingFilter]
     search_fields = ["name", "item_id", "category__name", "manufacturer"]
-    ordering_fields = ["price", "quantity", "created_at"]
+    ordering_fields = ["price", "quantity", "stock_quantity", "created_at"]
 
 
 class ProductDetail(generics.RetrieveUpdateDestroyAPIView):
@@ -40,11 +47,27 @@ class ProductDetail(generics.RetrieveUpdateDestroyAPIView):
     PUT    /api/products/<id>/ -> update product (manager only)
     DELETE /api/products/<id>/ -> delete product (manager only)
     """
-    queryset = Product.objects.all()
+    queryset = Product.objects.with_stock()
     serializer_class = ProductSerializer
     permission_classes = [permissions.IsAuthenticated, IsManagerOrReadOnly]
 
 
+class ProductScanView(APIView):
+    """
+    GET /api/products/scan/<code>/ -> price and stock for a scanned item_id or barcode
+    Served from the in-process scan cache (see scan.py); 404 for unknown codes.
+    """
+    # ✅ The token's signature and expiry are checked without loading the user row
+    authentication_classes = [JWTStatelessUserAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, code):
+        record = scan_cache.lookup(code)
+        if record is None:
+            raise NotFound("No product with this item ID or barcode.")
+        return Response(record_data(record))
+
+
 class LowStockProductsView(APIView):
     """
     GET /api/products/low-stock/?threshold=5
@@ -59,7 +82,7 @@ class LowStockProductsView(APIView):
         except ValueError:
             threshold = 20
 
-        products = Product.objects.filter(quantity__lte=threshold).order_by("quantity")
+        products = Product.objects.with_stock().filter(stock_quantity__lte=threshold).order_by("stock_quantity")
         serializer = ProductSerializer(products, many=True)
         return Response(serializer.data)
 
@@ -69,9 +92,10 @@ class StockEntryListCreateView(generics.ListCreateAPIView):
     GET  /api/stocks/      -> list all stock entries
     POST /api/stocks/      -> add stock (manager only)
     """
-    queryset = StockEntry.objects.all().select_related("product", "added_by").order_by("-created_at")
+    queryset = StockEntry.objects.all().select_related("product", "added_by").order_by("-created_at", "-id")
     serializer_class = StockEntrySerializer
     permission_classes = [permissions.AllowAny, IsManagerOrReadOnly]
+    pagination_class = KeysetPagination
 
 
 class StockReportView(APIView):
@@ -82,22 +106,31 @@ class StockReportView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        products = Product.objects.all().annotate(total_value=F("quantity") * F("price"))
+        products = list(Product.objects.select_related("category"))
+        # Stock held in stripes of hot products, added on top of the quantity column
+        stripe_quantity = stripe_totals()
+
+        # ✅ Values in integer paise, rendered as decimal strings
+        rows = []
+        for p in products:
+            quantity = p.quantity + stripe_quantity.get(p.id, 0)
+            price = to_paise(p.price)
+            rows.append((p, quantity, price, quantity * price))
 
         data = {
-            "total_products": products.count(),
-            "total_quantity": products.aggregate(Sum("quantity"))["quantity__sum"] or 0,
-            "total_value": products.aggregate(Sum("total_value"))["total_value__sum"] or 0,
+            "total_products": len(products),
+            "total_quantity": sum(quantity for _, quantity, _, _ in rows),
+            "total_value": format_paise(sum(value for *_, value in rows)),
             "products": [
                 {
                     "item_id": p.item_id,
                     "name": p.name,
-                    "category": p.category,
-                    "quantity": p.quantity,
-                    "price": float(p.price),
-                    "total_value": float(p.quantity * p.price),
+                    "category": p.category.name if p.category else None,
+                    "quantity": quantity,
+                    "price": format_paise(price),
+                    "total_value": format_paise(value),
                 }
-                for p in products
+                for p, quantity, price, value in rows
             ],
         }
         return Response(data)
\ No newline at end of file
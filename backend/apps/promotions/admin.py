@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import Promotion
+
+
+@admin.register(Promotion)
+class PromotionAdmin(admin.ModelAdmin):
+    list_display = ("name", "kind", "product", "category", "tier", "percent", "is_active", "starts_at", "ends_at")
+    list_filter = ("kind", "tier", "is_active")
+    search_fields = ("name",)
+    raw_id_fields = ("product",)
@@ -0,0 +1,165 @@
+"""
+Compiled promotion rules.
+
+Active promotions are compiled into buckets keyed by (target, target id,
+tier): ("product", id, tier), ("category", id, tier) and ("cart", None, tier),
+where tier "" means any customer. Pricing a line looks at no more than six
+buckets, so the cost depends on the rules that can apply to that line, not on
+how many rules exist. Saving or deleting a promotion moves only that rule;
+the whole index is recompiled after PROMOTION_INDEX_TTL seconds so changes
+made by other workers are picked up.
+
+Prices and discounts are integer paise; percentages are compiled to basis
+points.
+"""
+import threading
+import time
+from collections import namedtuple
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from apps.customers.models import CustomerLoyalty
+from backend_api.money import BASIS_POINTS_PER_UNIT, div_round, to_basis_points
+from .models import Promotion
+
+Rule = namedtuple("Rule", "id kind percent buy get starts_at ends_at")
+
+
+def compile_rule(promotion):
+    """Return (bucket key, Rule) for a promotion."""
+    if promotion.product_id:
+        target = ("product", promotion.product_id)
+    elif promotion.category_id:
+        target = ("category", promotion.category_id)
+    else:
+        target = ("cart", None)
+    rule = Rule(
+        promotion.pk, promotion.kind, to_basis_points(promotion.percent),
+        promotion.buy_quantity, promotion.get_quantity, promotion.starts_at, promotion.ends_at,
+    )
+    return (*target, promotion.tier or ""), rule
+
+
+def rule_discount(rule, unit_price, quantity):
+    """Discount in paise a rule gives on one cart line (`unit_price` in paise)."""
+    if rule.kind == Promotion.BUY_X_GET_Y:
+        return quantity // (rule.buy + rule.get) * rule.get * unit_price
+    return div_round(unit_price * quantity * rule.percent, BASIS_POINTS_PER_UNIT)
+
+
+def is_live(rule, now):
+    return (rule.starts_at is None or rule.starts_at <= now) and (rule.ends_at is None or now < rule.ends_at)
+
+
+def customer_tier(customer):
+    """
+    Loyalty tier of `customer` (no query if `loyalty` was select_related).
+
+    Walk-in customers and customers without a loyalty row yet are bronze,
+    the tier every new loyalty row starts at.
+    """
+    if customer is None:
+        return "bronze"
+    try:
+        return customer.loyalty.tier
+    except CustomerLoyalty.DoesNotExist:
+        return "bronze"
+
+
+class PromotionIndex:
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._buckets = None  # bucket key -> {rule id: Rule}
+        self._keys = {}  # rule id -> bucket key
+        self._loaded_at = 0
+        self._lock = threading.Lock()
+
+    def _current(self):
+        buckets = self._buckets
+        now = time.monotonic()
+        if buckets is None or now - self._loaded_at > self.ttl:
+            buckets, keys = {}, {}
+            live = Promotion.objects.filter(is_active=True).exclude(ends_at__lte=timezone.now())
+            for promotion in live:
+                key, rule = compile_rule(promotion)
+                buckets.setdefault(key, {})[rule.id] = rule
+                keys[rule.id] = key
+            with self._lock:
+                self._buckets, self._keys, self._loaded_at = buckets, keys, now
+        return buckets
+
+    def discounts(self, lines, tier=""):
+        """
+        Best promotion for each cart line; promotions do not stack.
+
+        `lines` is an iterable of (product id, category id, unit price in paise, quantity).
+        Returns a list of (discount in paise, promotion id or None), in order.
+        """
+        buckets = self._current()
+        now = timezone.now()
+        tiers = ("", tier) if tier else ("",)
+        results = []
+        for product_id, category_id, unit_price, quantity in lines:
+            best, best_id = 0, None
+            for target in (("product", product_id), ("category", category_id), ("cart", None)):
+                if target[1] is None and target[0] != "cart":
+                    continue
+                for rule_tier in tiers:
+                    bucket = buckets.get((*target, rule_tier))
+                    if not bucket:
+                        continue
+                    for rule in bucket.values():
+                        if not is_live(rule, now):
+                            continue
+                        amount = rule_discount(rule, unit_price, quantity)
+                        if amount > best:
+                            best, best_id = amount, rule.id
+            results.append((min(best, unit_price * quantity), best_id))
+        return results
+
+    def update(self, promotion):
+        """Recompile one promotion in place (a no-op until the index is first loaded)."""
+        with self._lock:
+            if self._buckets is None:
+                return
+            self._discard(promotion.pk)
+            if promotion.is_active and (promotion.ends_at is None or promotion.ends_at > timezone.now()):
+                key, rule = compile_rule(promotion)
+                # Copy-on-write so readers never iterate a bucket being modified
+                self._buckets[key] = {**self._buckets.get(key, {}), rule.id: rule}
+                self._keys[rule.id] = key
+
+    def remove(self, promotion_id):
+        with self._lock:
+            if self._buckets is not None:
+                self._discard(promotion_id)
+
+    def invalidate(self):
+        with self._lock:
+            self._buckets, self._keys = None, {}
+
+    def _discard(self, promotion_id):
+        key = self._keys.pop(promotion_id, None)
+        if key is None:
+            return
+        bucket = {rule_id: rule for rule_id, rule in self._buckets[key].items() if rule_id != promotion_id}
+        if bucket:
+            self._buckets[key] = bucket
+        else:
+            del self._buckets[key]
+
+
+promotion_index = PromotionIndex(ttl=settings.PROMOTION_INDEX_TTL)
+
+
+@receiver(post_save, sender=Promotion)
+def _recompile_promotion(sender, instance, **kwargs):
+    transaction.on_commit(lambda: promotion_index.update(instance))
+
+
+@receiver(post_delete, sender=Promotion)
+def _drop_promotion(sender, instance, **kwargs):
+    promotion_id = instance.pk
+    transaction.on_commit(lambda: promotion_index.remove(promotion_id))
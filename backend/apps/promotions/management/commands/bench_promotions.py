@@ -0,0 +1,111 @@
+import random
+import time
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from apps.products.models import Category, Product
+from apps.promotions.engine import compile_rule, is_live, promotion_index, rule_discount
+from apps.promotions.models import Promotion
+from backend_api.money import to_paise
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare promotion evaluation through the compiled index with checking "
+        "every rule against every line. All data is created inside a "
+        "transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rules", type=int, default=1000, help="Number of active promotions.")
+        parser.add_argument("--lines", type=int, default=100, help="Cart lines per evaluation.")
+        parser.add_argument("--products", type=int, default=2000, help="Catalogue size.")
+        parser.add_argument("--repeat", type=int, default=50, help="Carts to average over.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        with transaction.atomic():
+            categories = Category.objects.bulk_create(
+                [Category(name=f"Bench category {i}") for i in range(20)]
+            )
+            products = Product.objects.bulk_create([
+                Product(
+                    item_id=f"BENCH-{i:05d}", name=f"Bench product {i}", quantity=10**6,
+                    price=Decimal("10.00"), category=rng.choice(categories),
+                )
+                for i in range(options["products"])
+            ])
+            Promotion.objects.bulk_create([
+                self._promotion(i, rng, products, categories) for i in range(options["rules"])
+            ])
+
+            carts = [
+                [
+                    (p.pk, p.category_id, to_paise(p.price), rng.randint(1, 6))
+                    for p in rng.sample(products, options["lines"])
+                ]
+                for _ in range(options["repeat"])
+            ]
+            tiers = [rng.choice(["", "silver", "gold"]) for _ in carts]
+
+            promotion_index.invalidate()
+            started = time.perf_counter()
+            promotion_index.discounts([], tier="")
+            compile_ms = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            indexed = [promotion_index.discounts(cart, tier=tier) for cart, tier in zip(carts, tiers)]
+            indexed_ms = (time.perf_counter() - started) * 1000 / len(carts)
+
+            rules = [compile_rule(p) for p in Promotion.objects.all()]
+            started = time.perf_counter()
+            naive = [self._naive(rules, cart, tier) for cart, tier in zip(carts, tiers)]
+            naive_ms = (time.perf_counter() - started) * 1000 / len(carts)
+
+            promotion_index.invalidate()
+            transaction.set_rollback(True)
+
+        mismatches = sum(
+            1 for a, b in zip(indexed, naive) for (x, _), (y, _) in zip(a, b) if x != y
+        )
+        self.stdout.write(f"rules={options['rules']} lines={options['lines']} compile={compile_ms:.2f} ms")
+        self.stdout.write(f"{'indexed':>8} {indexed_ms:>8.3f} ms/cart")
+        self.stdout.write(f"{'naive':>8} {naive_ms:>8.3f} ms/cart")
+        if mismatches:
+            self.stderr.write(f"{mismatches} line(s) priced differently by the two evaluators")
+
+    @staticmethod
+    def _promotion(i, rng, products, categories):
+        roll = rng.random()
+        tier = rng.choice(["", "", "silver", "gold"])
+        if roll < 0.6:
+            return Promotion(name=f"Bench {i}", product=rng.choice(products), tier=tier,
+                             percent=Decimal(rng.randint(1, 30)))
+        if roll < 0.8:
+            return Promotion(name=f"Bench {i}", kind=Promotion.BUY_X_GET_Y, product=rng.choice(products),
+                             buy_quantity=rng.randint(1, 3), get_quantity=1, tier=tier)
+        if roll < 0.98:
+            return Promotion(name=f"Bench {i}", category=rng.choice(categories), tier=tier,
+                             percent=Decimal(rng.randint(1, 15)))
+        return Promotion(name=f"Bench {i}", tier=rng.choice(["silver", "gold"]), percent=Decimal(5))
+
+    @staticmethod
+    def _naive(rules, cart, tier):
+        """Reference evaluator: every rule against every line."""
+        now = timezone.now()
+        results = []
+        for product_id, category_id, unit_price, quantity in cart:
+            best, best_id = 0, None
+            for (target, target_id, rule_tier), rule in rules:
+                if rule_tier not in ("", tier) or not is_live(rule, now):
+                    continue
+                if target == "product" and target_id != product_id:
+                    continue
+                if target == "category" and target_id != category_id:
+                    continue
+                amount = rule_discount(rule, unit_price, quantity)
+                if amount > best:
+                    best, best_id = amount, rule.id
+            results.append((min(best, unit_price * quantity), best_id))
+        return results
@@ -0,0 +1,67 @@
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.utils import timezone
+from apps.products.models import Category, Product
+
+
+class Promotion(models.Model):
+    """
+    A discount rule applied to cart lines before a bill is created.
+
+    The target is a product, a category, or (neither set) every line of the
+    cart. `tier` restricts the rule to customers of that loyalty tier.
+    """
+    PERCENT_OFF = "percent_off"
+    BUY_X_GET_Y = "buy_x_get_y"
+    KIND_CHOICES = [
+        (PERCENT_OFF, "Percentage off"),
+        (BUY_X_GET_Y, "Buy X get Y free"),
+    ]
+    TIER_CHOICES = [
+        ("bronze", "Bronze"),
+        ("silver", "Silver"),
+        ("gold", "Gold"),
+        ("platinum", "Platinum"),
+    ]
+
+    name = models.CharField(max_length=200)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default=PERCENT_OFF)
+    product = models.ForeignKey(
+        Product, on_delete=models.CASCADE, null=True, blank=True, related_name="promotions"
+    )
+    category = models.ForeignKey(
+        Category, on_delete=models.CASCADE, null=True, blank=True, related_name="promotions"
+    )
+    tier = models.CharField(max_length=20, choices=TIER_CHOICES, blank=True, default="")
+    percent = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    buy_quantity = models.PositiveIntegerField(default=0)
+    get_quantity = models.PositiveIntegerField(default=0)
+    starts_at = models.DateTimeField(null=True, blank=True)
+    ends_at = models.DateTimeField(null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return self.name
+
+    def clean(self):
+        if self.product_id and self.category_id:
+            raise ValidationError("A promotion targets either a product or a category, not both.")
+        if self.kind == self.PERCENT_OFF and not 0 < self.percent <= 100:
+            raise ValidationError({"percent": "Must be between 0 and 100."})
+        if self.kind == self.BUY_X_GET_Y and (self.buy_quantity < 1 or self.get_quantity < 1):
+            raise ValidationError("Buy X get Y promotions need buy and get quantities of at least 1.")
+        if self.starts_at and self.ends_at and self.starts_at >= self.ends_at:
+            raise ValidationError({"ends_at": "Must be after starts_at."})
+
+    @property
+    def is_live(self):
+        now = timezone.now()
+        return (
+            self.is_active
+            and (self.starts_at is None or self.starts_at <= now)
+            and (self.ends_at is None or now < self.ends_at)
+        )
@@ -0,0 +1,27 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+from .models import Promotion
+
+
+class PromotionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Promotion
+        fields = "__all__"
+
+    def validate(self, attrs):
+        # Run the model's own rule checks (target, percent, buy/get, window)
+        promotion = Promotion(**{**self._current_values(), **attrs})
+        try:
+            promotion.clean()
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError(serializers.as_serializer_error(exc))
+        return attrs
+
+    def _current_values(self):
+        if self.instance is None:
+            return {}
+        return {
+            field.name: getattr(self.instance, field.name)
+            for field in Promotion._meta.concrete_fields
+            if not field.primary_key
+        }
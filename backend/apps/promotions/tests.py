@@ -0,0 +1,94 @@
+from datetime import timedelta
+from decimal import Decimal
+import pytest
+from django.utils import timezone
+from apps.customers.models import Customer, CustomerLoyalty
+from apps.products.models import Category
+from apps.promotions.engine import customer_tier, promotion_index
+from apps.promotions.models import Promotion
+
+QUOTE_URL = "/api/billings/quote/"
+
+
+@pytest.fixture(autouse=True)
+def fresh_index():
+    # Promotions saved inside a test transaction never reach on_commit; reload the index instead
+    promotion_index.invalidate()
+    yield
+    promotion_index.invalidate()
+
+
+def line(product, quantity=1):
+    """A (product id, category id, unit price in paise, quantity) line for `discounts`."""
+    return (product.pk, product.category_id, 1000, quantity)
+
+
+@pytest.mark.django_db
+def test_customers_without_loyalty_row_are_bronze(customer):
+    CustomerLoyalty.objects.filter(customer=customer).delete()
+    assert customer_tier(None) == "bronze"
+    assert customer_tier(Customer.objects.get(pk=customer.pk)) == "bronze"
+
+    CustomerLoyalty.objects.create(customer=customer, tier="gold")
+    assert customer_tier(Customer.objects.select_related("loyalty").get(pk=customer.pk)) == "gold"
+
+
+@pytest.mark.django_db
+def test_tier_promotions_apply_only_to_that_tier(products):
+    everyone = Promotion.objects.create(name="Everyone", product=products[0], percent=Decimal(5))
+    gold = Promotion.objects.create(name="Gold", product=products[0], tier="gold", percent=Decimal(20))
+    bronze = Promotion.objects.create(name="Bronze", product=products[1], tier="bronze", percent=Decimal(10))
+
+    lines = [line(products[0]), line(products[1])]
+    assert promotion_index.discounts(lines, tier="bronze") == [(50, everyone.pk), (100, bronze.pk)]
+    assert promotion_index.discounts(lines, tier="gold") == [(200, gold.pk), (0, None)]
+    assert promotion_index.discounts(lines) == [(50, everyone.pk), (0, None)]
+
+
+@pytest.mark.django_db
+def test_promotions_do_not_stack_and_the_best_one_wins(products):
+    category = Category.objects.create(name="Snacks")
+    products[0].category = category
+    products[0].save()
+    Promotion.objects.create(name="Product", product=products[0], percent=Decimal(10))
+    category_rule = Promotion.objects.create(name="Category", category=category, percent=Decimal(15))
+    Promotion.objects.create(name="Cart", percent=Decimal(5))
+    buy_two = Promotion.objects.create(
+        name="Buy 2 get 1", product=products[0], kind=Promotion.BUY_X_GET_Y, buy_quantity=2, get_quantity=1,
+    )
+
+    # 15% of 2 x 10.00 beats 10% and 5%; buy 2 get 1 gives nothing until the third unit
+    assert promotion_index.discounts([line(products[0], 2)]) == [(300, category_rule.pk)]
+    # On 3 units one free unit (10.00) beats 15% of 30.00 (4.50)
+    assert promotion_index.discounts([line(products[0], 3)]) == [(1000, buy_two.pk)]
+
+
+@pytest.mark.django_db
+def test_promotions_apply_only_inside_their_date_window(products):
+    now = timezone.now()
+    Promotion.objects.create(
+        name="Ended", product=products[0], percent=Decimal(50), ends_at=now - timedelta(minutes=1),
+    )
+    Promotion.objects.create(
+        name="Not started", product=products[0], percent=Decimal(40), starts_at=now + timedelta(hours=1),
+    )
+    Promotion.objects.create(name="Switched off", product=products[0], percent=Decimal(30), is_active=False)
+    current = Promotion.objects.create(
+        name="Current", product=products[0], percent=Decimal(10),
+        starts_at=now - timedelta(hours=1), ends_at=now + timedelta(hours=1),
+    )
+
+    assert promotion_index.discounts([line(products[0])]) == [(100, current.pk)]
+
+
+@pytest.mark.django_db
+def test_quote_applies_bronze_promotions_to_customers_without_loyalty_row(cashier_client, customer, products):
+    CustomerLoyalty.objects.filter(customer=customer).delete()
+    Promotion.objects.create(name="Bronze", product=products[0], tier="bronze", percent=Decimal(10))
+
+    response = cashier_client.post(
+        QUOTE_URL, {"customer": customer.pk, "items": [{"product": products[0].pk, "quantity": 1}]}, format="json",
+    )
+
+    assert response.status_code == 200
+    assert response.json()["promotion_discount"] == "1.00"
@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path("promotions/", views.PromotionList.as_view(), name="promotion-list"),
+    path("promotions/<int:pk>/", views.PromotionDetail.as_view(), name="promotion-detail"),
+]
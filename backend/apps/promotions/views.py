@@ -0,0 +1,32 @@
+from django.utils import timezone
+from rest_framework import generics, permissions
+from apps.products.permissions import IsManagerOrReadOnly
+from .models import Promotion
+from .serializers import PromotionSerializer
+
+
+class PromotionList(generics.ListCreateAPIView):
+    """
+    GET  /api/promotions/      -> list promotions (?active=true for live ones only)
+    POST /api/promotions/      -> add a promotion (manager only)
+    """
+    serializer_class = PromotionSerializer
+    permission_classes = [permissions.IsAuthenticated, IsManagerOrReadOnly]
+
+    def get_queryset(self):
+        queryset = Promotion.objects.all()
+        if self.request.query_params.get("active") == "true":
+            now = timezone.now()
+            queryset = queryset.filter(is_active=True).exclude(starts_at__gt=now).exclude(ends_at__lte=now)
+        return queryset
+
+
+class PromotionDetail(generics.RetrieveUpdateDestroyAPIView):
+    """
+    GET    /api/promotions/<id>/ -> promotion details
+    PUT    /api/promotions/<id>/ -> update (manager only)
+    DELETE /api/promotions/<id>/ -> delete (manager only)
+    """
+    queryset = Promotion.objects.all()
+    serializer_class = PromotionSerializer
+    permission_classes = [permissions.IsAuthenticated, IsManagerOrReadOnly]
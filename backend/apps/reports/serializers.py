@@ -1,28 +1,29 @@
 # apps/reports/serializers.py
 
 from rest_framework import serializers
+from backend_api.money import PaiseField
 
 class DailyReportSerializer(serializers.Serializer):
     date = serializers.DateField()
-    total_sales = serializers.DecimalField(max_digits=12, decimal_places=2)
+    total_sales = PaiseField()
     bill_count = serializers.IntegerField()
 
 class MonthlyReportSerializer(serializers.Serializer):
     month = serializers.CharField()
-    total_sales = serializers.DecimalField(max_digits=12, decimal_places=2)
+    total_sales = PaiseField()
     bill_count = serializers.IntegerField()
 
 class MostSoldItemSerializer(serializers.Serializer):
     product = serializers.CharField()
     total_qty = serializers.IntegerField()
-    total_sales = serializers.DecimalField(max_digits=12, decimal_places=2)
+    total_sales = PaiseField()
 
 class ProfitReportSerializer(serializers.Serializer):
     product = serializers.CharField()
-    cost_price = serializers.DecimalField(max_digits=10, decimal_places=2)
-    selling_price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    cost_price = PaiseField()
+    selling_price = PaiseField()
     total_qty_sold = serializers.IntegerField()
-    total_profit = serializers.DecimalField(max_digits=12, decimal_places=2)
+    total_profit = PaiseField()
 
 
 class StockStatementSerializer(serializers.Serializer):
@@ -40,7 +41,7 @@ class MarginReportSerializer(serializers.Serializer):
 class ManufacturerStockSerializer(serializers.Serializer):
     manufacturer = serializers.CharField()
     total_products = serializers.IntegerField()
-    total_stock_value = serializers.DecimalField(max_digits=12, decimal_places=2)
+    total_stock_value = PaiseField()
 
 class StockBillsReportSerializer(serializers.Serializer):
     bill_id = serializers.CharField()
@@ -1,3 +1,62 @@
-from django.test import TestCase
+import pytest
+from django.db import transaction
+from django.utils import timezone
+from apps.products.models import Product
+from apps.products.stock import set_stock
 
-# Create your tests here.
+BILLS_URL = "/api/billings/"
+
+
+@pytest.fixture
+def sales(cashier_client, manager_client, customer, products):
+    """Two bills of 2 x 10.00 (plus tax), the second one voided."""
+    ids = [
+        cashier_client.post(
+            BILLS_URL,
+            {"customer": customer.pk, "discount": "0", "items": [{"product": products[0].pk, "quantity": 2, "price": "0"}]},
+            format="json",
+        ).data["id"]
+        for _ in range(2)
+    ]
+    manager_client.post("/api/billings/bulk-status/", {"action": "void", "bills": [{"id": ids[1]}]}, format="json")
+    return ids
+
+
+@pytest.mark.django_db
+def test_daily_and_monthly_reports_leave_out_voided_bills(cashier_client, sales):
+    today = timezone.localdate()
+
+    daily = cashier_client.get("/api/reports/daily/", {"start_date": today, "end_date": today}).data
+    monthly = cashier_client.get("/api/reports/monthly/", {"year": today.year}).data
+
+    assert [row["bill_count"] for row in daily] == [1]
+    assert [row["bill_count"] for row in monthly] == [1]
+    kept = cashier_client.get(f"{BILLS_URL}{sales[0]}/").data["total"]
+    assert daily[0]["total_sales"] == monthly[0]["total_sales"] == kept
+
+
+@pytest.mark.django_db
+def test_item_reports_leave_out_voided_bills(cashier_client, products, sales):
+    most_sold = cashier_client.get("/api/reports/most-sold/").data
+    profit = cashier_client.get("/api/reports/profit/").data
+    statement = {row["product"]: row for row in cashier_client.get("/api/reports/stock-statement/").data}
+    stock_bills = cashier_client.get("/api/reports/stock-bills/").data
+
+    assert [(row["total_qty"], row["total_sales"]) for row in most_sold] == [(2, "20.00")]
+    assert [row["total_qty_sold"] for row in profit] == [2]
+    assert statement[products[0].name]["total_sold"] == 2
+    assert statement[products[0].name]["closing_stock"] == 98
+    assert len(stock_bills) == 1
+
+
+@pytest.mark.django_db
+def test_manufacturer_stock_value_is_summed_in_paise(cashier_client, products):
+    Product.objects.filter(pk__in=[p.pk for p in products]).update(manufacturer="Amul", price="0.10", quantity=3)
+    with transaction.atomic():
+        set_stock(products[0], 7, stripe_count=2)
+
+    rows = cashier_client.get("/api/reports/manufacturer/").data
+
+    assert [(row["manufacturer"], row["total_products"], row["total_stock_value"]) for row in rows] == [
+        ("Amul", 12, "4.00"),  # (11 x 3 + 7) x 0.10
+    ]
@@ -7,8 +7,10 @@ from rest_framework import permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from apps.billing.models import Bill, BillItem
-from apps.products.models import Product
+from apps.products.models import Product, StockStripe
+from apps.products.stock import stripe_totals
 from apps.suppliers.models import PurchaseOrder, Supplier
+from backend_api.money import paise_of, to_paise
 from .serializers import (
     DailyReportSerializer,
     MonthlyReportSerializer,
@@ -21,6 +23,8 @@ from .serializers import (
     PurchaseReportSerializer,
 )
 
+# Voided bills are not sales: every report below leaves them out
+
 # ✅ Daily Report
 class DailyReportView(APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -31,9 +35,10 @@ class DailyReportView(APIView):
 
         qs = (
             Bill.objects.filter(created_at__date__range=[start_date, end_date])
+            .exclude(payment_status="void")
             .annotate(date=TruncDate("created_at"))
             .values("date")
-            .annotate(total_sales=Sum("total"), bill_count=Count("id"))
+            .annotate(total_sales=Sum("total_paise"), bill_count=Count("id"))
             .order_by("date")
         )
 
@@ -50,9 +55,10 @@ class MonthlyReportView(APIView):
 
         qs = (
             Bill.objects.filter(created_at__year=year)
+            .exclude(payment_status="void")
             .annotate(month=TruncMonth("created_at"))
             .values("month")
-            .annotate(total_sales=Sum("total"), bill_count=Count("id"))
+            .annotate(total_sales=Sum("total_paise"), bill_count=Count("id"))
             .order_by("month")
         )
 
@@ -74,10 +80,11 @@ class MostSoldItemsView(APIView):
 
     def get(self, request):
         qs = (
-            BillItem.objects.values("product__name")
+            BillItem.objects.exclude(bill__payment_status="void")
+            .values("product__name")
             .annotate(
-                total_qty=Sum("qty"),
-                total_sales=Sum(F("qty") * F("price")),
+                total_qty=Sum("quantity"),
+                total_sales=Sum(F("quantity") * F("price_paise")),
             )
             .order_by("-total_qty")[:10]
         )
@@ -94,16 +101,18 @@ class ProfitTrackingView(APIView):
 
     def get(self, request):
         qs = (
-            BillItem.objects.values("product__name", "product__cost_price", "price")
-            .annotate(total_qty_sold=Sum("qty"))
+            BillItem.objects.exclude(bill__payment_status="void")
+            .values("product__name", "product__cost_price", "price_paise")
+            .annotate(total_qty_sold=Sum("quantity"))
         )
         data = []
         for item in qs:
-            total_profit = (item["price"] - item["product__cost_price"]) * item["total_qty_sold"]
+            cost_price = to_paise(item["product__cost_price"])
+            total_profit = (item["price_paise"] - cost_price) * item["total_qty_sold"]
             data.append({
                 "product": item["product__name"],
-                "cost_price": item["product__cost_price"],
-                "selling_price": item["price"],
+                "cost_price": cost_price,
+                "selling_price": item["price_paise"],
                 "total_qty_sold": item["total_qty_sold"],
                 "total_profit": total_profit,
             })
@@ -118,10 +127,13 @@ class StockStatementReportView(APIView):
 
     def get(self, request):
         data = []
-        for p in Product.objects.all():
-            total_sold = BillItem.objects.filter(product=p).aggregate(Sum("quantity"))["quantity__sum"] or 0
-            opening_stock = (p.quantity or 0) + total_sold
-            closing_stock = p.quantity or 0
+        for p in Product.objects.with_stock():
+            total_sold = (
+                BillItem.objects.filter(product=p).exclude(bill__payment_status="void")
+                .aggregate(Sum("quantity"))["quantity__sum"] or 0
+            )
+            opening_stock = (p.stock_quantity or 0) + total_sold
+            closing_stock = p.stock_quantity or 0
 
             data.append({
                 "product": p.name,
@@ -161,11 +173,21 @@ class ManufacturerStockReportView(APIView):
             Product.objects.values("manufacturer")
             .annotate(
                 total_products=Count("id"),
-                total_stock_value=Sum(F("quantity") * F("price")),
+                total_stock_value=Sum(F("quantity") * paise_of("price")),
             )
             .order_by("manufacturer")
         )
-        serializer = ManufacturerStockSerializer(qs, many=True)
+        # Add the value of stock held in stripes of hot products
+        striped_value = dict(
+            StockStripe.objects.values("product__manufacturer")
+            .annotate(value=Sum(F("quantity") * paise_of("product__price")))
+            .values_list("product__manufacturer", "value")
+        )
+        rows = [
+            {**row, "total_stock_value": (row["total_stock_value"] or 0) + striped_value.get(row["manufacturer"], 0)}
+            for row in qs
+        ]
+        serializer = ManufacturerStockSerializer(rows, many=True)
         return Response(serializer.data)
 
 
@@ -178,22 +200,29 @@ class StockBillsReportView(APIView):
         end_date = request.query_params.get("end_date")
 
         # ✅ Safer query
-        bill_items_query = BillItem.objects.select_related("bill", "product").exclude(product=None)
+        bill_items_query = (
+            BillItem.objects.select_related("bill", "product")
+            .exclude(product=None)
+            .exclude(bill__payment_status="void")  # voided sales were restocked
+        )
 
         if start_date and end_date:
             bill_items_query = bill_items_query.filter(
                 bill__created_at__date__range=[start_date, end_date]
             )
 
+        bill_items = list(bill_items_query)
+        striped = stripe_totals({item.product_id for item in bill_items})
+
         data = []
-        for item in bill_items_query:
+        for item in bill_items:
             # ✅ Safely handle missing product or bill
             product = item.product
             bill = item.bill
             if not product or not bill:
                 continue
 
-            stock_after = int(product.quantity or 0)
+            stock_after = int(product.quantity or 0) + striped.get(product.id, 0)
             stock_before = stock_after + int(item.quantity or 0)
 
             data.append({
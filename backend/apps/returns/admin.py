@@ -0,0 +1,19 @@
+from django.contrib import admin
+from .models import BillReturn, BillReturnItem
+
+
+class BillReturnItemInline(admin.TabularInline):
+    model = BillReturnItem
+    extra = 0
+    fields = ("bill_item", "quantity", "amount_paise")
+    readonly_fields = fields
+
+
+@admin.register(BillReturn)
+class BillReturnAdmin(admin.ModelAdmin):
+    """Returns are created through the API; shown here read-only."""
+    list_display = ("return_id", "bill", "cashier", "refund_paise", "points_reversed", "created_at")
+    search_fields = ("return_id", "bill__bill_id")
+    readonly_fields = ("return_id", "bill", "cashier", "refund", "reason", "refund_paise", "points_reversed", "created_at")
+    inlines = [BillReturnItemInline]
+    ordering = ("-created_at",)
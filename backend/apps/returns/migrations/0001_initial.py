@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-17 07:23
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('billing', '0016_backfill_paise_amounts'),
+        ('payment', '0007_refund'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BillReturn',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('return_id', models.CharField(editable=False, max_length=100, unique=True)),
+                ('reason', models.CharField(blank=True, default='', max_length=255)),
+                ('refund_paise', models.BigIntegerField(default=0)),
+                ('points_reversed', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('bill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='returns', to='billing.bill')),
+                ('cashier', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='bill_returns', to=settings.AUTH_USER_MODEL)),
+                ('refund', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='bill_return', to='payment.refund')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='BillReturnItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveIntegerField()),
+                ('amount_paise', models.BigIntegerField(default=0)),
+                ('bill_item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='returns', to='billing.billitem')),
+                ('bill_return', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='returns.billreturn')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='billreturn',
+            index=models.Index(fields=['-created_at', '-id'], name='billreturn_created_id_idx'),
+        ),
+    ]
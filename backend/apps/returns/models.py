@@ -0,0 +1,48 @@
+from django.db import models
+from django.utils import timezone
+from apps.accounts.models import CustomUser
+from apps.billing.models import Bill, BillItem
+from apps.payment.models import Refund
+from apps.sequences.allocator import document_number
+
+
+class BillReturn(models.Model):
+    """
+    Goods brought back against a paid bill. A bill may have several partial
+    returns; together they never exceed the quantities sold.
+    """
+    return_id = models.CharField(max_length=100, unique=True, editable=False)
+    bill = models.ForeignKey(Bill, on_delete=models.CASCADE, related_name="returns")
+    cashier = models.ForeignKey(
+        CustomUser, on_delete=models.SET_NULL, null=True, blank=True, related_name="bill_returns"
+    )
+    refund = models.OneToOneField(
+        Refund, on_delete=models.SET_NULL, null=True, blank=True, related_name="bill_return"
+    )
+    reason = models.CharField(max_length=255, blank=True, default="")
+    refund_paise = models.BigIntegerField(default=0)
+    points_reversed = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Newest-first keyset pagination
+            models.Index(fields=["-created_at", "-id"], name="billreturn_created_id_idx"),
+        ]
+
+    @staticmethod
+    def generate_return_id():
+        return document_number("RET", "return")  # RET-20251031-000042
+
+    def __str__(self):
+        return self.return_id
+
+
+class BillReturnItem(models.Model):
+    bill_return = models.ForeignKey(BillReturn, on_delete=models.CASCADE, related_name="items")
+    bill_item = models.ForeignKey(BillItem, on_delete=models.CASCADE, related_name="returns")
+    quantity = models.PositiveIntegerField()
+    amount_paise = models.BigIntegerField(default=0)  # quantity × unit price, before discount and tax
+
+    def __str__(self):
+        return f"{self.bill_item} returned × {self.quantity}"
@@ -0,0 +1,60 @@
+from rest_framework import serializers
+from apps.billing.models import Bill
+from backend_api.money import PaiseField
+from .models import BillReturn, BillReturnItem
+from .services import ReturnRejected, process_return
+
+
+class BillReturnItemSerializer(serializers.ModelSerializer):
+    bill_item = serializers.IntegerField(source="bill_item_id")
+    quantity = serializers.IntegerField(min_value=1)
+    product = serializers.IntegerField(source="bill_item.product_id", read_only=True)
+    product_name = serializers.CharField(source="bill_item.product.name", read_only=True)
+    amount = PaiseField(source="amount_paise", read_only=True)
+
+    class Meta:
+        model = BillReturnItem
+        fields = ["id", "bill_item", "product", "product_name", "quantity", "amount"]
+
+
+class BillReturnSerializer(serializers.ModelSerializer):
+    """
+    POST /api/returns/ body:
+    {"bill": 12, "reason": "damaged", "refund_method": "cash",
+     "items": [{"bill_item": 40, "quantity": 1}, ...]}
+    """
+    # A plain id: the service locks the bill row itself
+    bill = serializers.IntegerField(source="bill_id")
+    items = BillReturnItemSerializer(many=True, allow_empty=False)
+    refund = PaiseField(source="refund_paise", read_only=True)
+    refund_method = serializers.CharField(source="refund.method", max_length=50, required=False, default="cash")
+
+    class Meta:
+        model = BillReturn
+        fields = [
+            "id", "return_id", "bill", "cashier", "reason", "refund", "refund_method",
+            "points_reversed", "items", "created_at",
+        ]
+        read_only_fields = ["return_id", "cashier", "points_reversed", "created_at"]
+
+    def validate_items(self, items):
+        ids = [item["bill_item_id"] for item in items]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("Each bill item may appear only once.")
+        return items
+
+    def create(self, validated_data):
+        request = self.context.get("request")
+        cashier = request.user if request and request.user.is_authenticated else None
+        try:
+            return process_return(
+                validated_data["bill_id"],
+                {item["bill_item_id"]: item["quantity"] for item in validated_data["items"]},
+                cashier=cashier,
+                reason=validated_data.get("reason", ""),
+                refund_method=validated_data.get("refund", {}).get("method", ""),
+            )
+        except Bill.DoesNotExist:
+            raise serializers.ValidationError({"bill": ["Bill not found."]})
+        except ReturnRejected as exc:
+            raise serializers.ValidationError(str(exc))
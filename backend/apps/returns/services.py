@@ -0,0 +1,104 @@
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import Sum, Value
+from django.db.models.functions import Coalesce
+from apps.billing.models import Bill, BillItem
+from apps.billing.services import cache_prefetched_items
+from apps.outbox.dispatch import publish
+from apps.payment.models import Payment, Refund
+from apps.products.stock import increment_stock
+from backend_api.money import div_round
+from .models import BillReturn, BillReturnItem
+
+
+class ReturnRejected(Exception):
+    pass
+
+
+@transaction.atomic
+def process_return(bill_id, quantities, cashier=None, reason="", refund_method=""):
+    """
+    Return goods from a paid bill with a constant number of statements.
+
+    `quantities` maps bill item id -> units brought back. The bill row is
+    locked, so concurrent returns against one bill are serialized and can
+    never exceed what was sold. Stock is incremented once per product, the
+    refund is recorded against the bill's payment, and a `bill.returned`
+    outbox event takes back the loyalty points the refund no longer earns.
+
+    The refund is the returned lines' share of the bill total (so discounts
+    and tax are returned pro rata); the return that empties the bill refunds
+    whatever is left, so rounding never leaves money behind.
+    Raises Bill.DoesNotExist or ReturnRejected.
+    """
+    bill = (
+        Bill.objects.select_for_update()
+        .only("id", "customer_id", "payment_status", "subtotal_paise", "total_paise")
+        .get(pk=bill_id)
+    )
+    if bill.payment_status != "paid":
+        raise ReturnRejected("Only paid bills can be returned; void an unpaid bill instead.")
+
+    items = {
+        item.id: item
+        for item in BillItem.objects.filter(bill_id=bill.pk)
+        .select_related("product")
+        .annotate(returned=Coalesce(Sum("returns__quantity"), Value(0)))
+    }
+    unknown = sorted(set(quantities) - items.keys())
+    if unknown:
+        raise ReturnRejected(f"Not items of this bill: {', '.join(map(str, unknown))}.")
+    for item_id, quantity in quantities.items():
+        left = items[item_id].quantity - items[item_id].returned
+        if quantity > left:
+            raise ReturnRejected(f"Bill item {item_id}: only {left} left to return.")
+
+    refunded = bill.returns.aggregate(total=Sum("refund_paise"))["total"] or 0
+    remaining = bill.total_paise - refunded
+    gross = sum(items[item_id].price_paise * quantity for item_id, quantity in quantities.items())
+    closes_bill = all(item.returned + quantities.get(item.id, 0) >= item.quantity for item in items.values())
+    if closes_bill:
+        amount = remaining
+    elif bill.subtotal_paise:
+        amount = min(div_round(bill.total_paise * gross, bill.subtotal_paise), remaining)
+    else:
+        amount = 0
+    # Points earned by what the customer keeps, before and after this return
+    points = Bill.points_for(remaining) - Bill.points_for(remaining - amount)
+
+    bill_return = BillReturn(
+        return_id=BillReturn.generate_return_id(), bill=bill, cashier=cashier,
+        reason=reason, refund_paise=amount, points_reversed=points,
+    )
+    payment = Payment.objects.filter(bill_id=bill.pk).only("id").first()
+    bill_return.refund = Refund.objects.create(
+        payment=payment, bill=bill, amount_paise=amount,
+        method=refund_method, reference=bill_return.return_id,
+    )
+    bill_return.save()
+
+    lines = [
+        BillReturnItem(
+            bill_return=bill_return, bill_item=items[item_id],
+            quantity=quantity, amount_paise=items[item_id].price_paise * quantity,
+        )
+        for item_id, quantity in quantities.items()
+    ]
+    BillReturnItem.objects.bulk_create(lines)
+    cache_prefetched_items(bill_return, lines)
+
+    # ✅ Put the returned units back, summed per product
+    restock = defaultdict(int)
+    for line in lines:
+        restock[line.bill_item.product_id] += line.quantity
+    increment_stock(restock)
+
+    if payment is not None and closes_bill:
+        # Fully refunded. A queryset update skips Payment.save(), which would
+        # move the bill back to pending.
+        Payment.objects.filter(pk=payment.pk).update(status="refunded")
+
+    # ✅ Loyalty is reversed later by the outbox worker, not in this request
+    if bill.customer_id and points:
+        publish("bill.returned", {"bill": bill.pk, "customer": bill.customer_id, "points": points})
+    return bill_return
@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path("returns/", views.BillReturnList.as_view(), name="return-list"),
+    path("returns/<int:pk>/", views.BillReturnDetail.as_view(), name="return-detail"),
+]
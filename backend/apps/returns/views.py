@@ -0,0 +1,30 @@
+from rest_framework import generics, permissions
+from apps.idempotency.mixins import IdempotentCreateMixin
+from backend_api.pagination import KeysetPagination
+from .models import BillReturn
+from .serializers import BillReturnSerializer
+
+
+class BillReturnList(IdempotentCreateMixin, generics.ListCreateAPIView):
+    """
+    GET  /api/returns/          -> returns, newest first (?bill=<id> for one bill)
+    POST /api/returns/          -> return items of a paid bill: restocks them,
+                                   records the refund and reverses loyalty points
+    """
+    serializer_class = BillReturnSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    idempotency_scope = "returns"
+
+    def get_queryset(self):
+        queryset = BillReturn.objects.select_related("refund").prefetch_related("items__bill_item__product")
+        bill = self.request.query_params.get("bill")
+        if bill and bill.isdigit():
+            queryset = queryset.filter(bill_id=bill)
+        return queryset
+
+
+class BillReturnDetail(generics.RetrieveAPIView):
+    queryset = BillReturn.objects.select_related("refund").prefetch_related("items__bill_item__product")
+    serializer_class = BillReturnSerializer
+    permission_classes = [permissions.IsAuthenticated]
@@ -0,0 +1,136 @@
+"""
+Gap-tolerant document number allocation.
+
+Each process reserves a block of numbers from a `DocumentSequence` row and
+hands them out from memory, so only one allocation per block touches the
+database. Blocks are reserved on a separate autocommit connection: the
+reservation is committed immediately and is never rolled back with the
+caller's transaction, so two processes can never receive the same number.
+Unused numbers of a block are lost when the process exits, leaving gaps.
+
+The reservation connection belongs to the thread that opened it. Like
+Django's own connections, it is closed at the start and end of each request
+once it outlives CONN_MAX_AGE or becomes unusable (see `close_old`).
+"""
+import threading
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db import DEFAULT_DB_ALIAS, InterfaceError, OperationalError, connection, connections
+from django.dispatch import receiver
+from django.utils import timezone
+from .models import DocumentSequence
+
+
+class NumberAllocator:
+    def __init__(self, block_size):
+        self.block_size = block_size
+        self._blocks = {}  # sequence name -> [next number, end of block (exclusive)]
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def next(self, name):
+        with self._lock:
+            block = self._blocks.get(name)
+            if block is None or block[0] >= block[1]:
+                start = self._reserve(name, self.block_size)
+                block = self._blocks[name] = [start, start + self.block_size]
+            number = block[0]
+            block[0] += 1
+            return number
+
+    def reset(self):
+        """Forget reserved blocks (e.g. after forking or in tests)."""
+        with self._lock:
+            self._blocks.clear()
+
+    def close(self):
+        """Close this thread's reservation connection, if any."""
+        conn = getattr(self._local, "connection", None)
+        if conn is not None:
+            conn.close()
+            self._local.connection = None
+
+    def close_old(self):
+        """Close this thread's reservation connection if it is obsolete, as close_old_connections does."""
+        conn = getattr(self._local, "connection", None)
+        if conn is not None:
+            conn.close_if_unusable_or_obsolete()
+
+    def _reservation_connection(self):
+        # SQLite allows a single writer, so a second connection would wait on
+        # the caller's own transaction. Reserve on the shared connection there;
+        # that is only safe for single-process development databases.
+        if connection.vendor == "sqlite":
+            return connection
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            conn = self._local.connection = connections.create_connection(DEFAULT_DB_ALIAS)
+        return conn
+
+    def _reserve(self, name, size):
+        """Advance the sequence by `size` and return the first number of the block."""
+        try:
+            return self._reserve_on(self._reservation_connection(), name, size)
+        except (InterfaceError, OperationalError):
+            conn = getattr(self._local, "connection", None)
+            if conn is None:
+                raise
+            # The dedicated connection went stale (e.g. database restart); reconnect once.
+            conn.close()
+            self._local.connection = None
+            return self._reserve_on(self._reservation_connection(), name, size)
+
+    @staticmethod
+    def _reserve_on(conn, name, size):
+        table = conn.ops.quote_name(DocumentSequence._meta.db_table)
+        with conn.cursor() as cursor:
+            for _ in range(2):
+                cursor.execute(
+                    f"UPDATE {table} SET next_value = next_value + %s WHERE name = %s RETURNING next_value",
+                    [size, name],
+                )
+                row = cursor.fetchone()
+                if row is not None:
+                    return row[0] - size
+                cursor.execute(
+                    f"INSERT INTO {table} (name, next_value) VALUES (%s, %s) ON CONFLICT (name) DO NOTHING",
+                    [name, 1],
+                )
+        raise RuntimeError(f"Could not reserve numbers from sequence {name!r}")
+
+
+allocator = NumberAllocator(block_size=settings.DOCUMENT_NUMBER_BLOCK_SIZE)
+
+
+@receiver([request_started, request_finished])
+def _close_old_reservation_connection(**kwargs):
+    allocator.close_old()
+
+
+def next_number(name, period=None, scope=None):
+    """
+    Next number of the sequence `name`.
+    Pass `period` (a date) to restart numbering every day and `scope`
+    (e.g. a store code) to keep an independent counter per scope.
+    """
+    parts = [name]
+    if scope:
+        parts.append(str(scope))
+    if period:
+        parts.append(period.strftime("%Y%m%d"))
+    return allocator.next(":".join(parts))
+
+
+def document_number(prefix, name, daily=True, width=6, scope=None):
+    """
+    Format the next number as e.g. "BILL-20251031-000042",
+    or "P-0042" when `daily` is False.
+    """
+    parts = [prefix]
+    if scope:
+        parts.append(str(scope))
+    period = timezone.localdate() if daily else None
+    if period:
+        parts.append(period.strftime("%Y%m%d"))
+    parts.append(f"{next_number(name, period=period, scope=scope):0{width}d}")
+    return "-".join(parts)
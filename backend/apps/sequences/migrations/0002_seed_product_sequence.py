@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def seed_product_sequence(apps, schema_editor):
+    """Continue product item ids (P-0001, ...) after the highest one already issued."""
+    Product = apps.get_model("products", "Product")
+    DocumentSequence = apps.get_model("sequences", "DocumentSequence")
+
+    highest = 0
+    for item_id in Product.objects.values_list("item_id", flat=True).iterator():
+        prefix, _, number = item_id.partition("-")
+        if prefix == "P" and number.isdigit():
+            highest = max(highest, int(number))
+
+    DocumentSequence.objects.update_or_create(name="product", defaults={"next_value": highest + 1})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sequences", "0001_initial"),
+        ("products", "0029_product_image_alter_stockentry_created_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_product_sequence, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,14 @@
+from django.db import models
+
+
+class DocumentSequence(models.Model):
+    """
+    Counter behind a family of document numbers (bills, purchase orders, products).
+    `name` includes the optional period/scope, e.g. "bill:20251031".
+    Workers reserve blocks of numbers from it, see `apps.sequences.allocator`.
+    """
+    name = models.CharField(max_length=150, unique=True)
+    next_value = models.BigIntegerField(default=1)
+
+    def __str__(self):
+        return f"{self.name} (next {self.next_value})"
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-17 07:15
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False  # CONCURRENTLY cannot run inside a transaction
+
+    dependencies = [
+        ('products', '0032_alter_stockentry_created_at_and_more'),
+        ('suppliers', '0002_purchaseorder_purchase_id'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='purchaseorder',
+            index=models.Index(fields=['-created_at', '-id'], name='po_created_id_idx'),
+        ),
+    ]
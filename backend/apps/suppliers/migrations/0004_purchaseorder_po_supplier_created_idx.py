@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-17 07:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suppliers', '0003_purchaseorder_po_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(fields=['supplier', 'created_at', 'id'], name='po_supplier_created_idx'),
+        ),
+    ]
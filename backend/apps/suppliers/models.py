@@ -1,6 +1,5 @@
 from django.db import models
-import uuid
-from django.utils import timezone
+from apps.sequences.allocator import document_number
 
 class Supplier(models.Model):
     name = models.CharField(max_length=200, unique=True)
@@ -23,15 +22,21 @@ class PurchaseOrder(models.Model):
     total = models.DecimalField(max_digits=10, decimal_places=2)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Newest-first keyset pagination
+            models.Index(fields=["-created_at", "-id"], name="po_created_id_idx"),
+            # Supplier statements: one supplier's orders in a date range
+            models.Index(fields=["supplier", "created_at", "id"], name="po_supplier_created_idx"),
+        ]
+
     def save(self, *args, **kwargs):
         # Calculate total
         self.total = self.quantity * self.cost_price
 
         # Generate unique purchase_id only on creation
         if not self.purchase_id:
-            timestamp = timezone.now().strftime("%Y%m%d%H%M%S")
-            unique_part = uuid.uuid4().hex[:6].upper()
-            self.purchase_id = f"PO-{timestamp}-{unique_part}"
+            self.purchase_id = document_number("PO", "purchase_order")  # PO-20251031-000042
 
         super().save(*args, **kwargs)
 
@@ -0,0 +1,77 @@
+"""
+Supplier statements: every purchase order for a supplier and period in one
+PDF.
+
+The statement is a single HTML document, so WeasyPrint lays it out in one
+pass with the shared print stylesheet; the order table's header repeats on
+every page. WeasyPrint cannot emit pages incrementally: the layout of the
+whole statement is held in memory by the pool worker rendering it. That
+memory is bounded by refusing periods with more than
+SUPPLIER_STATEMENT_MAX_ORDERS orders (see `check_size`), not by streaming.
+The finished file is cached per supplier and period and served from disk
+in chunks.
+
+The version digests the orders row by row from a server-side cursor, so a
+statement with thousands of orders is never held as model instances just
+to decide whether the cached file is still current.
+"""
+import hashlib
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Count, Sum
+from django.template.loader import render_to_string
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from apps.documents import printing, storage
+
+TEMPLATE = "purchase_orders/statement.html"
+STYLESHEET = "supplier_statement"
+NAMESPACE = "supplier_statements"
+
+VERSION_FIELDS = ("pk", "purchase_id", "created_at", "product__name", "quantity", "cost_price", "total")
+
+
+def statement_key(supplier, start, end):
+    """Cache key for one supplier and period."""
+    return f"{supplier.pk}-{start:%Y%m%d%H%M%S}-{end:%Y%m%d%H%M%S}"
+
+
+def statement_filename(supplier, start, end):
+    last_day = timezone.localtime(end - timedelta(microseconds=1))
+    return f"statement_{supplier.pk}_{timezone.localtime(start):%Y%m%d}_{last_day:%Y%m%d}.pdf"
+
+
+def check_size(orders):
+    """Refuse a period with more orders than one statement may lay out."""
+    limit = settings.SUPPLIER_STATEMENT_MAX_ORDERS
+    count = orders.count()
+    if count > limit:
+        raise ValidationError({
+            "end_date": f"This period has {count} purchase orders; a statement shows at most {limit}. "
+                        "Request a shorter period."
+        })
+
+
+def statement_version(supplier, orders, start, end):
+    digest = hashlib.sha256()
+    for row in orders.order_by().values_list(*VERSION_FIELDS).iterator(chunk_size=2000):
+        digest.update(repr(row).encode())
+    return storage.version_of([
+        storage.template_digest(TEMPLATE), printing.stylesheet_digest(STYLESHEET),
+        supplier.name, supplier.contact_person, supplier.phone, supplier.email,
+        supplier.address, supplier.gst_number, start.isoformat(), end.isoformat(),
+        digest.hexdigest(),
+    ])
+
+
+def statement_html(supplier, orders, start, end):
+    """`end` is exclusive; the statement shows the last day it covers."""
+    summary = orders.aggregate(count=Count("pk"), quantity=Sum("quantity"), total=Sum("total"))
+    return render_to_string(TEMPLATE, {
+        "supplier": supplier,
+        "orders": orders.select_related("product").order_by("created_at", "id"),
+        "summary": summary,
+        "start": timezone.localtime(start),
+        "end": timezone.localtime(end - timedelta(microseconds=1)),
+        "generated_at": timezone.localtime(),
+    })
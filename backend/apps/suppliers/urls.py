@@ -5,6 +5,7 @@ urlpatterns = [
     path('suppliers/', views.SupplierListCreateView.as_view(), name='supplier-list-create'),
     path('suppliers/<int:pk>/', views.SupplierDetailView.as_view(), name='supplier-detail'),
     path('suppliers/autocomplete/', views.supplier_autocomplete, name='supplier-autocomplete'),
+    path('suppliers/<int:pk>/statement/', views.SupplierStatementPDFView.as_view(), name='supplier-statement'),
     
     path('purchase-orders/<int:pk>/invoice/', views.PurchaseOrderInvoicePDFView.as_view(), name='purchase-order-invoice'),
     path('purchase-orders/', views.PurchaseOrderListCreateView.as_view(), name='purchaseorder-list-create'),
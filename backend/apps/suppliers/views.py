@@ -2,6 +2,13 @@ from rest_framework import generics, filters
 from .models import Supplier, PurchaseOrder
 from .serializers import SupplierSerializer, PurchaseOrderSerializer
 from apps.products.models import Product
+from apps.products.stock import increment_stock
+from apps.documents import printing, storage
+from apps.documents.jobs import pdf_response
+from . import statements
+from backend_api.dates import parse_bound
+from backend_api.pagination import KeysetPagination
+from django.db import transaction
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from rest_framework.decorators import api_view
@@ -10,7 +17,6 @@ from rest_framework import permissions
 from rest_framework import generics, permissions
 from django.http import HttpResponse
 from django.template.loader import render_to_string
-from weasyprint import HTML
 from django.http import HttpResponse, Http404
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework import status, permissions
@@ -21,6 +27,9 @@ from rest_framework import status, permissions
 from .models import PurchaseOrder
 from rest_framework.views import APIView
 
+PURCHASE_ORDER_TEMPLATE = "purchase_orders/invoice.html"
+PURCHASE_ORDER_STYLESHEET = "purchase_order"
+
 # ---- SUPPLIER VIEWS ----
 class SupplierListCreateView(generics.ListCreateAPIView):
     queryset = Supplier.objects.all().order_by('-created_at')
@@ -36,15 +45,16 @@ class SupplierDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 # ---- PURCHASE ORDER VIEWS ----
 class PurchaseOrderListCreateView(generics.ListCreateAPIView):
-    queryset = PurchaseOrder.objects.all().order_by('-created_at')
+    queryset = PurchaseOrder.objects.all().order_by('-created_at', '-id')
     serializer_class = PurchaseOrderSerializer
     permission_classes = [IsAuthenticated]  # ✅ add this if using JWT auth
+    pagination_class = KeysetPagination
+    @transaction.atomic
     def perform_create(self, serializer):
         purchase_order = serializer.save()
-        product = purchase_order.product
-        product.cost_price = purchase_order.cost_price
-        product.quantity += purchase_order.quantity
-        product.save()
+        Product.objects.filter(pk=purchase_order.product_id).update(cost_price=purchase_order.cost_price)
+        increment_stock({purchase_order.product_id: purchase_order.quantity})
+        purchase_order.product.refresh_from_db(fields=["quantity", "cost_price"])
 
 
 class PurchaseOrderDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -61,18 +71,57 @@ def supplier_autocomplete(request):
     return Response(serializer.data)
 
 class PurchaseOrderInvoicePDFView(APIView):
+    """
+    GET /api/purchase-orders/<id>/invoice/
+    Rendered once per purchase order version in the PDF worker pool; see
+    BillInvoicePDFView.
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request, pk):
-        purchase_order = get_object_or_404(PurchaseOrder, pk=pk)
+        purchase_order = get_object_or_404(PurchaseOrder.objects.select_related("supplier", "product"), pk=pk)
+        version = storage.version_of([
+            storage.template_digest(PURCHASE_ORDER_TEMPLATE), printing.stylesheet_digest(PURCHASE_ORDER_STYLESHEET),
+            purchase_order.pk, purchase_order.purchase_id, purchase_order.created_at.isoformat(),
+            purchase_order.supplier.name, purchase_order.supplier.phone, purchase_order.supplier.email,
+            purchase_order.product.name, purchase_order.quantity,
+            str(purchase_order.cost_price), str(purchase_order.total),
+        ])
+        return pdf_response(
+            request, "purchase_orders", purchase_order.pk, version,
+            filename=f"invoice_{purchase_order.id}.pdf",
+            build_html=lambda: render_to_string(PURCHASE_ORDER_TEMPLATE, {"purchase_order": purchase_order}),
+            stylesheet=PURCHASE_ORDER_STYLESHEET,
+        )
+
 
-        # Render HTML with template
-        html_string = render_to_string("purchase_orders/invoice.html", {"purchase_order": purchase_order})
+class SupplierStatementPDFView(APIView):
+    """
+    GET /api/suppliers/<id>/statement/?start_date=2025-10-01&end_date=2025-10-31
+    Every purchase order for the supplier in the period (dates inclusive) in
+    one PDF. Rendered in the PDF worker pool and cached per supplier, period
+    and content, like the invoices (ETag, Range, 202 + job while rendering).
+    Periods with more than SUPPLIER_STATEMENT_MAX_ORDERS orders get 400.
+    """
+    permission_classes = [IsAuthenticated]
 
-        # Convert HTML to PDF
-        pdf_file = HTML(string=html_string).write_pdf()
+    def get(self, request, pk):
+        supplier = get_object_or_404(Supplier, pk=pk)
+        missing = {
+            param: "This parameter is required."
+            for param in ("start_date", "end_date") if not request.query_params.get(param)
+        }
+        if missing:
+            return Response(missing, status=status.HTTP_400_BAD_REQUEST)
+        start = parse_bound(request.query_params["start_date"], "start_date")
+        end = parse_bound(request.query_params["end_date"], "end_date", end=True)
 
-        # Return PDF response
-        response = HttpResponse(pdf_file, content_type="application/pdf")
-        response['Content-Disposition'] = f'attachment; filename="invoice_{purchase_order.id}.pdf"'
-        return response
\ No newline at end of file
+        orders = PurchaseOrder.objects.filter(supplier=supplier, created_at__gte=start, created_at__lt=end)
+        statements.check_size(orders)
+        return pdf_response(
+            request, statements.NAMESPACE, statements.statement_key(supplier, start, end),
+            statements.statement_version(supplier, orders, start, end),
+            filename=statements.statement_filename(supplier, start, end),
+            build_html=lambda: statements.statement_html(supplier, orders, start, end),
+            stylesheet=statements.STYLESHEET,
+        )
@@ -0,0 +1,26 @@
+"""Date range query parameters shared by list, report and export endpoints."""
+from datetime import datetime, timedelta
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+
+def parse_bound(value, param, end=False):
+    """
+    Parse a date or datetime query parameter into an aware datetime.
+    A bare date means the start of that day, or the start of the next day
+    for an exclusive upper bound (`end=True`).
+    """
+    try:
+        day = parse_date(value)
+        if day is not None:
+            moment = datetime.combine(day + timedelta(days=1) if end else day, datetime.min.time())
+        else:
+            moment = parse_datetime(value)
+            if moment is None:
+                raise ValueError
+    except ValueError:
+        raise ValidationError({param: "Enter a date (YYYY-MM-DD) or an ISO 8601 datetime."})
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
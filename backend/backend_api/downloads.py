@@ -0,0 +1,96 @@
+"""
+Conditional and ranged file downloads.
+
+`file_response` serves a file that never changes under a given ETag (a
+content-addressed cache entry, for instance): If-None-Match answers 304,
+and a single `Range: bytes=...` answers 206 so interrupted downloads can
+resume. Multi-range requests get the whole file, which RFC 9110 allows.
+"""
+import os
+import re
+from django.http import FileResponse, HttpResponse
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def etag_matches(header, etag):
+    """True if an If-None-Match / If-Range header value names `etag` (weak comparison)."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in header.split(","))
+
+
+def parse_range(header, size):
+    """
+    (start, end) inclusive for a single satisfiable byte range, None to send
+    the whole file, or ValueError if the range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.replace(" ", "")) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:  # suffix: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def file_response(request, path, etag, content_type, filename=None, cache_control="private, no-cache"):
+    """Serve `path` with ETag validation and single-range support."""
+    headers = {"ETag": etag, "Accept-Ranges": "bytes", "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        response = HttpResponse(status=304)
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    size = os.path.getsize(path)
+    byte_range = None
+    if_range = request.headers.get("If-Range")
+    if request.headers.get("Range") and (not if_range or etag_matches(if_range, etag)):
+        try:
+            byte_range = parse_range(request.headers["Range"], size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    handle = open(path, "rb")
+    if byte_range is None:
+        response = FileResponse(handle, content_type=content_type)
+        response["Content-Length"] = size
+    else:
+        start, end = byte_range
+        handle.seek(start)
+        response = FileResponse(_limited(handle, end - start + 1), content_type=content_type, status=206)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = end - start + 1
+    for name, value in headers.items():
+        response[name] = value
+    if filename:
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _limited(handle, length, chunk_size=64 * 1024):
+    """Yield `length` bytes from `handle`, then close it."""
+    try:
+        while length > 0:
+            chunk = handle.read(min(chunk_size, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        handle.close()
@@ -0,0 +1,81 @@
+"""
+Money as integer paise (1 rupee = 100 paise).
+
+Amounts are stored, summed and multiplied as integers. They become decimal
+strings such as "123.45" only at the edges (API fields, templates) and never
+pass through float.
+"""
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from django.db.models import BigIntegerField, F
+from django.db.models.functions import Cast
+from rest_framework import serializers
+
+PAISE_PER_RUPEE = 100
+
+
+def to_paise(amount):
+    """Rupees (Decimal, int or numeric string) -> integer paise, rounding half up."""
+    return int((Decimal(str(amount)) * PAISE_PER_RUPEE).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_paise(paise):
+    """Integer paise -> Decimal rupees with two places (for the legacy decimal columns)."""
+    return Decimal(int(paise)).scaleb(-2)
+
+
+def paise_of(field):
+    """Query expression for a two-place rupee DecimalField as integer paise (exact)."""
+    return Cast(F(field) * PAISE_PER_RUPEE, BigIntegerField())
+
+
+def format_paise(paise):
+    """Integer paise -> "123.45"."""
+    sign = "-" if paise < 0 else ""
+    rupees, rest = divmod(abs(int(paise)), PAISE_PER_RUPEE)
+    return f"{sign}{rupees}.{rest:02d}"
+
+
+def div_round(numerator, denominator):
+    """Integer division rounding half away from zero."""
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if 2 * remainder >= denominator:
+        quotient += 1
+    return quotient if numerator >= 0 else -quotient
+
+
+# A percentage with two decimals ("5.00") as an integer of hundredths (500),
+# so that amount * rate / 10000 stays in integers.
+to_basis_points = to_paise
+format_basis_points = format_paise
+BASIS_POINTS_PER_UNIT = 100 * 100
+
+
+class PaiseField(serializers.Field):
+    """Integer paise in the model, a decimal string with two places in JSON."""
+
+    default_error_messages = {
+        "invalid": "A valid amount is required.",
+        "max_decimal_places": "Ensure that there are no more than 2 decimal places.",
+        "min_value": "Ensure this value is greater than or equal to {min_value}.",
+    }
+
+    def __init__(self, min_value=None, **kwargs):
+        self.min_value = min_value
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return format_paise(value)
+
+    def to_internal_value(self, data):
+        try:
+            amount = Decimal(str(data).strip())
+        except (InvalidOperation, TypeError, ValueError):
+            self.fail("invalid")
+        if not amount.is_finite():
+            self.fail("invalid")
+        if amount != amount.quantize(Decimal("0.01")):
+            self.fail("max_decimal_places")
+        paise = int(amount * PAISE_PER_RUPEE)
+        if self.min_value is not None and paise < to_paise(self.min_value):
+            self.fail("min_value", min_value=self.min_value)
+        return paise
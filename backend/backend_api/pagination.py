@@ -0,0 +1,169 @@
+"""
+Keyset (cursor) pagination for the large list endpoints.
+
+Pages are ordered by (created_at, id), newest first, and a page is selected
+with `WHERE (created_at, id) < (last seen)` instead of OFFSET, so every page
+costs the same as the first one and rows inserted meanwhile never shift
+items between pages. Cursors are opaque base64 tokens.
+
+No COUNT(*) is run. Clients that want a total can pass `?count=approx` to get
+the planner's row estimate as `approximate_count`.
+"""
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimate_count(queryset):
+    """Row estimate from the query planner; falls back to COUNT(*) off PostgreSQL."""
+    if connections[queryset.db].vendor != "postgresql":
+        return queryset.count()
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class KeysetPagination(BasePagination):
+    ordering = ("-created_at", "-id")
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_params = ["page_size"]
+    max_page_size = 100
+    count_query_param = "count"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.approximate_count = (
+            estimate_count(queryset)
+            if request.query_params.get(self.count_query_param) == "approx"
+            else None
+        )
+
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor["direction"] == "previous"
+        ordering = [self._flip(field) for field in self.ordering] if reverse else list(self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if cursor is not None:
+            queryset = queryset.filter(self._after(ordering, cursor["position"]))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        self.has_next = has_more if not reverse else True
+        self.has_previous = has_more if reverse else cursor is not None
+        return rows
+
+    def get_paginated_response(self, data):
+        payload = OrderedDict([
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+        ])
+        if self.approximate_count is not None:
+            payload["approximate_count"] = self.approximate_count
+        payload["results"] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        properties = {
+            "next": {"type": "string", "nullable": True, "format": "uri"},
+            "previous": {"type": "string", "nullable": True, "format": "uri"},
+            "approximate_count": {"type": "integer"},
+            "results": schema,
+        }
+        return {"type": "object", "required": ["results"], "properties": properties}
+
+    def get_page_size(self, request):
+        for param in self.page_size_query_params:
+            try:
+                value = int(request.query_params[param])
+            except (KeyError, ValueError):
+                continue
+            if value > 0:
+                return min(value, self.max_page_size)
+        return self.page_size
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], "next")
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self._link(self.page[0], "previous")
+
+    # Cursor encoding
+
+    def _link(self, instance, direction):
+        position = [self._value(instance, field) for field in self.ordering]
+        token = json.dumps({"p": position, "d": direction[0]}, separators=(",", ":"))
+        encoded = base64.urlsafe_b64encode(token.encode()).decode().rstrip("=")
+        # A page size alias like ?recent applies to the first page only
+        url = self.base_url
+        for param in self.page_size_query_params:
+            url = remove_query_param(url, param)
+        url = replace_query_param(url, "page_size", self.page_size)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            token = json.loads(base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)))
+            position = token["p"]
+            direction = {"n": "next", "p": "previous"}[token["d"]]
+            if len(position) != len(self.ordering):
+                raise ValueError
+            position = [self._parse(field, value) for field, value in zip(self.ordering, position)]
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        return {"position": position, "direction": direction}
+
+    @staticmethod
+    def _value(instance, field):
+        value = getattr(instance, field.lstrip("-"))
+        return value.isoformat() if hasattr(value, "isoformat") else value
+
+    @staticmethod
+    def _parse(field, value):
+        if field.lstrip("-") == "created_at":
+            parsed = parse_datetime(value)
+            if parsed is None:
+                raise ValueError(value)
+            return parsed
+        return int(value)
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def _after(ordering, position):
+        """
+        Rows strictly after `position` in `ordering`, i.e. a row comparison
+        `(a, b) < (x, y)` written as `a <= x AND (a < x OR (a = x AND b < y))`
+        so the leading bound can use the index.
+        """
+        names = [field.lstrip("-") for field in ordering]
+        ops = ["lt" if field.startswith("-") else "gt" for field in ordering]
+        condition = Q()
+        for index, (name, op) in enumerate(zip(names, ops)):
+            equal = {names[i]: position[i] for i in range(index)}
+            condition |= Q(**equal, **{f"{name}__{op}": position[index]})
+        return Q(**{f"{names[0]}__{ops[0]}e": position[0]}) & condition
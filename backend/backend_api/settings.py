@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 from datetime import timedelta
+from decimal import Decimal
 import os
 from dotenv import load_dotenv
 
@@ -57,6 +58,11 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'idempotency-key',
+]
+
+CORS_EXPOSE_HEADERS = [
+    'idempotent-replayed',
 ]
 
 # CSRF settings
@@ -79,6 +85,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third-party apps
     'rest_framework',
@@ -93,6 +100,12 @@ INSTALLED_APPS = [
     'apps.billing',
     'apps.reports',
     'apps.suppliers',
+    'apps.idempotency',
+    'apps.sequences',
+    'apps.outbox',
+    'apps.promotions',
+    'apps.returns',
+    'apps.documents',
 ]
 
 MIDDLEWARE = [
@@ -188,6 +201,52 @@ if not DEBUG:
         'rest_framework.renderers.JSONRenderer',
     ]
 
+# How long a stored Idempotency-Key response can be replayed
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+
+# Maximum number of bills accepted by POST /api/billings/batch/
+BILL_BATCH_MAX_SIZE = 1000
+
+# Document numbers reserved per database round trip by each worker
+DOCUMENT_NUMBER_BLOCK_SIZE = 50
+
+# Outbox events that keep failing are left for inspection after this many tries
+OUTBOX_MAX_ATTEMPTS = 5
+# Wait before retrying a failed outbox event; doubles after every attempt (30s, 1m, 2m, 4m)
+OUTBOX_RETRY_DELAY = timedelta(seconds=30)
+
+# Tax percentage for products whose category has no tax_rate
+BILLING_DEFAULT_TAX_RATE = Decimal("5.00")
+
+# Seconds a worker trusts its cached product prices and tax rates
+PRICE_BOOK_TTL = 60
+
+# Seconds before a worker recompiles all promotion rules (its own edits apply immediately)
+PROMOTION_INDEX_TTL = 60
+
+# PDF rendering pool: worker processes (0 renders in the request thread), renders
+# allowed to wait for a worker, and seconds before a render is interrupted
+PDF_RENDER_WORKERS = 2
+PDF_RENDER_QUEUE_SIZE = 8
+PDF_RENDER_TIMEOUT = 30
+# Longest a PDF request waits for its render before answering 202 with a job to poll
+PDF_RENDER_WAIT = 10
+# Documents an archive export renders ahead of the one it is streaming
+PDF_ARCHIVE_WINDOW = 8
+# Most purchase orders one supplier statement may show; WeasyPrint lays the whole
+# document out in memory, so longer periods are refused and must be split
+SUPPLIER_STATEMENT_MAX_ORDERS = 2000
+
+# Minimum pg_trgm word similarity for a product name to match ?search= (0-1; lower tolerates more typos)
+PRODUCT_SEARCH_SIMILARITY = 0.5
+# Most matches a ?search= ranks and returns
+PRODUCT_SEARCH_CANDIDATES = 200
+
+# Till scans: codes each worker keeps in its LRU cache, and seconds it trusts an
+# entry (its own product and stock changes drop entries immediately)
+SCAN_CACHE_SIZE = 10_000
+SCAN_CACHE_TTL = 30
+
 # JWT Configuration
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),  # Increased to 60 minutes for better UX
@@ -228,6 +287,10 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 MEDIA_URL = '/media/'
 MEDIA_ROOT=BASE_DIR/'media'
 
+# Rendered PDFs, one file per document version; kept outside MEDIA_ROOT so
+# they are only reachable through the document views
+DOCUMENT_CACHE_ROOT = BASE_DIR/'var'/'documents'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
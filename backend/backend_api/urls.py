@@ -12,9 +12,12 @@ urlpatterns = [
     path('api/', include("apps.accounts.urls")),
     path('api/', include("apps.billing.urls")),
     path('api/', include("apps.customers.urls")),
+    path('api/', include("apps.documents.urls")),
     path('api/', include("apps.payment.urls")),
     path('api/', include("apps.products.urls")),
+    path('api/', include("apps.promotions.urls")),
     path('api/', include("apps.reports.urls")),
+    path('api/', include("apps.returns.urls")),
     path('api/', include("apps.suppliers.urls")),
     path('api-auth/', include('rest_framework.urls')),
 
@@ -0,0 +1,55 @@
+import pytest
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from apps.customers.models import Customer
+from apps.products.models import Product
+from apps.sequences.allocator import allocator
+
+@pytest.fixture(autouse=True)
+def close_number_allocator():
+    # Document numbers are reserved on a second connection; don't leave it open at teardown
+    yield
+    allocator.close()
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+@pytest.fixture
+def normal_user(db):
+    return get_user_model().objects.create_user(
+        email="normal@example.com", password="pass123"
+    )
+
+@pytest.fixture
+def manager_user(db):
+    User = get_user_model()
+    return User.objects.create_user(
+        email="manager@example.com",
+        password="pass123",
+        role=User.ROLE_MANAGER,  # used by IsManagerOrReadOnly
+    )
+
+@pytest.fixture
+def cashier_client(normal_user):
+    client = APIClient()
+    client.force_authenticate(normal_user)
+    return client
+
+@pytest.fixture
+def manager_client(manager_user):
+    client = APIClient()
+    client.force_authenticate(manager_user)
+    return client
+
+@pytest.fixture
+def customer(db):
+    return Customer.objects.create(name="Test customer", contact_number="9000000001")
+
+@pytest.fixture
+def products(db):
+    return [
+        Product.objects.create(name=f"Test product {i}", price=Decimal("10.00"), quantity=100)
+        for i in range(12)
+    ]
@@ -293,14 +293,50 @@ const Billing = () => {
   // -------------------------
   // Calculations
   // -------------------------
+  // The server prices the cart (tax, promotions, totals); the only amount we
+  // send is the manual discount, and what we show is its quote.
   const roundToCents = (v) => Math.round(Number(v) * 100) / 100;
-  const subtotal = useMemo(
+  const cartValue = useMemo(
     () => roundToCents(cart.reduce((s, i) => s + roundToCents(Number(i.price) * Number(i.qty)), 0)),
     [cart]
   );
-  const tax = useMemo(() => roundToCents(subtotal * 0.05), [subtotal]);
-  const discount = useMemo(() => roundToCents(subtotal * 0.1), [subtotal]);
-  const total = useMemo(() => roundToCents(subtotal + tax - discount), [subtotal, tax, discount]);
+  const manualDiscount = useMemo(() => roundToCents(cartValue * 0.1), [cartValue]);
+  const [quote, setQuote] = useState(null);
+
+  useEffect(() => {
+    if (!cart.length || !token) {
+      setQuote(null);
+      return;
+    }
+    const controller = new AbortController();
+    const timer = setTimeout(async () => {
+      try {
+        const res = await api.post(
+          "/billings/quote/",
+          {
+            customer: foundCustomer?.id ?? null,
+            discount: manualDiscount,
+            items: cart.map((i) => ({ product: i.id, quantity: i.qty })),
+          },
+          { signal: controller.signal }
+        );
+        setQuote(res.data);
+      } catch (err) {
+        if (err.name === "CanceledError" || err.name === "AbortError") return;
+        console.error("Error pricing cart:", err);
+        toast.error("Failed to price cart ❌");
+      }
+    }, 250);
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [cart, foundCustomer, manualDiscount, token]);
+
+  const subtotal = quote ? Number(quote.subtotal) : 0;
+  const tax = quote ? Number(quote.tax) : 0;
+  const discount = quote ? Number(quote.discount) : 0;
+  const total = quote ? Number(quote.total) : 0;
 
   // -------------------------
   // Customer search
@@ -427,14 +463,10 @@ const Billing = () => {
 
       const payload = {
         customer: customerId,
-        subtotal,
-        tax,
-        discount,
-        total,
+        discount: manualDiscount,
         items: cart.map((i) => ({
           product: i.id,
           quantity: i.qty,
-          price: roundToCents(i.price),
         })),
       };
 
@@ -858,6 +890,7 @@ const Billing = () => {
             <option value="paid">Paid</option>
             <option value="pending">Pending</option>
             <option value="failed">Failed</option>
+            <option value="void">Void</option>
           </select>
 
           <select
@@ -958,7 +991,7 @@ const Billing = () => {
       <DollarSign className="h-4 w-4" />
       Pay Now
     </button>
-  ) : (
+  ) : bill.payment_status === 'failed' ? (
     <button
       onClick={() => openPaymentModal(bill)}
       className="p-2 bg-red-500 hover:bg-red-600 text-white rounded-lg transition-colors flex items-center gap-2 text-sm font-medium"
@@ -966,7 +999,7 @@ const Billing = () => {
       <DollarSign className="h-4 w-4" />
       Retry Payment
     </button>
-  )}
+  ) : null}
 
   <button
     onClick={() => setExpandedBill(expandedBill === bill.id ? null : bill.id)}
@@ -997,11 +1030,11 @@ const Billing = () => {
                             <span>{formatINR(bill.subtotal)}</span>
                           </div>
                           <div className="flex justify-between">
-                            <span>Tax (5%):</span>
+                            <span>Tax:</span>
                             <span>{formatINR(bill.tax)}</span>
                           </div>
                           <div className="flex justify-between">
-                            <span>Discount (10%):</span>
+                            <span>Discount:</span>
                             <span>-{formatINR(bill.discount)}</span>
                           </div>
                           <div className="flex justify-between font-semibold border-t pt-1">
@@ -1424,11 +1457,11 @@ const Billing = () => {
                             <span className="font-medium">{formatINR(subtotal.toFixed(2))}</span>
                           </div>
                           <div className="flex justify-between">
-                            <span className="text-gray-600">Tax (5%):</span>
+                            <span className="text-gray-600">Tax:</span>
                             <span className="font-medium">{formatINR(tax.toFixed(2))}</span>
                           </div>
                           <div className="flex justify-between">
-                            <span className="text-gray-600">Discount (10%):</span>
+                            <span className="text-gray-600">Discount:</span>
                             <span className="font-medium text-emerald-600">-{formatINR(discount.toFixed(2))}</span>
                           </div>
                           <hr className="my-3" />
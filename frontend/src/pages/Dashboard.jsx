@@ -31,7 +31,7 @@ const Dashboard = () => {
     if (!token) return;
 
     try {
-      const res = await api.get("/billings/");
+      const res = await api.get("/billings/?expand=items");
       const allBills = res.data.results || res.data;
       setBills(allBills);
 
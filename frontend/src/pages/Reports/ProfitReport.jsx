@@ -16,7 +16,7 @@ import SectionLoader from "../../components/SectionLoader";
 
 
 
-const API_SALES = "http://127.0.0.1:8000/api/billings/";
+const API_SALES = "http://127.0.0.1:8000/api/billings/?expand=items";
 const API_PRODUCTS = "http://127.0.0.1:8000/api/products/";
 
 const ProfitReport = () => {